@@ -2,3 +2,21 @@
 
 As I work through the build, I'll update the documentation for this module.
 """
+
+# built-in imports
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_version() -> str:
+    """Get the installed version of mkdocs-autoapi.
+
+    Returns:
+        The version string, or "unknown" if the package is not installed.
+    """
+    from importlib import metadata
+
+    try:
+        return metadata.version("mkdocs-autoapi")
+    except metadata.PackageNotFoundError:
+        return "unknown"
@@ -4,27 +4,149 @@ As I work through the build, I'll update the documentation for this module.
 """
 
 # built-in imports
+import dataclasses
+import fnmatch
 import os
-from collections import OrderedDict
+import posixpath
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional, Set
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 # third-party imports
-from mkdocs.config.defaults import MkDocsConfig
+import yaml
 from mkdocs.exceptions import ConfigurationError
 
 # local imports
 import mkdocs_autoapi
+from mkdocs_autoapi import discovery, git_index
 from mkdocs_autoapi.generate_files import nav
 from mkdocs_autoapi.logging import get_logger
 
+if TYPE_CHECKING:
+    from mkdocs.config.defaults import MkDocsConfig
+
 logger = get_logger("mkdocs-autoapi")
 
+ALWAYS_IGNORED = ["venv/**/*", ".venv/**/*"]
+"""Patterns ignored in every AutoAPI directory (common virtual environments)."""
+
+MAX_DISCOVERY_WORKERS = 16
+"""Upper bound on the number of AutoAPI directories discovered concurrently."""
+
+
+@dataclasses.dataclass(frozen=True)
+class AutoApiRoot:
+    """Define a directory whose files are documented."""
+
+    path: Path
+    """The directory to search."""
+    file_patterns: List[str]
+    """The patterns of files to document."""
+    ignore: List[str]
+    """The patterns of files to ignore."""
+
+
+def get_autoapi_roots(config: Mapping[str, Any]) -> List[AutoApiRoot]:
+    """Get the directories to document.
+
+    If `autoapi_dirs` is set, then each of its entries is a root, falling back
+    to `autoapi_file_patterns` and `autoapi_ignore` for any patterns the entry
+    does not define. Otherwise, `autoapi_dir` is the only root.
+
+    Args:
+        config:
+            The plugin configuration.
+
+    Returns:
+        The AutoAPI roots, in configuration order.
+    """
+    entries = config["autoapi_dirs"] or [{"path": config["autoapi_dir"]}]
+    roots = []
+    for entry in entries:
+        file_patterns = entry.get("file_patterns")
+        if file_patterns is None:
+            file_patterns = config["autoapi_file_patterns"]
+        ignore = entry.get("ignore")
+        if ignore is None:
+            ignore = config["autoapi_ignore"]
+        ignore = list(ignore) + [p for p in ALWAYS_IGNORED if p not in ignore]
+        roots.append(
+            AutoApiRoot(
+                path=Path(entry["path"]),
+                file_patterns=list(file_patterns),
+                ignore=ignore,
+            )
+        )
+    return roots
+
+
+def list_files_to_document(
+    path: Path,
+    autoapi_file_patterns: List[str],
+    autoapi_ignore: Optional[Iterable[str]] = None,
+    max_workers: int = 1,
+    backend: str = "walk",
+) -> List[str]:
+    """List the files to document in a directory.
+
+    Steps:
+        1.  List all files in `path`. With the `git` backend, list the files
+            tracked in the git index, falling back to walking the directory
+            (using up to `max_workers` threads) if that is not possible.
+        2.  Select the files matching `autoapi_file_patterns` and *not*
+            matching any member of `autoapi_ignore`.
+
+    Args:
+        path:
+            The path to search.
+        autoapi_file_patterns:
+            The patterns to search for.
+        autoapi_ignore:
+            The patterns to ignore.
+        max_workers:
+            The maximum number of directories listed concurrently. Defaults to
+            1 (serial listing).
+        backend:
+            The discovery backend, `walk` or `git`. Defaults to `walk`.
+
+    Returns:
+        The sorted POSIX paths of the files to document, relative to `path`.
+    """
+    # Step 1
+    relative_paths = None
+    if backend == "git":
+        relative_paths = git_index.list_tracked_files(root=str(path))
+        if relative_paths is None:
+            logger.debug(msg=f"Walking {path} instead of using the git index.")
+    if relative_paths is None:
+        relative_paths = discovery.walk_files(
+            root=str(path), max_workers=max_workers
+        )
+
+    # Step 2
+    return discovery.filter_files(
+        relative_paths=relative_paths,
+        file_patterns=autoapi_file_patterns,
+        ignore=list(autoapi_ignore or ()),
+    )
+
 
 def identify_files_to_document(
     path: Path,
     autoapi_file_patterns: List[str],
     autoapi_ignore: Optional[Iterable[str]] = None,
+    max_workers: int = 1,
 ) -> Set[Path]:
     """Get a set of all Python files for which documentation must be generated.
 
@@ -32,11 +154,8 @@ def identify_files_to_document(
     that match at least one member of `autoapi_ignore`.
 
     Steps:
-        1.  Get set of all files matching `autoapi_file_patterns` in `path`.
-        2.  For each pattern in `autoapi_ignore`, get set of all files matching
-            the pattern and reduce the set of Python files to only those files
-            that *do not* match the pattern.
-        3.  Return the final set of files to include.
+        1.  List the files to document (see `list_files_to_document`).
+        2.  Return the resolved paths of the files.
 
     Args:
         path:
@@ -45,38 +164,122 @@ def identify_files_to_document(
             The patterns to search for.
         autoapi_ignore:
             The patterns to autoapi_ignore.
+        max_workers:
+            The maximum number of directories listed concurrently. Defaults to
+            1 (serial listing).
 
     Returns (Set[pathlib.Path]):
         The set of all Python files in `path` that *do not* match any member of
         `autoapi_ignore`.
     """
     # Step 1
-    reversed_autoapi_file_patterns = autoapi_file_patterns.copy()
-    reversed_autoapi_file_patterns.reverse()
-
-    # Step 1
-    files_to_document = OrderedDict()
-    for pattern in reversed_autoapi_file_patterns:
-        pattern_matches = set(path.rglob(pattern=pattern))
-        for file in pattern_matches:
-            file_key = file.with_suffix(suffix="")
-            files_to_document.update({file_key: file})
-    files_to_document = set(files_to_document.values())
+    files_to_document = list_files_to_document(
+        path=path,
+        autoapi_file_patterns=autoapi_file_patterns,
+        autoapi_ignore=autoapi_ignore,
+        max_workers=max_workers,
+    )
 
     # Step 2
-    if autoapi_ignore:
-        for pattern in autoapi_ignore:
-            autoapi_ignored_files = set(path.glob(pattern=pattern))
-            files_to_document = files_to_document.difference(
-                autoapi_ignored_files
-            )
+    return {(path / p).resolve() for p in files_to_document}
 
-    # Step 3
-    return {p.resolve() for p in files_to_document}
+
+def discover_files(
+    roots: List[AutoApiRoot], max_workers: int = 1, backend: str = "walk"
+) -> List[List[str]]:
+    """Identify the files to document in each root.
+
+    Roots are searched concurrently in a thread pool, since discovery is
+    dominated by file system latency rather than CPU time.
+
+    Args:
+        roots:
+            The AutoAPI roots to search.
+        max_workers:
+            The maximum number of directories listed concurrently within each
+            root.
+        backend:
+            The discovery backend, `walk` or `git`.
+
+    Returns:
+        The sorted POSIX paths of the files to document in each root, relative
+        to the root, in the order of `roots`.
+    """
+
+    def discover(root: AutoApiRoot) -> List[str]:
+        return list_files_to_document(
+            path=root.path,
+            autoapi_file_patterns=root.file_patterns,
+            autoapi_ignore=root.ignore,
+            max_workers=max_workers,
+            backend=backend,
+        )
+
+    if len(roots) <= 1:
+        return [discover(root) for root in roots]
+
+    max_workers = min(len(roots), MAX_DISCOVERY_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(discover, roots))
+
+
+def _path_sort_key(relative_path: str) -> str:
+    """Get a string sort key ordering POSIX paths like `PurePath` objects.
+
+    Paths compare component by component, which is what plain string
+    comparison does once the separator sorts before every other character.
+    """
+    key = relative_path.replace("/", "\0")
+    return key.lower() if os.name == "nt" else key
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write `content` to `path` unless the file already holds that content.
+
+    Leaving unchanged files untouched keeps their modification times stable,
+    so file watchers (e.g., `mkdocs serve`) are not triggered needlessly.
+
+    Args:
+        path:
+            The file to write.
+        content:
+            The desired file content.
+
+    Returns:
+        True if the file was written, False if it was already up to date.
+    """
+    try:
+        with open(path, "r+") as file:
+            if file.read() == content:
+                return False
+            file.seek(0)
+            file.write(content)
+            file.truncate()
+    except FileNotFoundError:
+        os.makedirs(path.parent, exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+    return True
+
+
+def get_keep_files_dir(config: "MkDocsConfig") -> Path:
+    """Get the directory in which local copies of generated files are kept.
+
+    Args:
+        config:
+            The MkDocs configuration object.
+
+    Returns:
+        The value of `autoapi_keep_files_dir` if set, otherwise
+        `<docs_dir>/<autoapi_root>`.
+    """
+    if config["autoapi_keep_files_dir"]:
+        return Path(config["autoapi_keep_files_dir"])
+    return Path(config["docs_dir"]) / config["autoapi_root"]
 
 
 def add_autoapi_nav_entry(
-    config: MkDocsConfig,
+    config: "MkDocsConfig",
 ) -> None:
     """Add the AutoAPI section to the navigation.
 
@@ -110,172 +313,622 @@ def add_autoapi_nav_entry(
     config.nav.append({autoapi_section_title: autoapi_root_ref})
 
 
-def create_docs(
-    config: MkDocsConfig,
-) -> None:
-    r"""Use AutoAPI approach to create documentation for a project.
+@dataclasses.dataclass
+class PlannedPage:
+    """Define a documentation page to be generated for a module."""
+
+    doc_path: str
+    """The page's path relative to `docs_dir`, e.g. `autoapi/pkg/mod.md`."""
+    nav_path: Tuple[str, ...]
+    """The sequence of titles under which the page appears in the nav."""
+    identifier: str
+    """The identifier passed to `mkdocstrings`."""
+    source_path: Optional[Path]
+    """The documented source file, used as the page's edit path."""
+    content: str
+    """The page's Markdown content."""
+    module_path: Tuple[str, ...] = ()
+    """The parts of the module's dotted path, e.g. `("pkg", "mod")`."""
+    in_nav: bool = True
+    """Whether the page appears in the navigation."""
+    sections: List["PlannedPage"] = dataclasses.field(default_factory=list)
+    """Small modules documented on this page instead of pages of their own
+    (see `aggregate_small_modules`)."""
+    options: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    """The `mkdocstrings` options of the module's `:::` block (see
+    `select_module_options`)."""
+
+
+@dataclasses.dataclass
+class ApiPlan:
+    """Define the pages and navigation to be generated by AutoAPI."""
+
+    pages: List[PlannedPage]
+    """The pages to generate, in navigation order."""
+    navigation: nav.Nav
+    """The navigation of the API section."""
+
+    @property
+    def summary(self) -> str:
+        """The content of the literate navigation file (`summary.md`)."""
+        return "".join(self.navigation.build_literate_nav())
+
+
+def plan_docs(
+    config: Mapping[str, Any],
+    theme: str,
+    handler: str,
+) -> ApiPlan:
+    r"""Plan the pages and navigation of the API documentation.
+
+    Planning only inspects the file system; nothing is written.
 
     Steps:
-        1.  Define variables.
-        2.  Add the AutoAPI section to the navigation if desired.
-        3.  Create a new `Nav` object.
-        4.  Get the set of all Python files to document.
-        5.  If `autoapi_dir` is a package, adjust `autoapi_dir` to its parent.
-        6.  For each file found:
+        1.  Create a new `Nav` object and check that the handler is supported.
+        2.  Get the relative paths of all files to document in each AutoAPI
+            directory.
+        3.  If an AutoAPI directory is a package, adjust it to its parent.
+        4.  For each file found, in order of its path relative to its AutoAPI
+            directory (paths are only handled as strings in this loop):
             1.  Get the module path and document path.
             2.  Get the module path parts.
             3.  Remove the last part of the module path parts if it is
                 "\_\_init\_\_".
-            4.  Create a new entry in the `Nav` object.
+            4.  Skip the file if the document was already generated from
+                another AutoAPI directory.
             5.  Create the module identifier.
-            6.  Create the documentation file.
-            7.  Set the edit path.
-        7.  Write the navigation to `autoapi/summary.md`.
+            6.  Plan the documentation page, with the options of the
+                `autoapi_module_options` rules matching the module.
+        5.  If `autoapi_aggregate_max_lines` or
+            `autoapi_aggregate_max_symbols` is set, document small modules
+            on their package's index page.
+        6.  If `autoapi_nav_depth` is set, move deeper pages out of the
+            navigation and list them on their ancestors' index pages.
+        7.  Create an entry in the `Nav` object for each page in the
+            navigation.
 
     Args:
         config:
-            The MkDocs configuration object.
+            The plugin configuration; any mapping with the plugin's option
+            names as keys (e.g., the MkDocs configuration object).
+        theme:
+            The name of the MkDocs theme.
+        handler:
+            The default `mkdocstrings` handler.
 
     Returns:
-        None.
+        The plan of the API documentation.
+
+    Raises:
+        ConfigurationError: If `handler` is not supported.
     """
     # Step 1
-    logger.debug(msg="Generating AutoAPI documentation ...")
-    theme = config.theme.name
-    handler = config.plugins["mkdocstrings"].config.default_handler
-    autoapi_dir = Path(config["autoapi_dir"])
-    autoapi_ignore = config["autoapi_ignore"]
-    autoapi_file_patterns = config["autoapi_file_patterns"]
-    autoapi_add_nav_entry = config["autoapi_add_nav_entry"]
-    docs_dir = Path(config["docs_dir"])
-    autoapi_root = config["autoapi_root"]
-    autoapi_keep_files = config["autoapi_keep_files"]
-    local_summary_path = docs_dir / autoapi_root / "summary.md"
-    temp_summary_path = f"{autoapi_root}/summary.md"
-
-    # Step 2
-    if autoapi_add_nav_entry:
-        add_autoapi_nav_entry(config=config)
-        logger.debug(msg="... Added AutoAPI section to navigation ...")
-    else:
-        logger.debug(msg="... Skipped adding AutoAPI section to navigation ...")
-    if autoapi_keep_files:
-        local_path = docs_dir / autoapi_root
-        logger.debug(
-            msg=f"... AutoAPI files will be saved locally in {local_path} ..."
-        )
-    else:
-        logger.debug(msg="... AutoAPI files will not be saved locally ...")
-
-    # Step 3
+    autoapi_root = Path(config["autoapi_root"]).as_posix()
+    root_prefix = f"{autoapi_root}/"
+    module_options = config.get("autoapi_module_options") or []
     navigation = nav.Nav()
+    pages = []
+    if handler not in ("python", "vba"):
+        raise ConfigurationError(
+            f"Mkdocstrings handler '{handler}' is not supported."
+        )
 
-    # Step 4
-    files_to_document = identify_files_to_document(
-        path=autoapi_dir,
-        autoapi_file_patterns=autoapi_file_patterns,
-        autoapi_ignore=autoapi_ignore,
+    # Step 2
+    roots = get_autoapi_roots(config=config)
+    discovered_files = discover_files(
+        roots=roots,
+        max_workers=config["autoapi_discovery_workers"],
+        backend=config["autoapi_discovery_backend"],
     )
+    files_to_document = []
+    for index, (root, root_files) in enumerate(zip(roots, discovered_files)):
+        # Step 3
+        root_path = root.path.resolve()
+        base_dir = root_path
+        prefix = ""
+        if (root_path / "__init__.py").exists():
+            base_dir = root_path.parent
+            prefix = f"{root_path.name}/"
+            logger.debug(
+                msg=f"... Adjusted AutoAPI directory {root.path} to parent package ..."
+            )
+
+        for relative_path in root_files:
+            relative_path = prefix + relative_path
+            files_to_document.append(
+                (_path_sort_key(relative_path), index, relative_path, base_dir)
+            )
     logger.debug(
         msg=f"... Found {len(files_to_document)} files to document ..."
     )
 
-    # Step 5
-    if (autoapi_dir / "__init__.py").exists():
-        autoapi_dir = autoapi_dir.parent
-        logger.debug(msg="... Adjusted AutoAPI directory to parent package ...")
+    # Step 4
+    files_to_document.sort(key=lambda entry: entry[:2])
+    generated_doc_paths = set()
+    for _, _, relative_path, base_dir in files_to_document:
+        # Step 4.1
+        module_dir, _, file_name = relative_path.rpartition("/")
+        module_dir = discovery.strip_suffix(module_dir)
+        stem = discovery.strip_suffix(file_name)
+
+        # Step 4.2
+        if module_dir:
+            module_path_parts = (*module_dir.split("/"), stem)
+        else:
+            module_path_parts = (stem,)
 
-    # Step 6
-    for file in sorted(files_to_document):
-        # Step 6.1
-        try:
-            module_path = file.relative_to(
-                autoapi_dir.resolve()
-            ).parent.with_suffix("")
-        except ValueError:
-            module_path = Path("")
-        doc_path = file.relative_to(file.parent).with_suffix(".md")
-        full_temp_doc_path = autoapi_root / module_path / doc_path
-        full_local_doc_path = docs_dir / full_temp_doc_path
-
-        # Step 6.2
-        module_path_parts = list(module_path.parts)
-        module_path_parts.append(doc_path.stem)
-        module_path_parts = tuple(module_path_parts)
-
-        # Step 6.3
-        if module_path_parts[-1] == "__init__":
+        # Step 4.3
+        if stem == "__init__":
             if len(module_path_parts) == 1:
                 continue
             module_path_parts = module_path_parts[:-1]
-            doc_path = doc_path.with_name("index.md")
-            full_local_doc_path = full_local_doc_path.with_name("index.md")
-            full_temp_doc_path = full_temp_doc_path.with_name("index.md")
-
+            doc_name = "index.md"
             if theme == "mkdocs":
-                nav_tuple = list(module_path_parts)
-                nav_tuple.append("Index")
-                nav_tuple = tuple(nav_tuple)
+                nav_tuple = (*module_path_parts, "Index")
             else:
                 nav_tuple = module_path_parts
         else:
+            doc_name = f"{stem}.md"
             nav_tuple = module_path_parts
+        if module_dir:
+            full_temp_doc_path = f"{root_prefix}{module_dir}/{doc_name}"
+        else:
+            full_temp_doc_path = f"{root_prefix}{doc_name}"
 
-        # Step 6.4
-        navigation[nav_tuple] = (module_path / doc_path).as_posix()
+        # Step 4.4
+        file = base_dir / relative_path
+        if full_temp_doc_path in generated_doc_paths:
+            logger.warning(
+                msg=f"Skipping {file}: {full_temp_doc_path} was already generated from another AutoAPI directory."
+            )
+            continue
+        generated_doc_paths.add(full_temp_doc_path)
 
-        # Step 6.5
+        # Step 4.5
         if handler == "python":
             module_identifier = ".".join(module_path_parts)
-        elif handler == "vba":
-            module_identifier = file.relative_to(autoapi_dir.resolve())
         else:
-            raise ConfigurationError(
-                f"Mkdocstrings handler '{handler}' is not supported."
+            module_identifier = relative_path.replace("/", os.sep)
+
+        # Step 4.6
+        page = PlannedPage(
+            doc_path=full_temp_doc_path,
+            nav_path=nav_tuple,
+            identifier=module_identifier,
+            source_path=file,
+            content="",
+            module_path=module_path_parts,
+        )
+        if module_options:
+            page.options = select_module_options(page, module_options)
+        page.content = make_stub(page.identifier, page.options)
+        pages.append(page)
+
+    # Step 5
+    max_lines = config.get("autoapi_aggregate_max_lines")
+    max_symbols = config.get("autoapi_aggregate_max_symbols")
+    if handler == "python" and (
+        max_lines is not None or max_symbols is not None
+    ):
+        pages = aggregate_small_modules(
+            pages=pages,
+            max_lines=max_lines,
+            max_symbols=max_symbols,
+            autoapi_root=autoapi_root,
+            theme=theme,
+        )
+
+    # Step 6
+    if config.get("autoapi_nav_depth"):
+        pages = cap_nav_depth(
+            pages=pages,
+            depth=config["autoapi_nav_depth"],
+            autoapi_root=autoapi_root,
+            theme=theme,
+        )
+
+    # Step 7
+    for page in pages:
+        if page.in_nav:
+            navigation[page.nav_path] = page.doc_path[len(root_prefix) :]
+
+    return ApiPlan(pages=pages, navigation=navigation)
+
+
+def _make_index_page(
+    module_path: Tuple[str, ...],
+    autoapi_root: str,
+    theme: str,
+) -> PlannedPage:
+    """Plan an index page for a package without one (e.g., a namespace)."""
+    nav_path = module_path + ("Index",) if theme == "mkdocs" else module_path
+    return PlannedPage(
+        doc_path=posixpath.join(autoapi_root, *module_path, "index.md"),
+        nav_path=nav_path,
+        identifier=".".join(module_path),
+        source_path=None,
+        content=f"# {module_path[-1]}\n",
+        module_path=module_path,
+    )
+
+
+def _insert_index_page(
+    pages: List[PlannedPage], index_page: PlannedPage
+) -> None:
+    """Insert a generated index page before the first page of its package.
+
+    The pages are in navigation order, so the index page comes first in its
+    section, as it would if the package had an index page of its own.
+    """
+    module_path = index_page.module_path
+    for position, page in enumerate(pages):
+        if page.module_path[: len(module_path)] == module_path:
+            pages.insert(position, index_page)
+            return
+    pages.append(index_page)
+
+
+def make_stub(identifier: str, options: Mapping[str, Any]) -> str:
+    """Write the `mkdocstrings` block documenting an identifier.
+
+    Args:
+        identifier:
+            The identifier to document.
+        options:
+            The options of the block; none are written if empty.
+
+    Returns:
+        The `:::` block.
+    """
+    stub = f"::: {identifier}\n"
+    if options:
+        block = yaml.safe_dump({"options": dict(options)}, sort_keys=False)
+        stub += textwrap.indent(block, "    ")
+    return stub
+
+
+def _count_lines(path: Path) -> Optional[int]:
+    """Count the lines of a source file, or None if it cannot be read."""
+    try:
+        source = path.read_bytes()
+    except OSError:
+        return None
+    return source.count(b"\n") + (not source.endswith(b"\n"))
+
+
+def _count_symbols(path: Path) -> Optional[int]:
+    """Count the public names of a module, or None if it cannot be scanned."""
+    from mkdocs_autoapi.scanning import scan_module
+
+    if path.suffix not in (".py", ".pyi"):
+        return None
+    scan = scan_module(path)
+    return None if scan is None else len(scan.names)
+
+
+def select_module_options(
+    page: PlannedPage,
+    rules: Iterable[Mapping[str, Any]],
+) -> Dict[str, Any]:
+    """Select the `mkdocstrings` options of a module.
+
+    A rule (an entry of `autoapi_module_options`) matches a module if its
+    identifier matches `pattern` (a case-sensitive `fnmatch` pattern), its
+    source file has at least `min_lines` lines and it defines at least
+    `min_symbols` public top-level names, ignoring unset conditions. The
+    module's size is only measured if a rule needs it.
+
+    Args:
+        page:
+            The planned page of the module.
+        rules:
+            The rules, in configuration order.
+
+    Returns:
+        The options of the matching rules, later rules taking precedence.
+    """
+    options: Dict[str, Any] = {}
+    sizes: Dict[str, Optional[int]] = {}
+    measures = {"min_lines": _count_lines, "min_symbols": _count_symbols}
+    for rule in rules:
+        pattern = rule.get("pattern")
+        if pattern is not None and not fnmatch.fnmatchcase(
+            page.identifier, pattern
+        ):
+            continue
+        matches = True
+        for condition, measure in measures.items():
+            minimum = rule.get(condition)
+            if minimum is None:
+                continue
+            if condition not in sizes:
+                sizes[condition] = (
+                    None
+                    if page.source_path is None
+                    else measure(page.source_path)
+                )
+            if sizes[condition] is None or sizes[condition] < minimum:
+                matches = False
+                break
+        if matches:
+            options.update(rule.get("options") or {})
+    return options
+
+
+def _is_small_module(
+    page: PlannedPage,
+    max_lines: Optional[int],
+    max_symbols: Optional[int],
+) -> bool:
+    """Check whether a module is small enough to be aggregated."""
+    path = page.source_path
+    if path is None or path.suffix not in (".py", ".pyi"):
+        return False
+    if max_lines is not None:
+        lines = _count_lines(path)
+        if lines is None or lines > max_lines:
+            return False
+    if max_symbols is None:
+        return True
+    symbols = _count_symbols(path)
+    return symbols is not None and symbols <= max_symbols
+
+
+def aggregate_small_modules(
+    pages: List[PlannedPage],
+    max_lines: Optional[int],
+    max_symbols: Optional[int],
+    autoapi_root: str,
+    theme: str,
+) -> List[PlannedPage]:
+    """Document small modules on their package's index page.
+
+    A module (not a package) is small if its source file has at most
+    `max_lines` lines and defines at most `max_symbols` public top-level
+    names, ignoring a limit set to None. Instead of a page of its own, it gets
+    a section, headed by its name, on the index page of its parent package.
+    If the package has no index page (e.g., a namespace package), one is
+    generated.
+
+    Args:
+        pages:
+            The planned pages, in navigation order.
+        max_lines:
+            The maximum number of lines of a small module, or None.
+        max_symbols:
+            The maximum number of public names of a small module, or None.
+        autoapi_root:
+            The directory the pages are generated in.
+        theme:
+            The name of the MkDocs theme.
+
+    Returns:
+        The pages, without the pages of small modules and with their sections
+        added to the index pages.
+    """
+    index_pages = {
+        page.module_path: page
+        for page in pages
+        if posixpath.basename(page.doc_path) == "index.md"
+    }
+
+    result = []
+    aggregated = 0
+    for page in pages:
+        parent = page.module_path[:-1]
+        if (
+            not parent
+            or posixpath.basename(page.doc_path) == "index.md"
+            or not _is_small_module(page, max_lines, max_symbols)
+        ):
+            result.append(page)
+            continue
+
+        if parent not in index_pages:
+            index_pages[parent] = _make_index_page(
+                module_path=parent, autoapi_root=autoapi_root, theme=theme
             )
+            _insert_index_page(result, index_pages[parent])
+        index_page = index_pages[parent]
+        page.doc_path = index_page.doc_path
+        page.in_nav = False
+        page.content = make_stub(
+            page.identifier, {**page.options, "show_root_heading": True}
+        )
+        index_page.sections.append(page)
+        index_page.content += f"\n{page.content}"
+        aggregated += 1
 
-        # Step 6.6
-        if autoapi_keep_files:
-            if not full_local_doc_path.parents[0].exists():
-                os.makedirs(full_local_doc_path.parents[0])
+    logger.debug(msg=f"... Aggregated {aggregated} small modules ...")
+    return result
 
-            try:
-                with open(full_local_doc_path, "r+") as doc:
-                    old_content = doc.read()
-                    new_content = f"::: {module_identifier}\n"
 
-                    if old_content != new_content:
-                        doc.seek(0)
-                        doc.write(new_content)
-                        doc.truncate()
+def plan_depends_on_sizes(config: Mapping[str, Any]) -> bool:
+    """Check whether the plan depends on the size of the source files.
 
-            except FileNotFoundError:
-                with open(full_local_doc_path, "w") as doc:
-                    print(f"::: {module_identifier}", file=doc)
+    With aggregation, editing a module can give it a page of its own or make
+    it a section of its package's page, and with a `min_lines` or
+    `min_symbols` rule in `autoapi_module_options`, it can change the options
+    of its page. A plan reused across builds (e.g., by the build daemon) must
+    then be made again when a source file is modified.
 
-        with mkdocs_autoapi.generate_files.open(full_temp_doc_path, "w") as doc:
-            print(f"::: {module_identifier}", file=doc)
+    Args:
+        config:
+            The plugin configuration.
 
-        # Step 6.7
-        mkdocs_autoapi.generate_files.set_edit_path(full_temp_doc_path, file)
+    Returns:
+        Whether modules are documented depending on their size.
+    """
+    if (
+        config.get("autoapi_aggregate_max_lines") is not None
+        or config.get("autoapi_aggregate_max_symbols") is not None
+    ):
+        return True
+    return any(
+        rule.get("min_lines") is not None or rule.get("min_symbols") is not None
+        for rule in config.get("autoapi_module_options") or []
+    )
 
-    # Step 7
+
+def cap_nav_depth(
+    pages: List[PlannedPage],
+    depth: int,
+    autoapi_root: str,
+    theme: str,
+) -> List[PlannedPage]:
+    """Limit the depth of the API navigation.
+
+    Pages of modules nested more than `depth` levels deep are removed from the
+    navigation and listed on the index page of their ancestor package at
+    `depth` instead. If that package has no index page (e.g., a namespace
+    package), one is generated.
+
+    Args:
+        pages:
+            The planned pages, in navigation order.
+        depth:
+            The maximum number of module path parts shown in the navigation.
+        autoapi_root:
+            The directory the pages are generated in.
+        theme:
+            The name of the MkDocs theme.
+
+    Returns:
+        The pages, with deeper pages excluded from the navigation and index
+        pages added or extended as needed.
+    """
+    index_pages = {
+        page.module_path: page
+        for page in pages
+        if posixpath.basename(page.doc_path) == "index.md"
+    }
+    listings: Dict[Tuple[str, ...], List[PlannedPage]] = {}
+
+    result = []
+    for page in pages:
+        if len(page.module_path) <= depth:
+            result.append(page)
+            continue
+
+        ancestor = page.module_path[:depth]
+        if ancestor not in index_pages:
+            index_pages[ancestor] = _make_index_page(
+                module_path=ancestor, autoapi_root=autoapi_root, theme=theme
+            )
+            _insert_index_page(result, index_pages[ancestor])
+        listings.setdefault(ancestor, []).append(page)
+        page.in_nav = False
+        result.append(page)
+
+    for ancestor, listed_pages in listings.items():
+        index_page = index_pages[ancestor]
+        index_dir = posixpath.dirname(index_page.doc_path)
+        lines = ["", "## Submodules", ""]
+        for page in listed_pages:
+            link = page.doc_path[len(index_dir) + 1 :]
+            lines.append(f"* [`{'.'.join(page.module_path)}`]({link})")
+        index_page.content += "\n".join(lines) + "\n"
+
+    return result
+
+
+def create_docs(
+    config: "MkDocsConfig",
+    plan: Optional[ApiPlan] = None,
+) -> ApiPlan:
+    """Use AutoAPI approach to create documentation for a project.
+
+    Steps:
+        1.  Define variables.
+        2.  Add the AutoAPI section to the navigation if desired.
+        3.  Plan the pages and navigation (see `plan_docs`), unless a plan is
+            given.
+        4.  For each planned page (creating the directories of local copies
+            once beforehand):
+            1.  Create the local copy of the documentation file if desired.
+            2.  Create the documentation file.
+            3.  Set the edit path, unless the page was generated for a
+                package without an index page.
+        5.  Write the navigation to `autoapi/summary.md`.
+
+    If `autoapi_keep_files` is enabled, local copies of the generated files
+    are written to `autoapi_keep_files_dir` (default:
+    `<docs_dir>/<autoapi_root>`). Local copies are only rewritten when their
+    content changes.
+
+    Args:
+        config:
+            The MkDocs configuration object.
+        plan:
+            A previously computed plan (e.g., loaded from a prebuilt bundle).
+            Defaults to None, meaning the plan is computed from the AutoAPI
+            directories.
+
+    Returns:
+        The plan of the generated documentation.
+    """
+    # Step 1
+    logger.debug(msg="Generating AutoAPI documentation ...")
+    autoapi_add_nav_entry = config["autoapi_add_nav_entry"]
+    autoapi_root = config["autoapi_root"]
+    autoapi_keep_files = config["autoapi_keep_files"]
+    local_dir = get_keep_files_dir(config=config)
+    local_summary_path = local_dir / "summary.md"
+    temp_summary_path = f"{autoapi_root}/summary.md"
+
+    # Step 2
+    if autoapi_add_nav_entry:
+        add_autoapi_nav_entry(config=config)
+        logger.debug(msg="... Added AutoAPI section to navigation ...")
+    else:
+        logger.debug(msg="... Skipped adding AutoAPI section to navigation ...")
     if autoapi_keep_files:
-        try:
-            with open(local_summary_path, "r+") as local_nav_file:
-                old_content = local_nav_file.read()
-                literate_nav = list(navigation.build_literate_nav())
-                new_content = "".join(literate_nav)
+        logger.debug(
+            msg=f"... AutoAPI files will be saved locally in {local_dir} ..."
+        )
+    else:
+        logger.debug(msg="... AutoAPI files will not be saved locally ...")
 
-                if old_content != new_content:
-                    local_nav_file.seek(0)
-                    local_nav_file.write(new_content)
-                    local_nav_file.truncate()
+    # Step 3
+    if plan is None:
+        plan = plan_docs(
+            config=config,
+            theme=config.theme.name,
+            handler=config.plugins["mkdocstrings"].config.default_handler,
+        )
 
-        except FileNotFoundError:
-            with open(local_summary_path, "w") as local_nav_file:
-                local_nav_file.writelines(navigation.build_literate_nav())
+    # Step 4
+    root_prefix = f"{Path(autoapi_root).as_posix()}/"
+    if autoapi_keep_files:
+        local_dirs = {
+            posixpath.dirname(page.doc_path[len(root_prefix) :])
+            for page in plan.pages
+        }
+        for directory in sorted(local_dirs):
+            os.makedirs(local_dir / directory, exist_ok=True)
+
+    for page in plan.pages:
+        # Step 4.1
+        if autoapi_keep_files:
+            write_if_changed(
+                path=local_dir / page.doc_path[len(root_prefix) :],
+                content=page.content,
+            )
+
+        # Step 4.2
+        with mkdocs_autoapi.generate_files.open(page.doc_path, "w") as doc:
+            doc.write(page.content)
+
+        # Step 4.3
+        if page.source_path is not None:
+            mkdocs_autoapi.generate_files.set_edit_path(
+                page.doc_path, page.source_path
+            )
 
+    # Step 5
+    summary = plan.summary
+    if autoapi_keep_files:
+        write_if_changed(path=local_summary_path, content=summary)
         logger.debug(
             msg=f"... Saved AutoAPI summary file locally in {local_summary_path} ..."
         )
@@ -283,5 +936,6 @@ def create_docs(
     with mkdocs_autoapi.generate_files.open(
         temp_summary_path, "w"
     ) as temp_nav_file:
-        temp_nav_file.writelines(navigation.build_literate_nav())
+        temp_nav_file.write(summary)
     logger.debug("... Finished generating AutoAPI documentation.")
+    return plan
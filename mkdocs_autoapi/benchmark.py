@@ -0,0 +1,332 @@
+"""Memory benchmarks of the generation pipeline.
+
+The benchmark generates a synthetic package tree and runs the stages of the
+plugin on it, recording with `tracemalloc` for each stage:
+
+- `peak`: The highest amount of memory allocated during the stage.
+- `retained`: The memory allocated during the stage that is still in use
+  after it (i.e., held by its results).
+
+The stages are:
+
+- `discovery`: Finding the files to document (sets of paths).
+- `plan`: Planning the pages and the `Nav` nested dicts (including the
+  discovery `plan_docs` runs itself).
+- `files`: Writing the pages through the `FilesEditor` (its `ChainMap` of
+  `File` objects and edit paths).
+- `nav`: Resolving the literate navigation (parsed `ElementTree`s and the
+  parser's `seen_items`).
+
+Results can be saved as a baseline and compared against later to flag
+regressions. Durations are reported too, but `tracemalloc` slows the stages
+down considerably, so they are only meaningful relative to each other.
+"""
+
+# built-in imports
+import dataclasses
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+BASELINE_FORMAT = 1
+"""The version of the baseline file layout."""
+
+MIN_REGRESSION_BYTES = 64 * 1024
+"""Differences below this size are never reported as regressions."""
+
+
+@dataclasses.dataclass
+class StageResult:
+    """Define the measurements of a stage."""
+
+    name: str
+    """The name of the stage."""
+    peak: int
+    """The peak memory allocated during the stage, in bytes."""
+    retained: int
+    """The memory allocated during the stage and still in use, in bytes."""
+    seconds: float
+    """The duration of the stage."""
+
+
+def generate_tree(root: Path, modules: int, fanout: int = 10) -> None:
+    """Generate a synthetic package tree.
+
+    Packages are filled breadth-first: each package holds up to `fanout`
+    modules and `fanout` subpackages.
+
+    Args:
+        root:
+            The directory to create the tree in.
+        modules:
+            The number of modules to create (including `__init__.py` files).
+        fanout:
+            The number of modules and subpackages per package.
+    """
+    source = '"""Synthetic module."""\n\n\ndef function(x):\n    return x\n'
+    packages = [root / "synthetic"]
+    created = 0
+    while packages and created < modules:
+        package = packages.pop(0)
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text(source)
+        created += 1
+        for i in range(fanout):
+            if created >= modules:
+                break
+            (package / f"module_{i}.py").write_text(source)
+            created += 1
+        packages.extend(package / f"package_{i}" for i in range(fanout))
+
+
+def _measure(name: str, stage: Callable[[], Any]) -> StageResult:
+    """Run a stage and measure its memory use.
+
+    The stage's result is kept alive until the retained memory is measured.
+    """
+    gc.collect()
+    tracemalloc.clear_traces()
+    start = time.perf_counter()
+    result = stage()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    del result
+    return StageResult(name=name, peak=peak, retained=retained, seconds=seconds)
+
+
+def run_benchmark(
+    options: Dict[str, Any],
+    modules: int,
+    fanout: int = 10,
+) -> List[StageResult]:
+    """Run the benchmark.
+
+    Steps:
+        1.  Generate the synthetic tree and a MkDocs configuration.
+        2.  Run and measure each stage. Each stage uses the results of the
+            previous ones, which stay alive (and are not counted again).
+
+    Args:
+        options:
+            The plugin options (`autoapi_dir` and `docs_dir` are set to the
+            synthetic tree).
+        modules:
+            The number of modules in the synthetic tree.
+        fanout:
+            The number of modules and subpackages per package.
+
+    Returns:
+        The results of the stages.
+    """
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure.files import Files
+
+    from mkdocs_autoapi.autoapi import (
+        create_docs,
+        discover_files,
+        get_autoapi_roots,
+        plan_docs,
+    )
+    from mkdocs_autoapi.generate_files.editor import FilesEditor
+    from mkdocs_autoapi.literate_nav.resolve import resolve_directories_in_nav
+
+    with tempfile.TemporaryDirectory(prefix="autoapi-benchmark") as tmp:
+        # Step 1
+        root = Path(tmp)
+        generate_tree(root / "src", modules=modules, fanout=fanout)
+        (root / "docs").mkdir()
+        config = MkDocsConfig(config_file_path=str(root / "mkdocs.yml"))
+        config.load_dict(
+            {
+                "site_name": "Benchmark",
+                "docs_dir": str(root / "docs"),
+                "site_dir": str(root / "site"),
+            }
+        )
+        errors, _ = config.validate()
+        if errors:
+            raise RuntimeError(f"Invalid benchmark configuration: {errors}")
+        config.update(options)
+        config.update(
+            {
+                "autoapi_dir": str(root / "src"),
+                "autoapi_add_nav_entry": False,
+                "docs_dir": str(root / "docs"),
+            }
+        )
+        markdown_config = {
+            "markdown_extensions": config.markdown_extensions,
+            "extension_configs": config["mdx_configs"],
+            "tab_length": 4,
+        }
+
+        # Step 2
+        results = []
+        tracemalloc.start()
+        try:
+            roots = get_autoapi_roots(config=config)
+            discovered: List[Any] = []
+            results.append(
+                _measure(
+                    "discovery",
+                    lambda: discovered.append(
+                        discover_files(
+                            roots=roots,
+                            max_workers=config["autoapi_discovery_workers"],
+                            backend=config["autoapi_discovery_backend"],
+                        )
+                    ),
+                )
+            )
+
+            plans: List[Any] = []
+            results.append(
+                _measure(
+                    "plan",
+                    lambda: plans.append(
+                        plan_docs(
+                            config=config, theme="mkdocs", handler="python"
+                        )
+                    ),
+                )
+            )
+
+            editors: List[Any] = []
+
+            def write_files():
+                editor = FilesEditor(
+                    files=Files([]), config=config, directory=str(root / "gen")
+                )
+                with editor:
+                    create_docs(config=config, plan=plans[0])
+                editors.append((editor, editor.files))
+
+            results.append(_measure("files", write_files))
+
+            results.append(
+                _measure(
+                    "nav",
+                    lambda: resolve_directories_in_nav(
+                        nav_data=[{"API": f"{config['autoapi_root']}/"}],
+                        files=editors[0][1],
+                        nav_file_name="summary.md",
+                        implicit_index=False,
+                        markdown_config=markdown_config,
+                    ),
+                )
+            )
+        finally:
+            tracemalloc.stop()
+
+    return results
+
+
+def _format_size(size: int) -> str:
+    """Format a size in bytes."""
+    return f"{size / 1024 / 1024:.1f} MiB"
+
+
+def format_results(results: List[StageResult]) -> str:
+    """Format benchmark results as a table."""
+    lines = [f"{'stage':<12}{'peak':>14}{'retained':>14}{'time':>10}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<12}{_format_size(result.peak):>14}"
+            f"{_format_size(result.retained):>14}{result.seconds:>9.2f}s"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def save_baseline(
+    results: List[StageResult], modules: int, fanout: int, path: Path
+) -> None:
+    """Save benchmark results as a baseline.
+
+    Args:
+        results:
+            The results to save.
+        modules:
+            The number of modules in the synthetic tree.
+        fanout:
+            The number of modules and subpackages per package.
+        path:
+            The baseline file.
+    """
+    baseline = {
+        "format": BASELINE_FORMAT,
+        "modules": modules,
+        "fanout": fanout,
+        "python": "{}.{}".format(*sys.version_info[:2]),
+        "stages": {
+            result.name: {"peak": result.peak, "retained": result.retained}
+            for result in results
+        },
+    }
+    os.makedirs(path.parent, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    """Load a baseline saved by `save_baseline`.
+
+    Raises:
+        ValueError: If the file is not a baseline of a supported format.
+    """
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    if baseline.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"{path} is not a supported benchmark baseline.")
+    return baseline
+
+
+def find_regressions(
+    results: List[StageResult],
+    baseline: Dict[str, Any],
+    tolerance: float,
+) -> List[str]:
+    """Compare benchmark results to a baseline.
+
+    A measurement regresses if it exceeds the baseline by more than
+    `tolerance` (a fraction of the baseline) and by at least
+    `MIN_REGRESSION_BYTES`.
+
+    Args:
+        results:
+            The results to compare.
+        baseline:
+            The baseline, as loaded by `load_baseline`.
+        tolerance:
+            The allowed relative increase.
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for result in results:
+        expected: Optional[Dict[str, int]] = baseline["stages"].get(result.name)
+        if expected is None:
+            continue
+        for metric in ("peak", "retained"):
+            value = getattr(result, metric)
+            limit = expected[metric] * (1 + tolerance)
+            if (
+                value > limit
+                and value - expected[metric] >= MIN_REGRESSION_BYTES
+            ):
+                regressions.append(
+                    f"{result.name} {metric}: {_format_size(value)} "
+                    f"(baseline {_format_size(expected[metric])})"
+                )
+    return regressions
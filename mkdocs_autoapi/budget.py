@@ -0,0 +1,265 @@
+"""Time and size budget for rendering API pages.
+
+A single pathological module (e.g., huge enumerations or generated code) can
+take minutes to render with `mkdocstrings` and produce pages too large to be
+useful. With `autoapi_render_time_budget` or `autoapi_render_size_budget` set,
+the conversion of each API page is limited: when a page goes over budget, it
+is converted again from a degraded stub listing the members of its module,
+found by a static scan (see `mkdocs_autoapi.scanning`), with a visible notice,
+and the module is reported in a warning.
+
+The time budget covers rendering only: the timer is paused while the handler
+collects data, which loads whole packages at once, is shared by all their
+pages and must not be left incomplete. It interrupts the conversion with a
+`SIGALRM` timer, which is only possible in the main thread on platforms with
+`signal.setitimer`. Elsewhere, it is checked once the conversion is finished,
+so the page is still degraded but the build is not spared the time.
+
+Degraded pages are marked with `DEGRADED_ATTRIBUTE`, so their conversion is
+not stored in the render cache: a later build converts them again, warning
+again (and failing with `--strict`) if they are still over budget.
+"""
+
+# built-in imports
+import html
+import inspect
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+from mkdocs_autoapi.scanning import scan_module
+
+logger = get_logger(name="mkdocs-autoapi")
+
+_Module = Tuple[str, Optional[str]]
+"""The identifier and source path of a module documented by a page."""
+
+_Members = List[Tuple[str, List[str]]]
+"""The identifier and public member names of each module of a page."""
+
+DEGRADED_ATTRIBUTE = "autoapi_degraded"
+"""The attribute marking a degraded page, set to why it is degraded."""
+
+_PAUSE_ATTRIBUTE = "_autoapi_budget_pause"
+"""The attribute marking a handler whose collection pauses the budget."""
+
+_collect_seconds = 0.0
+"""The time spent collecting in the main thread, excluded from budgets."""
+
+
+class BudgetExceeded(BaseException):
+    """Raised when the time budget of a conversion is spent.
+
+    Derives from `BaseException`, so libraries catching `Exception` while
+    converting the page do not swallow it.
+    """
+
+
+def _raise_exceeded(signum: int, frame: Any) -> None:
+    """Interrupt the current conversion."""
+    raise BudgetExceeded
+
+
+def _can_interrupt() -> bool:
+    """Check whether a conversion can be interrupted by a timer."""
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+def exclude_collection(handler: Any) -> None:
+    """Pause the time budget while a handler collects data (once per handler).
+
+    Args:
+        handler:
+            The `mkdocstrings` handler.
+    """
+    if getattr(handler, _PAUSE_ATTRIBUTE, False):
+        return
+
+    collect = handler.collect
+
+    def paused_collect(*args, **kwargs):
+        global _collect_seconds
+
+        if not _can_interrupt():
+            return collect(*args, **kwargs)
+        remaining, _ = signal.setitimer(signal.ITIMER_REAL, 0)
+        start = time.perf_counter()
+        try:
+            return collect(*args, **kwargs)
+        finally:
+            _collect_seconds += time.perf_counter() - start
+            if remaining:
+                signal.setitimer(signal.ITIMER_REAL, remaining)
+
+    handler.collect = paused_collect
+    setattr(handler, _PAUSE_ATTRIBUTE, True)
+
+
+def _scan_members(modules: List[_Module]) -> _Members:
+    """Find the public members of the modules of a page."""
+    members = []
+    for identifier, source_path in modules:
+        scan = scan_module(Path(source_path)) if source_path else None
+        members.append((identifier, scan.names if scan is not None else []))
+    return members
+
+
+def _register_anchor(autorefs_plugin: Any, page: Any, identifier: str) -> None:
+    """Register the anchor of an object with `autorefs`.
+
+    Versions of `autorefs` before 1.3 take the page's URL instead of the page.
+    """
+    register_anchor = autorefs_plugin.register_anchor
+    try:
+        first = next(
+            iter(inspect.signature(register_anchor).parameters.values())
+        )
+    except (StopIteration, TypeError, ValueError):
+        first = None
+    if first is not None and first.annotation in (str, "str"):
+        register_anchor(page.url, identifier)
+    else:
+        register_anchor(page, identifier)
+
+
+def degraded_markdown(members: _Members, reason: str) -> str:
+    """Write the degraded stub of a page.
+
+    The stub has a heading per module, a notice, and the list of the module's
+    public members, whose HTML IDs are their identifiers (as with
+    `mkdocstrings`), so links to them still point to the right page.
+
+    Args:
+        members:
+            The identifier and public member names of each module documented
+            by the page, the page's own module first.
+        reason:
+            Why the page is degraded, to complete "The documentation of this
+            page was reduced to the list of members because ...".
+
+    Returns:
+        The Markdown of the stub.
+    """
+    lines = []
+    for level, (identifier, names) in enumerate(members):
+        anchor = html.escape(identifier)
+        lines.extend(
+            [
+                f"{'#' * min(level + 1, 2)} `{identifier}`",
+                "",
+                f'<div class="autoapi-degraded" id="{anchor}">',
+            ]
+        )
+        if level == 0:
+            lines.append(
+                "<p><strong>Note:</strong> the documentation of this page "
+                f"was reduced to the list of members because {reason}.</p>"
+            )
+        lines.append("<ul>")
+        lines.extend(
+            f'<li><code id="{html.escape(f"{identifier}.{name}")}">'
+            f"{html.escape(name)}</code></li>"
+            for name in names
+        )
+        lines.extend(["</ul>", "</div>", ""])
+    return "\n".join(lines)
+
+
+def limit_render(
+    page: Any,
+    modules: List[_Module],
+    max_seconds: Optional[float],
+    max_size: Optional[int],
+    handler: Any = None,
+    autorefs_plugin: Any = None,
+) -> None:
+    """Limit the conversion of a page to a time and size budget.
+
+    Replaces the page's `render` method, called by MkDocs to convert the page
+    after the `on_page_markdown` events, with one that converts the degraded
+    stub instead when the page goes over budget.
+
+    Steps:
+        1.  Convert the page, interrupting the conversion after `max_seconds`
+            of rendering if possible.
+        2.  Check the time taken, if the conversion could not be interrupted,
+            and the size of the HTML.
+        3.  If over budget, warn, mark the page as degraded and convert the
+            degraded stub, registering the anchors of its objects with
+            `autorefs`.
+
+    Args:
+        page:
+            The page.
+        modules:
+            The modules documented by the page, the page's own module first.
+        max_seconds:
+            The time budget, in seconds (None for no limit).
+        max_size:
+            The size budget of the HTML, in bytes (None for no limit).
+        handler:
+            The `mkdocstrings` handler converting the page, if any, whose
+            collection is excluded from the time budget.
+        autorefs_plugin:
+            The `autorefs` plugin instance, if any.
+    """
+    if handler is not None:
+        exclude_collection(handler)
+    render = page.render
+
+    def limited_render(config, files):
+        # Step 1
+        reason = None
+        interrupt = bool(max_seconds) and _can_interrupt()
+        if interrupt:
+            previous = signal.signal(signal.SIGALRM, _raise_exceeded)
+            signal.setitimer(signal.ITIMER_REAL, max_seconds)
+        start = time.perf_counter() - _collect_seconds
+        try:
+            render(config, files)
+        except BudgetExceeded:
+            reason = f"rendering it took more than {max_seconds} s"
+            # Drop the headings gathered by the interrupted rendering.
+            if hasattr(handler, "get_headings"):
+                handler.get_headings()
+        finally:
+            if interrupt:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+
+        # Step 2
+        if reason is None:
+            seconds = time.perf_counter() - _collect_seconds - start
+            size = len(page.content.encode("utf-8"))
+            if max_seconds and seconds > max_seconds:
+                reason = f"rendering it took {seconds:.1f} s"
+            elif max_size and size > max_size:
+                reason = f"its HTML is {size // 1024} KiB"
+        if reason is None:
+            return
+
+        # Step 3
+        logger.warning(
+            msg=f"Reduced the documentation of {modules[0][0]} to the list "
+            f"of its members: {reason}, which is over budget."
+        )
+        setattr(page, DEGRADED_ATTRIBUTE, reason)
+        members = _scan_members(modules)
+        page.markdown = degraded_markdown(members=members, reason=reason)
+        render(config, files)
+        if autorefs_plugin is not None:
+            for identifier, names in members:
+                _register_anchor(autorefs_plugin, page, identifier)
+                for name in names:
+                    _register_anchor(
+                        autorefs_plugin, page, f"{identifier}.{name}"
+                    )
+
+    page.render = limited_render
@@ -0,0 +1,481 @@
+"""Prebuilt bundles of generated AutoAPI files.
+
+A bundle holds everything `create_docs` would generate: the page stubs,
+`summary.md` and the edit path of every page. It is either a directory or a
+zip file with the following layout:
+
+    manifest.json
+    files/<autoapi_root>/summary.md
+    files/<autoapi_root>/<module path>.md
+    ...
+
+The manifest records the bundle format, the inputs the plan was made from
+(see `collect_inputs`) and their fingerprint, and one entry per page with its
+navigation path, `mkdocstrings` identifier and source path (relative to the
+directory of `mkdocs.yml`, so bundles can be moved between checkouts), and the
+same for the small modules documented on the page.
+
+The inputs are the plugin version, the theme, the handler, the plugin options
+the plan depends on, and the content hash of every file to document. Finding
+these files only lists the AutoAPI directories, so a build using a bundle can
+collect its inputs again, without planning, and warn if they differ from the
+bundled ones (e.g., the bundle was built from an older checkout).
+"""
+
+# built-in imports
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+# third-party imports
+from mkdocs.exceptions import ConfigurationError
+
+# local imports
+from mkdocs_autoapi import get_version
+from mkdocs_autoapi.autoapi import (
+    ApiPlan,
+    PlannedPage,
+    discover_files,
+    get_autoapi_roots,
+)
+from mkdocs_autoapi.generate_files import nav
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+BUNDLE_FORMAT = 2
+"""The version of the bundle layout."""
+
+MANIFEST_NAME = "manifest.json"
+"""The name of the manifest file in a bundle."""
+
+FILES_DIR = "files"
+"""The directory holding the generated files in a bundle."""
+
+PLAN_OPTIONS = (
+    "autoapi_root",
+    "autoapi_module_options",
+    "autoapi_aggregate_max_lines",
+    "autoapi_aggregate_max_symbols",
+    "autoapi_nav_depth",
+)
+"""The plugin options the plan depends on, besides the AutoAPI directories."""
+
+
+def _source_path(path: Optional[Path], base_dir: Path) -> Optional[str]:
+    """Get a page's source path as stored in a manifest."""
+    if path is None:
+        return None
+    try:
+        return path.relative_to(base_dir).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _hash_file(path: Path) -> str:
+    """Get the SHA-256 hash of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _plan_option(name: str, value: Any) -> Any:
+    """Get a plugin option as recorded in the inputs."""
+    if name == "autoapi_module_options":
+        # Unset conditions are left out, whether validated or not.
+        return [
+            {key: item for key, item in dict(rule).items() if item is not None}
+            for rule in value or []
+        ]
+    return value
+
+
+def collect_inputs(
+    config: Mapping[str, Any],
+    theme: str,
+    handler: str,
+    base_dir: Path,
+) -> Dict[str, Any]:
+    """Collect the inputs a plan is made from.
+
+    Steps:
+        1.  Find the files to document in each AutoAPI directory.
+        2.  Hash the content of each file.
+        3.  Record the AutoAPI directories (with their patterns) and the
+            other options the plan depends on.
+
+    Args:
+        config:
+            The plugin configuration.
+        theme:
+            The name of the MkDocs theme.
+        handler:
+            The default `mkdocstrings` handler.
+        base_dir:
+            The directory paths are recorded relative to.
+
+    Returns:
+        The inputs, as JSON-serializable data.
+    """
+    # Step 1
+    base_dir = Path(os.path.abspath(base_dir))
+    roots = get_autoapi_roots(config=config)
+    discovered_files = discover_files(
+        roots=roots,
+        max_workers=config["autoapi_discovery_workers"],
+        backend=config["autoapi_discovery_backend"],
+    )
+
+    # Step 2
+    sources = {}
+    for root, root_files in zip(roots, discovered_files):
+        for relative_path in root_files:
+            path = Path(os.path.abspath(root.path)) / relative_path
+            sources[_source_path(path, base_dir)] = _hash_file(path)
+
+    # Step 3
+    options = {
+        name: _plan_option(name, config.get(name)) for name in PLAN_OPTIONS
+    }
+    options["roots"] = [
+        {
+            "path": _source_path(Path(os.path.abspath(root.path)), base_dir),
+            "file_patterns": root.file_patterns,
+            "ignore": root.ignore,
+        }
+        for root in roots
+    ]
+    return {
+        "plugin_version": get_version(),
+        "theme": theme,
+        "handler": handler,
+        "options": options,
+        "sources": sources,
+    }
+
+
+def fingerprint_inputs(inputs: Mapping[str, Any]) -> str:
+    """Get the SHA-256 fingerprint of the inputs of a plan.
+
+    Args:
+        inputs:
+            The inputs (see `collect_inputs`).
+
+    Returns:
+        The fingerprint.
+    """
+    content = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _describe_paths(paths: List[str], limit: int = 5) -> str:
+    """List a few paths for a warning."""
+    names = sorted(paths)
+    described = ", ".join(names[:limit])
+    if len(names) > limit:
+        described += f" and {len(names) - limit} more"
+    return described
+
+
+def compare_inputs(
+    bundled: Mapping[str, Any], current: Mapping[str, Any]
+) -> List[str]:
+    """Describe how the inputs of a plan changed.
+
+    Args:
+        bundled:
+            The inputs the bundle was made from.
+        current:
+            The current inputs.
+
+    Returns:
+        A description of each difference.
+    """
+    differences = [
+        f"{key} {bundled.get(key)!r}, not {current[key]!r}"
+        for key in ("plugin_version", "theme", "handler")
+        if bundled.get(key) != current[key]
+    ]
+    bundled_options = bundled.get("options", {})
+    changed = sorted(
+        name
+        for name in set(bundled_options) | set(current["options"])
+        if bundled_options.get(name) != current["options"].get(name)
+    )
+    if changed:
+        differences.append(f"different options ({', '.join(changed)})")
+
+    bundled_sources = bundled.get("sources", {})
+    current_sources = current["sources"]
+    for paths, description in (
+        (set(current_sources) - set(bundled_sources), "added"),
+        (set(bundled_sources) - set(current_sources), "removed"),
+        (
+            {
+                path
+                for path in set(bundled_sources) & set(current_sources)
+                if bundled_sources[path] != current_sources[path]
+            },
+            "modified",
+        ),
+    ):
+        if paths:
+            files = "file" if len(paths) == 1 else "files"
+            differences.append(
+                f"{len(paths)} source {files} {description} since "
+                f"({_describe_paths(list(paths))})"
+            )
+    return differences
+
+
+def build_manifest(
+    plan: ApiPlan,
+    autoapi_root: str,
+    inputs: Mapping[str, Any],
+    base_dir: Path,
+) -> Dict[str, Any]:
+    """Build the manifest of a bundle.
+
+    The fingerprint is the fingerprint of the inputs (see
+    `fingerprint_inputs`), which determine the bundle's content.
+
+    Args:
+        plan:
+            The plan to bundle.
+        autoapi_root:
+            The value of `autoapi_root` the plan was made for.
+        inputs:
+            The inputs the plan was made from (see `collect_inputs`).
+        base_dir:
+            The directory source paths are stored relative to.
+
+    Returns:
+        The manifest.
+    """
+    pages = [
+        {
+            "path": page.doc_path,
+            "nav_path": list(page.nav_path),
+            "identifier": page.identifier,
+            "source_path": _source_path(page.source_path, base_dir),
+            "module_path": list(page.module_path),
+            "in_nav": page.in_nav,
+            "options": page.options,
+            "sections": [
+                {
+                    "nav_path": list(section.nav_path),
+                    "identifier": section.identifier,
+                    "source_path": _source_path(section.source_path, base_dir),
+                    "module_path": list(section.module_path),
+                    "content": section.content,
+                    "options": section.options,
+                }
+                for section in page.sections
+            ],
+        }
+        for page in plan.pages
+    ]
+    return {
+        "format": BUNDLE_FORMAT,
+        "autoapi_root": autoapi_root,
+        "inputs": dict(inputs),
+        "fingerprint": fingerprint_inputs(inputs),
+        "pages": pages,
+    }
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    """Read the manifest of an existing bundle, if there is one."""
+    try:
+        if path.suffix == ".zip":
+            with zipfile.ZipFile(path) as archive:
+                return json.loads(archive.read(MANIFEST_NAME))
+        with open(path / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def write_bundle(
+    plan: ApiPlan,
+    path: Path,
+    autoapi_root: str,
+    inputs: Mapping[str, Any],
+    base_dir: Path,
+) -> Dict[str, Any]:
+    """Write a plan to a bundle.
+
+    If `path` ends with `.zip`, a zip file is written; otherwise a directory.
+    An existing bundle with the same fingerprint is left untouched.
+
+    Args:
+        plan:
+            The plan to bundle.
+        path:
+            The bundle to write.
+        autoapi_root:
+            The value of `autoapi_root` the plan was made for.
+        inputs:
+            The inputs the plan was made from (see `collect_inputs`).
+        base_dir:
+            The directory source paths are stored relative to.
+
+    Returns:
+        The manifest of the bundle.
+
+    Raises:
+        ConfigurationError: If `path` is an existing directory which is not a
+            bundle.
+    """
+    manifest = build_manifest(
+        plan=plan,
+        autoapi_root=autoapi_root,
+        inputs=inputs,
+        base_dir=base_dir,
+    )
+    existing = _read_manifest(path)
+    if existing and existing.get("fingerprint") == manifest["fingerprint"]:
+        logger.info(f"Bundle {path} is up to date.")
+        return manifest
+
+    files = {posixpath.join(autoapi_root, "summary.md"): plan.summary}
+    files.update((page.doc_path, page.content) for page in plan.pages)
+    manifest_content = json.dumps(manifest, indent=2, sort_keys=True)
+
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(MANIFEST_NAME, manifest_content)
+            for name, content in files.items():
+                archive.writestr(posixpath.join(FILES_DIR, name), content)
+    else:
+        if path.exists():
+            if existing is None and any(path.iterdir()):
+                raise ConfigurationError(
+                    f"Refusing to overwrite {path}: not an AutoAPI bundle."
+                )
+            shutil.rmtree(path)
+        for name, content in files.items():
+            file_path = path / FILES_DIR / name
+            os.makedirs(file_path.parent, exist_ok=True)
+            file_path.write_text(content, encoding="utf-8")
+        (path / MANIFEST_NAME).write_text(manifest_content, encoding="utf-8")
+
+    logger.info(f"Wrote {len(plan.pages)} pages to bundle {path}.")
+    return manifest
+
+
+def read_bundle(
+    path: Path,
+    autoapi_root: str,
+    inputs: Mapping[str, Any],
+    base_dir: Path,
+) -> ApiPlan:
+    """Read a plan from a bundle.
+
+    A warning is logged for each difference between the inputs the bundle
+    was made from and the current ones.
+
+    Args:
+        path:
+            The bundle to read (a directory or a zip file).
+        autoapi_root:
+            The current value of `autoapi_root`.
+        inputs:
+            The current inputs (see `collect_inputs`).
+        base_dir:
+            The directory source paths are relative to.
+
+    Returns:
+        The plan stored in the bundle.
+
+    Raises:
+        ConfigurationError: If the bundle cannot be read, has an unsupported
+            format, or was made for a different `autoapi_root`.
+    """
+    manifest = _read_manifest(path)
+    if manifest is None:
+        raise ConfigurationError(f"{path} is not a valid AutoAPI bundle.")
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ConfigurationError(
+            f"AutoAPI bundle {path} has unsupported format "
+            f"{manifest.get('format')!r} (expected {BUNDLE_FORMAT})."
+        )
+    if manifest["autoapi_root"] != autoapi_root:
+        raise ConfigurationError(
+            f"AutoAPI bundle {path} was built for autoapi_root "
+            f"{manifest['autoapi_root']!r}, not {autoapi_root!r}."
+        )
+    if manifest.get("fingerprint") != fingerprint_inputs(inputs):
+        for difference in compare_inputs(manifest["inputs"], inputs):
+            logger.warning(
+                f"AutoAPI bundle {path} is out of date: {difference}."
+            )
+
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+
+            def read(name: str) -> str:
+                return archive.read(posixpath.join(FILES_DIR, name)).decode(
+                    "utf-8"
+                )
+
+            return _plan_from_manifest(manifest, read, base_dir)
+
+    def read(name: str) -> str:
+        return (path / FILES_DIR / name).read_text(encoding="utf-8")
+
+    return _plan_from_manifest(manifest, read, base_dir)
+
+
+def _plan_from_manifest(manifest, read, base_dir: Path) -> ApiPlan:
+    """Rebuild a plan from a manifest and a function reading bundled files."""
+    autoapi_root = manifest["autoapi_root"]
+    navigation = nav.Nav()
+    pages = []
+    for entry in manifest["pages"]:
+        nav_path = tuple(entry["nav_path"])
+        in_nav = entry.get("in_nav", True)
+        if in_nav:
+            navigation[nav_path] = posixpath.relpath(
+                entry["path"], autoapi_root
+            )
+        source_path = entry["source_path"]
+        sections = [
+            PlannedPage(
+                doc_path=entry["path"],
+                nav_path=tuple(section["nav_path"]),
+                identifier=section["identifier"],
+                source_path=section["source_path"]
+                and base_dir / section["source_path"],
+                content=section["content"],
+                module_path=tuple(section["module_path"]),
+                in_nav=False,
+                options=section.get("options", {}),
+            )
+            for section in entry.get("sections", ())
+        ]
+        pages.append(
+            PlannedPage(
+                doc_path=entry["path"],
+                nav_path=nav_path,
+                identifier=entry["identifier"],
+                source_path=source_path and base_dir / source_path,
+                content=read(entry["path"]),
+                module_path=tuple(entry.get("module_path", ())),
+                in_nav=in_nav,
+                sections=sections,
+                options=entry.get("options", {}),
+            )
+        )
+    logger.debug(
+        f"Loaded {len(pages)} pages from AutoAPI bundle "
+        f"{manifest['fingerprint'][:12]}."
+    )
+    return ApiPlan(pages=pages, navigation=navigation)
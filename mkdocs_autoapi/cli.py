@@ -0,0 +1,560 @@
+"""Command line interface for mkdocs-autoapi.
+
+The commands only read the plugin's own options from the MkDocs configuration
+file. Themes, other plugins and Markdown extensions are never loaded, so the
+commands are fast enough to run on every commit. The exception is `daemon`,
+which keeps a full MkDocs build warm in memory (see `mkdocs_autoapi.daemon`).
+"""
+
+# built-in imports
+import argparse
+import copy
+import dataclasses
+import difflib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# third-party imports
+from mkdocs.exceptions import ConfigurationError
+
+# local imports
+from mkdocs_autoapi import bundle
+from mkdocs_autoapi.autoapi import ApiPlan, plan_docs
+from mkdocs_autoapi.logging import get_logger
+from mkdocs_autoapi.plugin import AutoApiPluginConfig
+
+logger = get_logger(name="mkdocs-autoapi")
+
+PLUGIN_NAME = "mkdocs-autoapi"
+"""The name of the plugin in the `plugins` list of `mkdocs.yml`."""
+
+DEFAULT_SOCKET = ".mkdocs-autoapi.sock"
+"""The default path of the build daemon's socket."""
+
+
+def _option_defaults() -> Dict[str, Any]:
+    """Get the defaults of the plugin options.
+
+    Returns:
+        A new dictionary mapping each option of `AutoApiPluginConfig` to a
+        copy of its default.
+    """
+    return {
+        name: copy.deepcopy(option.default)
+        for name, option in AutoApiPluginConfig._schema
+    }
+
+
+@dataclasses.dataclass
+class ProjectConfig:
+    """Define the parts of a MkDocs configuration used by the commands."""
+
+    config_file: Path
+    """The absolute path of the MkDocs configuration file."""
+    plugin: Dict[str, Any]
+    """The plugin options, with defaults applied and directories resolved."""
+    theme: str
+    """The name of the MkDocs theme."""
+    handler: str
+    """The default `mkdocstrings` handler."""
+
+
+def _find_plugin_options(plugins: Any, name: str) -> Optional[Dict[str, Any]]:
+    """Find the options of plugin `name` in the raw `plugins` setting."""
+    if isinstance(plugins, dict):
+        plugins = [{key: value} for key, value in plugins.items()]
+    for plugin in plugins or []:
+        if plugin == name:
+            return {}
+        if isinstance(plugin, dict) and name in plugin:
+            return dict(plugin[name] or {})
+    return None
+
+
+def load_project_config(config_file: str) -> ProjectConfig:
+    """Load the plugin configuration from a MkDocs configuration file.
+
+    Steps:
+        1.  Read the configuration file (including `INHERIT`ed files).
+        2.  Find the plugin options and apply the defaults.
+        3.  Resolve directories relative to the configuration file, as MkDocs
+            does.
+        4.  Get the theme name and the default `mkdocstrings` handler.
+
+    Args:
+        config_file:
+            The path of the MkDocs configuration file.
+
+    Returns:
+        The loaded configuration.
+
+    Raises:
+        ConfigurationError: If the plugin is not enabled or an option is not
+            known.
+    """
+    # Step 1
+    from mkdocs.utils import yaml_load
+
+    config_path = Path(config_file).absolute()
+    with open(config_path, "rb") as f:
+        raw = yaml_load(f) or {}
+
+    # Step 2
+    options = _find_plugin_options(raw.get("plugins"), PLUGIN_NAME)
+    if options is None:
+        raise ConfigurationError(
+            f"{PLUGIN_NAME} is not enabled in {config_path}."
+        )
+    defaults = _option_defaults()
+    unknown = sorted(set(options) - set(defaults))
+    if unknown:
+        raise ConfigurationError(
+            f"Unrecognised {PLUGIN_NAME} options: {', '.join(unknown)}"
+        )
+    plugin = {**defaults, **options}
+
+    # Step 3
+    config_dir = config_path.parent
+
+    def resolve(path: str) -> str:
+        return os.path.abspath(os.path.join(config_dir, str(path)))
+
+    plugin["autoapi_dir"] = resolve(plugin["autoapi_dir"])
+    plugin["autoapi_dirs"] = [
+        {**entry, "path": resolve(entry["path"])}
+        for entry in plugin["autoapi_dirs"] or []
+    ]
+    if plugin["autoapi_keep_files_dir"]:
+        plugin["autoapi_keep_files_dir"] = resolve(
+            plugin["autoapi_keep_files_dir"]
+        )
+    plugin["docs_dir"] = resolve(raw.get("docs_dir", "docs"))
+
+    # Step 4
+    theme = raw.get("theme") or "mkdocs"
+    if isinstance(theme, dict):
+        theme = theme.get("name") or "mkdocs"
+    mkdocstrings_options = _find_plugin_options(
+        raw.get("plugins"), "mkdocstrings"
+    )
+    handler = (mkdocstrings_options or {}).get("default_handler", "python")
+
+    return ProjectConfig(
+        config_file=config_path,
+        plugin=plugin,
+        theme=str(theme),
+        handler=handler,
+    )
+
+
+def format_plan(plan: ApiPlan, base_dir: Path) -> str:
+    """Format a plan as text suitable for diffing.
+
+    Args:
+        plan:
+            The plan to format.
+        base_dir:
+            The directory source paths are shown relative to.
+
+    Returns:
+        The pages (document path, identifier and source path, separated by
+        tabs; "-" for pages without a source file), followed by the literate navigation.
+        Modules aggregated into a page are listed after it, with its path.
+        Modules with `mkdocstrings` options have them as a fourth column, in
+        JSON.
+    """
+    lines = ["# Pages\n"]
+    for page in plan.pages:
+        for module in (page, *page.sections):
+            if module.source_path is None:
+                source = "-"
+            else:
+                try:
+                    source = module.source_path.relative_to(base_dir)
+                    source = source.as_posix()
+                except ValueError:
+                    source = module.source_path.as_posix()
+            line = f"{page.doc_path}\t{module.identifier}\t{source}"
+            if module.options:
+                line += f"\t{json.dumps(module.options, sort_keys=True)}"
+            lines.append(f"{line}\n")
+    lines.append("# Navigation\n")
+    lines.extend(plan.navigation.build_literate_nav())
+    return "".join(lines)
+
+
+def plan_command(args: argparse.Namespace) -> int:
+    """Print the planned API pages and navigation, or diff them.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code: 1 if `--diff` was given and the plan differs from the
+        file, 0 otherwise.
+    """
+    start = time.perf_counter()
+    project = load_project_config(args.config_file)
+    plan = plan_docs(
+        config=project.plugin,
+        theme=project.theme,
+        handler=project.handler,
+    )
+    output = format_plan(plan, base_dir=project.config_file.parent)
+    logger.info(
+        f"Planned {len(plan.pages)} pages in "
+        f"{time.perf_counter() - start:.2f} seconds."
+    )
+
+    if args.diff is None:
+        sys.stdout.write(output)
+        return 0
+
+    with open(args.diff, encoding="utf-8") as f:
+        expected = f.read()
+    diff = list(
+        difflib.unified_diff(
+            expected.splitlines(keepends=True),
+            output.splitlines(keepends=True),
+            fromfile=args.diff,
+            tofile="planned",
+        )
+    )
+    sys.stdout.writelines(diff)
+    return 1 if diff else 0
+
+
+def bundle_command(args: argparse.Namespace) -> int:
+    """Write the planned API pages to a prebuilt bundle.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code.
+    """
+    project = load_project_config(args.config_file)
+    inputs = bundle.collect_inputs(
+        config=project.plugin,
+        theme=project.theme,
+        handler=project.handler,
+        base_dir=project.config_file.parent,
+    )
+    if args.fingerprint:
+        sys.stdout.write(f"{bundle.fingerprint_inputs(inputs)}\n")
+        return 0
+    if args.output is None:
+        raise ConfigurationError("The bundle to write is required.")
+
+    plan = plan_docs(
+        config=project.plugin,
+        theme=project.theme,
+        handler=project.handler,
+    )
+    manifest = bundle.write_bundle(
+        plan=plan,
+        path=Path(args.output),
+        autoapi_root=project.plugin["autoapi_root"],
+        inputs=inputs,
+        base_dir=project.config_file.parent,
+    )
+    sys.stdout.write(f"{manifest['fingerprint']}\n")
+    return 0
+
+
+def benchmark_command(args: argparse.Namespace) -> int:
+    """Measure the memory use of each stage on a synthetic package tree.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code: 1 if `--baseline` was given and a stage regressed, 0
+        otherwise.
+    """
+    from mkdocs_autoapi import benchmark
+
+    options = {**_option_defaults(), "autoapi_discovery_workers": args.workers}
+    results = benchmark.run_benchmark(
+        options=options, modules=args.modules, fanout=args.fanout
+    )
+    sys.stdout.write(benchmark.format_results(results))
+
+    if args.save_baseline:
+        benchmark.save_baseline(
+            results=results,
+            modules=args.modules,
+            fanout=args.fanout,
+            path=Path(args.save_baseline),
+        )
+        logger.info(f"Saved baseline to {args.save_baseline}.")
+
+    if args.baseline is None:
+        return 0
+    try:
+        baseline = benchmark.load_baseline(Path(args.baseline))
+    except ValueError as e:
+        raise ConfigurationError(str(e))
+    if (baseline["modules"], baseline["fanout"]) != (args.modules, args.fanout):
+        raise ConfigurationError(
+            f"Baseline {args.baseline} was recorded with --modules "
+            f"{baseline['modules']} --fanout {baseline['fanout']}."
+        )
+    regressions = benchmark.find_regressions(
+        results=results, baseline=baseline, tolerance=args.tolerance
+    )
+    for regression in regressions:
+        logger.error(f"Memory regression: {regression}")
+    return 1 if regressions else 0
+
+
+def daemon_command(args: argparse.Namespace) -> int:
+    """Serve build requests on a Unix socket until asked to stop.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code.
+    """
+    from mkdocs_autoapi import daemon
+
+    build_daemon = daemon.BuildDaemon(
+        config_file=args.config_file, site_dir=args.site_dir
+    )
+    try:
+        daemon.serve(daemon=build_daemon, socket_path=args.socket)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def request_command(args: argparse.Namespace) -> int:
+    """Send a request to a running daemon and print its response.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code: 1 if the daemon reported an error, 0 otherwise.
+    """
+    from mkdocs_autoapi import daemon
+
+    response = daemon.request(socket_path=args.socket, command=args.request)
+    sys.stdout.write(json.dumps(response, indent=2) + "\n")
+    return 0 if response.get("ok") else 1
+
+
+def clear_cache_command(args: argparse.Namespace) -> int:
+    """Remove the entries of the render cache.
+
+    Args:
+        args:
+            The parsed command line arguments.
+
+    Returns:
+        The exit code.
+    """
+    from mkdocs_autoapi.render_cache import RenderCache, get_cache_dir
+
+    project = load_project_config(args.config_file)
+    directory = get_cache_dir(
+        config_dir=project.config_file.parent,
+        cache_dir=project.plugin["autoapi_render_cache_dir"],
+    )
+    removed = RenderCache(directory=directory, max_size=0).clear()
+    logger.info(f"Removed {removed} entries from {directory}.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="mkdocs-autoapi",
+        description="Inspect the API documentation generated by "
+        "mkdocs-autoapi without running a full MkDocs build.",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Enable debug logging."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="Print the planned API pages and navigation.",
+    )
+    plan_parser.add_argument(
+        "-f",
+        "--config-file",
+        default="mkdocs.yml",
+        help="The MkDocs configuration file (default: mkdocs.yml).",
+    )
+    plan_parser.add_argument(
+        "--diff",
+        metavar="FILE",
+        help="Compare the plan to a previously saved plan and print a "
+        "unified diff. Exits with status 1 if they differ.",
+    )
+    plan_parser.set_defaults(func=plan_command)
+
+    bundle_parser = subparsers.add_parser(
+        "bundle",
+        help="Write the generated API files to a prebuilt bundle.",
+        description="Write the generated API files to a prebuilt bundle "
+        "(a directory, or a zip file if OUTPUT ends with .zip) that builds can "
+        "consume via `autoapi_prebuilt`. Prints the bundle's fingerprint, a "
+        "hash of the inputs it is made from.",
+    )
+    bundle_parser.add_argument("output", nargs="?", help="The bundle to write.")
+    bundle_parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="Only print the fingerprint of the inputs (e.g., as a CI cache "
+        "key), without planning or writing the bundle.",
+    )
+    bundle_parser.add_argument(
+        "-f",
+        "--config-file",
+        default="mkdocs.yml",
+        help="The MkDocs configuration file (default: mkdocs.yml).",
+    )
+    bundle_parser.set_defaults(func=bundle_command)
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark",
+        help="Measure the memory use of each stage of the plugin.",
+        description="Generate a synthetic package tree and measure the peak "
+        "and retained memory of each stage of the plugin with tracemalloc.",
+    )
+    benchmark_parser.add_argument(
+        "--modules",
+        type=int,
+        default=10000,
+        help="The number of modules in the tree (default: 10000).",
+    )
+    benchmark_parser.add_argument(
+        "--fanout",
+        type=int,
+        default=10,
+        help="The number of modules and subpackages per package (default: 10).",
+    )
+    benchmark_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="The value of autoapi_discovery_workers (default: 1).",
+    )
+    benchmark_parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="Compare the results to a saved baseline. Exits with status 1 "
+        "if a stage regressed.",
+    )
+    benchmark_parser.add_argument(
+        "--save-baseline",
+        metavar="FILE",
+        help="Save the results as a baseline.",
+    )
+    benchmark_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="The allowed relative increase over the baseline (default: 0.1).",
+    )
+    benchmark_parser.set_defaults(func=benchmark_command)
+
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Build the site on request, keeping the build state warm.",
+        description="Run a build server in the foreground. It builds the site "
+        "whenever a build request arrives on its Unix socket, reusing the "
+        "imported modules, the API plan, the navigation and the compiled "
+        "templates of previous builds.",
+    )
+    daemon_parser.add_argument(
+        "-f",
+        "--config-file",
+        default="mkdocs.yml",
+        help="The MkDocs configuration file (default: mkdocs.yml).",
+    )
+    daemon_parser.add_argument(
+        "-d",
+        "--site-dir",
+        help="The directory to build the site in (default: site_dir).",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"The Unix socket to listen on (default: {DEFAULT_SOCKET}).",
+    )
+    daemon_parser.set_defaults(func=daemon_command)
+
+    request_parser = subparsers.add_parser(
+        "request",
+        help="Send a request to a running daemon.",
+        description="Send a request to a running daemon and print its JSON "
+        "response. A build response lists the output files that changed.",
+    )
+    request_parser.add_argument(
+        "request",
+        choices=("build", "status", "shutdown"),
+        help="The request to send.",
+    )
+    request_parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"The daemon's Unix socket (default: {DEFAULT_SOCKET}).",
+    )
+    request_parser.set_defaults(func=request_command)
+
+    clear_cache_parser = subparsers.add_parser(
+        "clear-cache",
+        help="Remove the cached renderings of API pages.",
+        description="Remove the entries of the render cache enabled by "
+        "`autoapi_render_cache`.",
+    )
+    clear_cache_parser.add_argument(
+        "-f",
+        "--config-file",
+        default="mkdocs.yml",
+        help="The MkDocs configuration file (default: mkdocs.yml).",
+    )
+    clear_cache_parser.set_defaults(func=clear_cache_command)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface.
+
+    Args:
+        argv:
+            The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        The exit code.
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        format="%(levelname)-7s -  %(message)s",
+        level=logging.DEBUG if args.verbose else logging.INFO,
+    )
+    try:
+        return args.func(args)
+    except (ConfigurationError, OSError) as e:
+        logger.error(str(e))
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
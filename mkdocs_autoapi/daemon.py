@@ -0,0 +1,457 @@
+"""Long-lived build server that keeps the AutoAPI state warm.
+
+Every `mkdocs build` pays again for starting the interpreter, importing
+MkDocs, its plugins and themes, discovering the files to document, planning
+the pages and resolving the navigation. The daemon runs in a single process
+and builds the site on request, received over a local Unix socket, keeping in
+memory between builds:
+
+- The imported modules and the plugins that MkDocs keeps across
+  configuration reloads (the ones defining `on_startup` or `on_shutdown`).
+- The plan of the API pages (discovered files and generated `Nav`).
+- The resolved navigation.
+- The compiled templates, including the ones rewritten by
+  `mkdocs_autoapi.section_index.rewrite`.
+
+The MkDocs configuration is validated again for each build, as `mkdocs serve`
+does, because plugins modify it while building. Each build gets a new
+`AutoApiPlugin` instance, so nothing of a build leaks into the next one but
+the state the daemon attaches to it (`WarmState`). The plan and the navigation
+are reused until a file is created, deleted or moved below an AutoAPI
+directory or the docs directory, or the configuration file changes. When the
+plan depends on the size of the source files (see
+`mkdocs_autoapi.autoapi.plan_depends_on_sizes`), modifying a file below an
+AutoAPI directory invalidates it too. A `watchdog` observer (a dependency of
+MkDocs) tracks these events. The watched directories depend on the
+configuration, so the observer is scheduled again by the first build after the
+configuration file changes.
+
+Requests and responses are single lines of JSON:
+
+- `{"command": "build"}`: Build the site. The response lists the output files
+  (relative to `site_dir`) whose content changed since the previous build and
+  the ones that were removed.
+- `{"command": "status"}`: Report the number of builds and whether the plan
+  is warm.
+- `{"command": "shutdown"}`: Stop the daemon.
+"""
+
+# built-in imports
+import dataclasses
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# third-party imports
+from jinja2.bccache import Bucket, BytecodeCache
+
+# local imports
+from mkdocs_autoapi.cli import PLUGIN_NAME
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+NAV_FILE_NAME = "summary.md"
+"""The name of literate navigation files."""
+
+_CHANGE_EVENTS = ("created", "deleted", "moved", "modified")
+"""The `watchdog` event types that can invalidate the warm state."""
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """A Jinja bytecode cache held in memory.
+
+    Jinja checks the checksum of the template source before using a cached
+    bytecode, so changed templates are compiled again.
+    """
+
+    def __init__(self):
+        """Initialize a MemoryBytecodeCache instance."""
+        self._cache: Dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the bytecode of a template, if cached."""
+        code = self._cache.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Cache the bytecode of a template."""
+        self._cache[bucket.key] = bucket.bytecode_to_string()
+
+
+@dataclasses.dataclass
+class WarmState:
+    """Define the state kept in memory between builds."""
+
+    plan: Optional[Any] = None
+    """The plan of the API pages (`ApiPlan`)."""
+    plan_key: Optional[str] = None
+    """The plugin options and theme the plan was made with."""
+    nav: Optional[Any] = None
+    """The resolved navigation."""
+    nav_key: Optional[Tuple[int, str]] = None
+    """The plan and unresolved navigation the navigation was resolved from."""
+    bytecode_cache: BytecodeCache = dataclasses.field(
+        default_factory=MemoryBytecodeCache
+    )
+    """The cache of compiled templates."""
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+    """Guards the state against concurrent invalidation."""
+
+    def invalidate(self, nav_only: bool = False) -> None:
+        """Forget the plan (unless `nav_only`) and the navigation."""
+        with self.lock:
+            if not nav_only:
+                self.plan = self.plan_key = None
+            self.nav = self.nav_key = None
+
+
+def _make_event_handler(
+    state: WarmState,
+    config_file: str,
+    ignored: List[str],
+    sources: Iterable[str] = (),
+    on_config_change: Optional[Callable[[], None]] = None,
+) -> Any:
+    """Create a `watchdog` event handler invalidating the warm state.
+
+    Args:
+        state:
+            The state to invalidate.
+        config_file:
+            The absolute path of the MkDocs configuration file.
+        ignored:
+            Absolute paths of directories whose events are ignored (e.g., the
+            directory of local copies of generated files).
+        sources:
+            Absolute paths of directories in which modifying a file also
+            invalidates the plan (the AutoAPI directories, when the plan
+            depends on the size of the source files).
+        on_config_change:
+            Called (from the observer's thread) when the configuration file
+            changes.
+    """
+    from watchdog.events import FileSystemEventHandler
+
+    prefixes = tuple(os.path.join(path, "") for path in ignored)
+    source_prefixes = tuple(os.path.join(path, "") for path in sources)
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Newer versions also report files being opened and closed.
+            if event.event_type not in _CHANGE_EVENTS:
+                return
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            paths = [os.fsdecode(path) for path in paths if path]
+            if config_file in paths:
+                logger.debug(msg="Configuration changed; invalidating plan.")
+                state.invalidate()
+                if on_config_change is not None:
+                    on_config_change()
+                return
+            # The ignored directories themselves are ignored too (e.g., when
+            # the first build creates `site_dir`).
+            if all(
+                os.path.join(path, "").startswith(prefixes) for path in paths
+            ):
+                return
+            if event.event_type != "modified":
+                logger.debug(msg=f"{event.src_path} {event.event_type}.")
+                state.invalidate()
+            elif not event.is_directory:
+                if os.path.basename(paths[0]) == NAV_FILE_NAME:
+                    state.invalidate(nav_only=True)
+                elif source_prefixes and paths[0].startswith(source_prefixes):
+                    logger.debug(msg=f"{event.src_path} modified.")
+                    state.invalidate()
+
+    return Handler()
+
+
+class BuildDaemon:
+    """Build a MkDocs site on request, keeping the AutoAPI state warm."""
+
+    def __init__(self, config_file: str, site_dir: Optional[str] = None):
+        """Initialize a BuildDaemon instance.
+
+        Args:
+            config_file:
+                The MkDocs configuration file.
+            site_dir:
+                The directory to build the site in. Defaults to the
+                configuration's `site_dir`.
+        """
+        self.config_file = os.path.abspath(config_file)
+        self.site_dir = site_dir and os.path.abspath(site_dir)
+        self.state = WarmState()
+        self.builds = 0
+        self._plugins: Any = None
+        self._observer: Any = None
+        self._watching: Optional[bool] = None
+        self._config_changed = threading.Event()
+        self._outputs: Dict[str, Tuple[int, int, str]] = {}
+
+    def _load_config(self) -> Any:
+        """Load the MkDocs configuration and attach the warm state."""
+        from mkdocs.config import load_config
+
+        config = load_config(
+            config_file=self.config_file, site_dir=self.site_dir
+        )
+        if self._plugins is None:
+            config.plugins.on_startup(command="build", dirty=False)
+        self._plugins = config.plugins
+        plugin = config.plugins.get(PLUGIN_NAME)
+        if plugin is None:
+            raise ValueError(
+                f"{PLUGIN_NAME} is not enabled in {self.config_file}."
+            )
+        plugin.warm_state = self.state
+        return config
+
+    def _watch(self, config: Any) -> None:
+        """Start watching the files the warm state depends on."""
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.warning(
+                "watchdog is not installed; the plan is computed for every "
+                "build."
+            )
+            self._watching = False
+            return
+
+        from mkdocs_autoapi.autoapi import (
+            get_autoapi_roots,
+            get_keep_files_dir,
+            plan_depends_on_sizes,
+        )
+
+        # The plugin options are only merged into the configuration by
+        # `on_files`.
+        config = {**config, **config.plugins[PLUGIN_NAME].config}
+        sources = [
+            os.path.abspath(root.path)
+            for root in get_autoapi_roots(config=config)
+        ]
+        handler = _make_event_handler(
+            state=self.state,
+            config_file=self.config_file,
+            ignored=[
+                os.path.abspath(get_keep_files_dir(config=config)),
+                os.path.abspath(config["site_dir"]),
+            ],
+            sources=sources if plan_depends_on_sizes(config=config) else (),
+            on_config_change=self._config_changed.set,
+        )
+        observer = Observer()
+        watched = {os.path.abspath(config["docs_dir"]), *sources}
+        for path in sorted(watched):
+            if os.path.isdir(path):
+                observer.schedule(handler, path, recursive=True)
+        observer.schedule(
+            handler, os.path.dirname(self.config_file), recursive=False
+        )
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        self._watching = True
+
+    def _unwatch(self) -> None:
+        """Stop watching files."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        self._watching = None
+
+    def _diff_output(self, site_dir: str) -> Tuple[List[str], List[str]]:
+        """Find the output files changed and removed since the last build.
+
+        Files whose size and modification time did not change since the last
+        build are not read again; the others are hashed and compared.
+        """
+        outputs = {}
+        changed = []
+        for directory, _, names in os.walk(site_dir):
+            for name in names:
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, site_dir).replace(os.sep, "/")
+                stat = os.stat(path)
+                previous = self._outputs.get(relative)
+                if previous is not None and previous[:2] == (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ):
+                    outputs[relative] = previous
+                    continue
+                with open(path, "rb") as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+                outputs[relative] = (stat.st_size, stat.st_mtime_ns, digest)
+                if previous is None or previous[2] != digest:
+                    changed.append(relative)
+        removed = sorted(set(self._outputs) - set(outputs))
+        self._outputs = outputs
+        return sorted(changed), removed
+
+    def build(self) -> Dict[str, Any]:
+        """Build the site.
+
+        Steps:
+            1.  Load the configuration, attaching the warm state to the
+                plugin.
+            2.  Start watching the source files (on the first build, or
+                again after the configuration file changed). If they cannot
+                be watched, forget the plan.
+            3.  Build the site.
+            4.  Compare the output to the previous build's.
+
+        Returns:
+            The response to a build request.
+        """
+        from mkdocs.commands.build import build
+
+        # Step 1
+        start = time.perf_counter()
+        config = self._load_config()
+
+        # Step 2
+        if self._config_changed.is_set():
+            self._config_changed.clear()
+            self._unwatch()
+        if self._watching is None:
+            self._watch(config)
+        if not self._watching:
+            self.state.invalidate()
+        warm = self.state.plan is not None
+
+        # Step 3
+        build(config)
+        self.builds += 1
+
+        # Step 4
+        changed, removed = self._diff_output(config.site_dir)
+        seconds = time.perf_counter() - start
+        logger.info(
+            f"Built the site in {seconds:.2f} seconds ({len(changed)} "
+            f"changed, {len(removed)} removed)."
+        )
+        return {
+            "ok": True,
+            "seconds": round(seconds, 3),
+            "warm": warm,
+            "site_dir": config.site_dir,
+            "changed": changed,
+            "removed": removed,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Get the response to a status request."""
+        return {
+            "ok": True,
+            "builds": self.builds,
+            "warm": self.state.plan is not None,
+        }
+
+    def close(self) -> None:
+        """Stop watching files and shut the plugins down."""
+        self._unwatch()
+        if self._plugins is not None:
+            self._plugins.on_shutdown()
+            self._plugins = None
+
+
+def _handle(daemon: BuildDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle a request."""
+    command = request.get("command")
+    if command == "build":
+        return daemon.build()
+    if command == "status":
+        return daemon.status()
+    if command == "shutdown":
+        return {"ok": True}
+    return {"ok": False, "error": f"Unknown command: {command!r}"}
+
+
+def serve(daemon: BuildDaemon, socket_path: str) -> None:
+    """Serve build requests until a shutdown request is received.
+
+    Requests are handled one at a time, so builds never overlap.
+
+    Args:
+        daemon:
+            The daemon to build with.
+        socket_path:
+            The path of the Unix socket to listen on. A stale socket file is
+            replaced.
+
+    Raises:
+        OSError: If Unix sockets are not supported or another daemon is
+            listening on `socket_path`.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("The build daemon requires Unix domain sockets.")
+    if os.path.exists(socket_path):
+        try:
+            request(socket_path, "status", timeout=1)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise OSError(f"A daemon is already listening on {socket_path}.")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                message = json.loads(self.rfile.readline())
+                response = _handle(daemon, message)
+            except Exception as e:
+                logger.error(f"Request failed: {e}")
+                message, response = {}, {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            if message.get("command") == "shutdown":
+                threading.Thread(target=self.server.shutdown).start()
+
+    server = socketserver.UnixStreamServer(socket_path, Handler)
+    logger.info(f"Listening on {socket_path}.")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        daemon.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def request(
+    socket_path: str,
+    command: str,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Send a request to a daemon and wait for its response.
+
+    Args:
+        socket_path:
+            The path of the daemon's Unix socket.
+        command:
+            The command (`build`, `status` or `shutdown`).
+        timeout:
+            The maximum time to wait, in seconds. Defaults to no limit.
+
+    Returns:
+        The response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps({"command": command}).encode("utf-8") + b"\n")
+        with client.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise OSError(f"The daemon on {socket_path} closed the connection.")
+    return json.loads(line)
@@ -0,0 +1,225 @@
+"""File discovery for AutoAPI directories.
+
+Files are listed with `os.scandir` and matched against glob patterns as
+relative POSIX path strings. Pattern semantics follow `pathlib.Path.glob`:
+`**` matches zero or more directories, every other component is matched with
+`fnmatch`, and symbolic links to directories are not followed.
+"""
+
+# built-in imports
+import fnmatch
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, Tuple
+
+_CASE_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+"""Regex flags used to match path components (case-insensitive on Windows)."""
+
+_RECURSIVE = None
+"""Marker for a `**` component in a compiled pattern."""
+
+
+class GlobPattern:
+    """A glob pattern matched against relative POSIX paths of files."""
+
+    def __init__(self, pattern: str):
+        """Initialize a GlobPattern object.
+
+        Args:
+            pattern:
+                The glob pattern, relative to the directory being searched.
+        """
+        self.pattern = pattern
+        components: List[Optional[Callable[[str], object]]] = []
+        for part in pattern.replace("\\", "/").split("/"):
+            if not part or part == ".":
+                continue
+            if part == "**":
+                if components and components[-1] is _RECURSIVE:
+                    continue
+                components.append(_RECURSIVE)
+            else:
+                regex = re.compile(fnmatch.translate(part), _CASE_FLAGS)
+                components.append(regex.match)
+        self._components = tuple(components)
+
+        # A leading `**` followed by plain components (e.g., `**/*.py`) only
+        # constrains the last parts of a path, which can be matched directly.
+        tail = self._components[1:]
+        self._tail: Optional[Tuple[Callable[[str], object], ...]] = None
+        if self._components[:1] == (_RECURSIVE,) and tail:
+            if _RECURSIVE not in tail:
+                self._tail = tail  # type: ignore[assignment]
+
+    def __repr__(self):
+        """Create a string representation of a GlobPattern instance."""
+        return f"{type(self).__name__}({self.pattern!r})"
+
+    def match(self, parts: Sequence[str]) -> bool:
+        """Check whether a file matches the pattern.
+
+        Args:
+            parts:
+                The components of the file's path relative to the directory
+                being searched.
+
+        Returns:
+            True if the file matches the pattern, False otherwise.
+        """
+        tail = self._tail
+        if tail is not None:
+            if len(parts) < len(tail):
+                return False
+            offset = len(parts) - len(tail)
+            return all(
+                component(parts[offset + i]) for i, component in enumerate(tail)
+            )
+        return self._match(0, parts, 0)
+
+    def _match(self, i: int, parts: Sequence[str], j: int) -> bool:
+        components = self._components
+        while i < len(components):
+            component = components[i]
+            if component is _RECURSIVE:
+                # `**` only matches directories, so it can never be last.
+                if i == len(components) - 1:
+                    return False
+                return any(
+                    self._match(i + 1, parts, k) for k in range(j, len(parts))
+                )
+            if j >= len(parts) or not component(parts[j]):
+                return False
+            i += 1
+            j += 1
+        return j == len(parts)
+
+
+def _scan_directory(
+    root: str, relative_dir: str
+) -> Tuple[List[str], List[str]]:
+    """List the files and subdirectories of a single directory.
+
+    Args:
+        root:
+            The directory being searched.
+        relative_dir:
+            The directory to list, relative to `root` ("" for `root` itself).
+
+    Returns:
+        The relative paths of the files and of the subdirectories to descend
+        into. Unreadable directories are treated as empty.
+    """
+    files = []
+    subdirs = []
+    prefix = f"{relative_dir}/" if relative_dir else ""
+    try:
+        with os.scandir(os.path.join(root, relative_dir)) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(prefix + entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(prefix + entry.name)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def walk_files(root: str, max_workers: int = 1) -> List[str]:
+    """List all files below a directory.
+
+    With `max_workers` greater than 1, directories are listed concurrently in
+    a bounded thread pool. This pays off on file systems where listing is
+    latency-bound (e.g., network storage). The result does not depend on the
+    number of workers.
+
+    Args:
+        root:
+            The directory to search.
+        max_workers:
+            The maximum number of directories listed at the same time.
+
+    Returns:
+        The sorted relative POSIX paths of all files below `root`, skipping
+        symbolic links to directories.
+    """
+    files: List[str] = []
+
+    if max_workers <= 1:
+        pending = [""]
+        while pending:
+            found_files, subdirs = _scan_directory(root, pending.pop())
+            files.extend(found_files)
+            pending.extend(subdirs)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_scan_directory, root, "")}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    found_files, subdirs = future.result()
+                    files.extend(found_files)
+                    futures.update(
+                        executor.submit(_scan_directory, root, subdir)
+                        for subdir in subdirs
+                    )
+
+    files.sort()
+    return files
+
+
+def strip_suffix(relative_path: str) -> str:
+    """Remove the suffix of a relative POSIX path, like `with_suffix("")`."""
+    slash = relative_path.rfind("/")
+    dot = relative_path.rfind(".")
+    if slash + 1 < dot < len(relative_path) - 1:
+        return relative_path[:dot]
+    return relative_path
+
+
+def filter_files(
+    relative_paths: Sequence[str],
+    file_patterns: Sequence[str],
+    ignore: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """Select the files to document among a list of files.
+
+    A file is selected if its name matches at least one of `file_patterns`
+    (at any depth) and its path does not match any of `ignore`. If files only
+    differ by suffix (e.g., `module.py` and `module.pyi`), the one matching
+    the earliest of `file_patterns` is selected, with ties going to the first
+    path in sorted order.
+
+    Args:
+        relative_paths:
+            The relative POSIX paths of the candidate files.
+        file_patterns:
+            The patterns to search for.
+        ignore:
+            The patterns to ignore.
+
+    Returns:
+        The sorted relative POSIX paths of the selected files.
+    """
+    split_paths = [(path, path.split("/")) for path in sorted(relative_paths)]
+    split_paths.reverse()
+
+    selected = {}
+    for pattern in reversed(file_patterns):
+        glob_pattern = GlobPattern(f"**/{pattern}")
+        for path, parts in split_paths:
+            if glob_pattern.match(parts):
+                selected[strip_suffix(path)] = path
+
+    ignore_patterns = [GlobPattern(pattern) for pattern in ignore or ()]
+    result = []
+    for path in selected.values():
+        parts = path.split("/")
+        if not any(p.match(parts) for p in ignore_patterns):
+            result.append(path)
+    result.sort()
+    return result
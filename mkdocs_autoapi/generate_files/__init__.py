@@ -3,9 +3,16 @@
 As I work through the build, I'll update the documentation for this module.
 """
 
-from .editor import FilesEditor
 from .nav import Nav as Nav
 
 
 def __getattr__(name: str):
+    # The editor pulls in MkDocs' file structures, so it is only imported once
+    # it is actually needed.
+    from .editor import FilesEditor
+
+    if name == "FilesEditor":
+        return FilesEditor
+    if name in globals():  # e.g., the `editor` submodule, now imported
+        return globals()[name]
     return getattr(FilesEditor.current(), name)
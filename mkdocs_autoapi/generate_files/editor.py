@@ -2,17 +2,27 @@
 
 # built-in imports
 import collections
+import contextvars
 import os
 import os.path
 import pathlib
 import shutil
-from typing import IO, MutableMapping, Optional, Union
+import threading
+from typing import IO, List, MutableMapping, Optional, Set, Union
 
 # third-party imports
 from mkdocs.config import load_config
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.structure.files import File, Files
 
+_current_editor: "contextvars.ContextVar[Optional[FilesEditor]]" = (
+    contextvars.ContextVar("mkdocs_autoapi_files_editor", default=None)
+)
+"""The editor of the build running in the current context."""
+
+_default_lock = threading.Lock()
+"""Guards the creation of the default editor."""
+
 
 def file_sort_key(f: File):
     """Sort key for file."""
@@ -59,14 +69,14 @@ class FilesEditor:
         normname = pathlib.PurePath(name).as_posix()
 
         if new or normname not in self._files:
-            os.makedirs(os.path.dirname(new_f.abs_src_path), exist_ok=True)
+            self._makedirs(os.path.dirname(new_f.abs_src_path))
             self._files[normname] = new_f
             self.edit_paths.setdefault(normname, None)
             return new_f.abs_src_path
 
         f = self._files[normname]
         if f.abs_src_path != new_f.abs_src_path:
-            os.makedirs(os.path.dirname(new_f.abs_src_path), exist_ok=True)
+            self._makedirs(os.path.dirname(new_f.abs_src_path))
             self._files[normname] = new_f
             self.edit_paths.setdefault(normname, None)
             shutil.copyfile(f.abs_src_path, new_f.abs_src_path)
@@ -74,6 +84,12 @@ class FilesEditor:
 
         return f.abs_src_path
 
+    def _makedirs(self, directory: str) -> None:
+        """Create a directory, unless this editor already created it."""
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+
     def set_edit_path(self, name: str, edit_name: Union[str, None]) -> None:
         """Choose a file path to use for the edit URI of this file."""
         self.edit_paths[pathlib.PurePath(name).as_posix()] = edit_name and str(
@@ -95,8 +111,9 @@ class FilesEditor:
             directory = config.docs_dir
         self.directory = directory
         self.edit_paths = {}
+        self._created_dirs: Set[str] = set()
+        self._tokens: List[contextvars.Token] = []
 
-    _current = None
     _default = None
 
     @classmethod
@@ -110,25 +127,30 @@ class FilesEditor:
         `docs_dir`, and then actually performs any file writes that happen via
         `.open()`.
 
-        Warning:
-            This is global (not thread-safe).
+        The current instance is tracked with a context variable, so builds
+        running concurrently in different threads or asyncio tasks each see
+        their own editor. Threads started during a build do not inherit it
+        unless they run in a copy of the build's context (e.g., with
+        `contextvars.copy_context().run`).
         """
-        if cls._current:
-            return cls._current
-        if not cls._default:
-            config = load_config("mkdocs.yml")
-            config.plugins.run_event("config", config)
-            cls._default = FilesEditor(Files([]), config)
+        current = _current_editor.get()
+        if current is not None:
+            return current
+        with _default_lock:
+            if not cls._default:
+                config = load_config("mkdocs.yml")
+                config.plugins.run_event("config", config)
+                cls._default = FilesEditor(Files([]), config)
         return cls._default
 
     def __enter__(self):
         """Set current instance to this one."""
-        type(self)._current = self
+        self._tokens.append(_current_editor.set(self))
         return self
 
     def __exit__(self, *exc):
-        """Clear current instance."""
-        type(self)._current = None
+        """Restore the instance that was current before this one."""
+        _current_editor.reset(self._tokens.pop())
 
     @property
     def files(self) -> Files:
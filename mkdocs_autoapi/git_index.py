@@ -0,0 +1,221 @@
+"""Listing of tracked files from a local git index.
+
+The index (`.git/index`) lists every file tracked in a repository. Reading it
+costs the same whatever the size of the untracked and ignored content of the
+working tree (e.g., build outputs or virtual environments), which a file
+system walk has to list before it can skip it.
+
+The index is parsed directly (formats 2 to 4), without running git. Indexes
+that cannot be read this way (e.g., split indexes) are reported as
+unavailable, so callers can fall back to walking the file system.
+"""
+
+# built-in imports
+import os
+import struct
+from typing import List, Optional, Tuple
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+_SIGNATURE = b"DIRC"
+"""The signature of an index file."""
+
+_STAT_SIZE = 40
+"""The size of the stat data (ctime to file size) of an index entry."""
+
+_EXTENDED_FLAG = 0x4000
+"""The flag of an entry followed by extended flags (format 3 and later)."""
+
+_SKIP_WORKTREE_FLAG = 0x4000
+"""The extended flag of an entry not checked out (sparse checkout)."""
+
+_FILE_TYPE_MASK = 0o170000
+"""The mask of the file type bits of an entry's mode."""
+
+_TRACKED_FILE_TYPES = (0o100000, 0o120000)
+"""The file types of regular files and symbolic links."""
+
+
+class GitIndexError(Exception):
+    """Raised when an index cannot be read."""
+
+
+def find_repository(path: str) -> Optional[Tuple[str, str]]:
+    """Find the git repository containing a directory.
+
+    Args:
+        path:
+            The directory.
+
+    Returns:
+        The working tree and git directory of the repository, or None if
+        `path` is not inside a repository.
+    """
+    current = os.path.realpath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return current, dot_git
+        if os.path.isfile(dot_git):
+            # Linked worktrees and submodules point to their git directory.
+            try:
+                with open(dot_git, encoding="utf-8") as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = os.path.join(current, content[len("gitdir:") :].strip())
+            return current, os.path.normpath(git_dir)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _hash_size(git_dir: str) -> int:
+    """Get the size of object names in a repository (SHA-1 or SHA-256)."""
+    common_dir = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+            common_dir = os.path.join(git_dir, f.read().strip())
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(common_dir, "config"), encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip().lower() == "objectformat":
+                    return 32 if value.strip().lower() == "sha256" else 20
+    except OSError:
+        pass
+    return 20
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read an offset-encoded integer (format 4 path prefixes)."""
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def read_index(git_dir: str) -> List[str]:
+    """Read the paths of the files checked out from a repository's index.
+
+    Args:
+        git_dir:
+            The git directory of the repository.
+
+    Returns:
+        The POSIX paths, relative to the working tree, of the regular files
+        and symbolic links in the index, skipping submodules and files not
+        checked out by a sparse checkout.
+
+    Raises:
+        GitIndexError: If the index is missing or cannot be parsed.
+    """
+    path = os.path.join(git_dir, "index")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise GitIndexError(f"Cannot read {path}: {e}") from e
+
+    if len(data) < 12 or data[:4] != _SIGNATURE:
+        raise GitIndexError(f"{path} is not a git index.")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"{path} has unsupported version {version}.")
+    hash_size = _hash_size(git_dir)
+
+    paths = []
+    previous = b""
+    offset = 12
+    try:
+        for _ in range(count):
+            start = offset
+            (mode,) = struct.unpack_from(">I", data, start + 24)
+            offset = start + _STAT_SIZE + hash_size
+            (flags,) = struct.unpack_from(">H", data, offset)
+            offset += 2
+            extended_flags = 0
+            if flags & _EXTENDED_FLAG:
+                (extended_flags,) = struct.unpack_from(">H", data, offset)
+                offset += 2
+            if version == 4:
+                strip, offset = _read_varint(data, offset)
+                end = data.index(b"\0", offset)
+                name = previous[: len(previous) - strip] + data[offset:end]
+                offset = end + 1
+            else:
+                end = data.index(b"\0", offset)
+                name = data[offset:end]
+                # Entries are padded with 1 to 8 NULs to a multiple of 8.
+                offset = start + ((end - start) // 8 + 1) * 8
+            previous = name
+            if extended_flags & _SKIP_WORKTREE_FLAG:
+                continue
+            if mode & _FILE_TYPE_MASK not in _TRACKED_FILE_TYPES:
+                continue
+            paths.append(name.decode("utf-8", errors="surrogateescape"))
+    except (struct.error, ValueError, IndexError) as e:
+        raise GitIndexError(f"{path} is truncated or corrupt.") from e
+
+    # A split index only holds the changes to a shared index.
+    if data.find(b"link", offset, offset + 4) == offset:
+        raise GitIndexError(f"{path} is a split index.")
+
+    # Unmerged paths have an entry per conflict stage.
+    return sorted(set(paths))
+
+
+def list_tracked_files(root: str) -> Optional[List[str]]:
+    """List the tracked files below a directory.
+
+    Args:
+        root:
+            The directory to search.
+
+    Returns:
+        The sorted relative POSIX paths of the tracked files below `root`
+        that exist in the working tree, or None if `root` is not inside a
+        repository, the index cannot be read, or no file below `root` is
+        tracked.
+    """
+    repository = find_repository(root)
+    if repository is None:
+        logger.debug(msg=f"{root} is not inside a git repository.")
+        return None
+    worktree, git_dir = repository
+
+    try:
+        tracked = read_index(git_dir)
+    except GitIndexError as e:
+        logger.debug(msg=f"Cannot use the git index: {e}")
+        return None
+
+    relative_root = os.path.relpath(os.path.realpath(root), worktree)
+    prefix = ""
+    if relative_root != os.curdir:
+        prefix = relative_root.replace(os.sep, "/") + "/"
+
+    # Files deleted from the working tree stay in the index until the
+    # deletion is staged.
+    files = [
+        path[len(prefix) :]
+        for path in tracked
+        if path.startswith(prefix)
+        and os.path.lexists(os.path.join(worktree, path))
+    ]
+    if not files:
+        logger.debug(msg=f"No file below {root} is tracked in {git_dir}.")
+        return None
+    return files
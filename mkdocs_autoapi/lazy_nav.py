@@ -0,0 +1,287 @@
+"""Client-side loading of the API navigation.
+
+With `autoapi_lazy_nav` enabled, the sections of the navigation holding the
+API pages are written once to a JSON file. Themes render a placeholder for
+these sections instead of their full subtree, and a small script fetches the
+JSON file (cached by the browser) and expands the placeholder when the section
+is opened or when the current page is one of its pages.
+"""
+
+# built-in imports
+import json
+import os
+import posixpath
+from typing import Any, Dict, List, Optional
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+NAV_DATA_NAME = "nav.json"
+"""The name of the navigation data file, relative to `autoapi_root`."""
+
+SCRIPT_NAME = "nav.js"
+"""The name of the script expanding the placeholders, relative to
+`autoapi_root`."""
+
+LAZY_NAV_ATTRIBUTE = "autoapi_lazy_nav"
+"""The attribute marking a navigation item rendered as a placeholder.
+
+Its value is a tuple of the navigation data path (relative to the site root)
+and the index of the item in the navigation data.
+"""
+
+SCRIPT = """\
+(function () {
+  "use strict";
+
+  var requests = {};
+
+  function load(url) {
+    if (!requests[url]) {
+      requests[url] = fetch(url).then(function (response) {
+        if (!response.ok) {
+          throw new Error(url + ": " + response.status);
+        }
+        return response.json();
+      });
+    }
+    return requests[url];
+  }
+
+  function normalize(url) {
+    return url.split("#")[0].split("?")[0].replace(/index\\.html$/, "");
+  }
+
+  function element(tag, attributes, children) {
+    var node = document.createElement(tag);
+    Object.keys(attributes || {}).forEach(function (name) {
+      node.setAttribute(name, attributes[name]);
+    });
+    (children || []).forEach(function (child) {
+      node.append(child);
+    });
+    return node;
+  }
+
+  function title(text) {
+    return element("span", { class: "md-ellipsis" }, [text]);
+  }
+
+  function icon() {
+    return element("span", { class: "md-nav__icon md-icon" });
+  }
+
+  function render(item, base, path, level, current) {
+    var url = item[1] === null ? null : new URL(item[1], base).href;
+    var children = item[2] || [];
+    var active = url !== null && normalize(url) === current;
+
+    if (!children.length) {
+      return {
+        active: active,
+        node: element("li", { class: "md-nav__item" }, [
+          element(
+            "a",
+            {
+              href: url,
+              class: "md-nav__link" + (active ? " md-nav__link--active" : ""),
+            },
+            [title(item[0])],
+          ),
+        ]),
+      };
+    }
+
+    var list = element("ul", { class: "md-nav__list" });
+    children.forEach(function (child, i) {
+      var rendered = render(child, base, path + "_" + (i + 1), level + 1, current);
+      active = active || rendered.active;
+      list.append(rendered.node);
+    });
+
+    var toggle = element("input", {
+      class: "md-nav__toggle md-toggle",
+      type: "checkbox",
+      id: path,
+    });
+    toggle.checked = active;
+
+    var link;
+    if (url === null) {
+      link = element(
+        "label",
+        { class: "md-nav__link", for: path, id: path + "_label", tabindex: "0" },
+        [title(item[0]), icon()],
+      );
+    } else {
+      link = element("div", { class: "md-nav__link md-nav__container" }, [
+        element("a", { href: url, class: "md-nav__link" }, [title(item[0])]),
+        element(
+          "label",
+          { class: "md-nav__link", for: path, id: path + "_label", tabindex: "0" },
+          [icon()],
+        ),
+      ]);
+    }
+
+    var nav = element(
+      "nav",
+      { class: "md-nav", "data-md-level": level, "aria-labelledby": path + "_label" },
+      [element("label", { class: "md-nav__title", for: path }, [icon(), item[0]]), list],
+    );
+
+    var classes = "md-nav__item md-nav__item--nested";
+    return {
+      active: active,
+      node: element(
+        "li",
+        { class: classes + (active ? " md-nav__item--active" : "") },
+        [toggle, link, nav],
+      ),
+    };
+  }
+
+  function expand(placeholder, open) {
+    if (placeholder.hasAttribute("data-autoapi-loading")) {
+      return;
+    }
+    placeholder.setAttribute("data-autoapi-loading", "");
+    var url = new URL(placeholder.getAttribute("data-autoapi-nav"), location.href).href;
+    load(url).then(function (data) {
+      var base = new URL(data.root, url).href;
+      var rendered = render(
+        data.sections[+placeholder.getAttribute("data-autoapi-section")],
+        base,
+        placeholder.getAttribute("data-autoapi-path"),
+        +placeholder.getAttribute("data-autoapi-level"),
+        normalize(location.href),
+      );
+      if (open) {
+        rendered.node.querySelector("input").checked = true;
+      }
+      placeholder.replaceWith(rendered.node);
+    }).catch(function (error) {
+      placeholder.removeAttribute("data-autoapi-loading");
+      console.error("mkdocs-autoapi: could not load navigation", error);
+    });
+  }
+
+  function setup() {
+    document.querySelectorAll("[data-autoapi-nav]").forEach(function (placeholder) {
+      if (placeholder.hasAttribute("data-autoapi-active")) {
+        expand(placeholder, false);
+        return;
+      }
+      var toggle = placeholder.querySelector("input");
+      if (toggle) {
+        toggle.addEventListener("change", function () {
+          expand(placeholder, true);
+        });
+      }
+    });
+  }
+
+  if (window.document$) {
+    window.document$.subscribe(setup);
+  } else {
+    setup();
+  }
+})();
+"""
+"""The script expanding the placeholders (written for Material for MkDocs)."""
+
+
+def is_api_item(item: Any, prefix: str) -> bool:
+    """Check whether all pages below a navigation item are API pages."""
+    if item.is_link:
+        return False
+    file = getattr(item, "file", None)
+    if file is not None and not file.src_uri.startswith(prefix):
+        return False
+    return all(is_api_item(child, prefix) for child in item.children or ())
+
+
+def mark_api_sections(items: List[Any], autoapi_root: str) -> List[Any]:
+    """Mark the topmost navigation sections holding only API pages.
+
+    Args:
+        items:
+            The top-level navigation items.
+        autoapi_root:
+            The directory the API pages are generated in.
+
+    Returns:
+        The marked sections, in navigation order.
+    """
+    prefix = posixpath.normpath(autoapi_root) + "/"
+    data_path = posixpath.join(posixpath.normpath(autoapi_root), NAV_DATA_NAME)
+    sections = []
+    todo = list(items)
+    while todo:
+        item = todo.pop(0)
+        if not item.children:
+            continue
+        if is_api_item(item, prefix):
+            setattr(item, LAZY_NAV_ATTRIBUTE, (data_path, len(sections)))
+            sections.append(item)
+        else:
+            todo[:0] = item.children
+    return sections
+
+
+def _serialize(item: Any) -> List[Any]:
+    """Serialize a navigation item as `[title, url, children]`."""
+    url: Optional[str] = getattr(item, "url", None)
+    children = [_serialize(child) for child in item.children or ()]
+    if children:
+        return [item.title, url, children]
+    return [item.title, url]
+
+
+def build_nav_data(sections: List[Any], autoapi_root: str) -> Dict[str, Any]:
+    """Build the navigation data for the marked sections.
+
+    Args:
+        sections:
+            The sections marked by `mark_api_sections`.
+        autoapi_root:
+            The directory the API pages are generated in.
+
+    Returns:
+        The navigation data, with page URLs relative to the site root and the
+        path from the data file to the site root.
+    """
+    root = posixpath.relpath(".", posixpath.normpath(autoapi_root))
+    return {
+        "root": f"{root}/",
+        "sections": [_serialize(section) for section in sections],
+    }
+
+
+def write_nav_data(
+    sections: List[Any],
+    autoapi_root: str,
+    site_dir: str,
+) -> None:
+    """Write the navigation data file to the site directory.
+
+    Args:
+        sections:
+            The sections marked by `mark_api_sections`.
+        autoapi_root:
+            The directory the API pages are generated in.
+        site_dir:
+            The site directory.
+    """
+    path = os.path.join(site_dir, autoapi_root, NAV_DATA_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            build_nav_data(sections=sections, autoapi_root=autoapi_root),
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    logger.debug(msg=f"Wrote lazily loaded API navigation to {path}.")
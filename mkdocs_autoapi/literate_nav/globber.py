@@ -9,6 +9,8 @@ from typing import Iterator, Union
 # local imports
 from mkdocs.structure.files import Files
 
+from mkdocs_autoapi.literate_nav.paths import DIR, FILE, PathTable
+
 
 class MkDocsGlobber:
     """Globber for MkDocs files."""
@@ -20,51 +22,39 @@ class MkDocsGlobber:
             files:
                 The MkDocs files object.
         """
-        self.files = {}
-        self.dirs = {}
-        self.index_dirs = {}
+        self.paths = PathTable()
+        """The documentation files and their directories."""
 
         for f in files:
             if not f.is_documentation_page():
                 continue
-
-            path = PurePosixPath("/", f.src_uri)
-            self.files[path] = True
-            tail, head = path.parent, path.name
-
-            if f.name == "index":
-                self.index_dirs[tail] = path
-
-            while True:
-                self.dirs[tail] = True
-
-                if not head:
-                    break
-
-                tail, head = tail.parent, tail.name
+            self.paths.add_file(f.src_uri, is_index=f.name == "index")
 
     def isdir(self, path: str) -> bool:
         """Check if `path` is a directory."""
-        return PurePosixPath("/", path) in self.dirs
+        path_id = self.paths.get_id(path)
+        return path_id is not None and bool(self.paths.flags[path_id] & DIR)
 
     def glob(self, pattern: str) -> Iterator[str]:
         """Glob `pattern`."""
-        pat_parts = PurePosixPath("/" + pattern).parts
+        # Both path and pattern have a slash as their first part.
+        pat_parts = PurePosixPath("/" + pattern).parts[1:]
         re_parts = [re.compile(fnmatch.translate(part)) for part in pat_parts]
 
-        for collection in self.files, self.dirs:
-            for path in collection:
-                if len(path.parts) == len(re_parts):
-                    zipped = zip(path.parts, re_parts)
-                    next(
-                        zipped
-                    )  # Both path and pattern have a slash as their first part.
-                    if all(re_part.match(part) for part, re_part in zipped):
-                        yield str(path)[1:]
+        paths = self.paths.paths
+        for flag in FILE, DIR:
+            for path_id in self.paths.iter_ids(flag, depth=len(re_parts)):
+                path = paths[path_id]
+                parts = path.split("/") if path else []
+                if all(
+                    re_part.match(part)
+                    for part, re_part in zip(parts, re_parts)
+                ):
+                    yield path
 
     def find_index(self, root: str) -> Union[str, None]:
         """Find the index file for `root`."""
-        root_path = PurePosixPath("/", root)
-        if root_path in self.index_dirs:
-            return str(self.index_dirs[root_path])[1:]
-        return None
+        root_id = self.paths.get_id(root)
+        if root_id is None or self.paths.indexes[root_id] < 0:
+            return None
+        return self.paths.paths[self.paths.indexes[root_id]]
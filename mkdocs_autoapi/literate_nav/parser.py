@@ -14,7 +14,6 @@ from typing import (
     Iterator,
     List,
     Optional,
-    Set,
     Tuple,
     Union,
     cast,
@@ -31,6 +30,7 @@ import mkdocs.utils
 # local imports
 from mkdocs_autoapi.literate_nav import exceptions
 from mkdocs_autoapi.literate_nav.globber import MkDocsGlobber
+from mkdocs_autoapi.literate_nav.paths import SeenPaths
 
 log = logging.getLogger(f"mkdocs.plugins.{__name__}")
 
@@ -94,7 +94,7 @@ class NavParser:
         self.globber = globber
         self.implicit_index = implicit_index
         self._markdown_config = markdown_config or {}
-        self.seen_items: Set[str] = set()
+        self.seen_items = SeenPaths(globber.paths)
         self._warn = functools.lru_cache()(log.warning)
 
     def markdown_to_nav(self, roots: Tuple[str, ...] = (".",)) -> Nav:
@@ -0,0 +1,147 @@
+"""Compact table of documentation paths.
+
+Sites with many pages have many more path strings than path objects would
+comfortably hold in memory, so the globber and the parser share one table in
+which every file and directory is a small integer ID. The path strings are
+stored once (file paths reuse the `src_uri` strings of MkDocs' `File`
+objects), and the parent, depth and kind of each path live in arrays.
+
+Paths are relative POSIX paths without leading slash; the root directory is
+the empty string.
+"""
+
+# built-in imports
+import posixpath
+from array import array
+from typing import Dict, Iterator, List, Optional, Set
+
+FILE = 1
+"""The flag of a path that is a documentation file."""
+
+DIR = 2
+"""The flag of a path that is a directory containing documentation files."""
+
+ROOT = 0
+"""The ID of the root directory."""
+
+
+def normalize(path: str) -> str:
+    """Normalize a path like `PurePosixPath("/", path)`, without the slash."""
+    return "/".join(part for part in path.split("/") if part and part != ".")
+
+
+class PathTable:
+    """Interned table of documentation files and their directories."""
+
+    def __init__(self):
+        """Initialize a PathTable instance."""
+        self._ids: Dict[str, int] = {"": ROOT}
+        self.paths: List[str] = [""]
+        """The path of each ID."""
+        self.parents = array("i", [-1])
+        """The ID of the parent directory of each ID (-1 for the root)."""
+        self.depths = array("H", [0])
+        """The number of components of each path."""
+        self.flags = bytearray([DIR])
+        """The `FILE` and `DIR` flags of each ID."""
+        self.indexes = array("i", [-1])
+        """The ID of the index file of each directory (-1 if none)."""
+
+    def __len__(self) -> int:
+        """Get the number of paths."""
+        return len(self.paths)
+
+    def _append(self, path: str, parent: int, flag: int) -> int:
+        """Add a path that is not in the table yet."""
+        path_id = len(self.paths)
+        self._ids[path] = path_id
+        self.paths.append(path)
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1)
+        self.flags.append(flag)
+        self.indexes.append(-1)
+        return path_id
+
+    def _add_dir(self, path: str) -> int:
+        """Add a directory and its ancestors, returning its ID."""
+        missing = []
+        path_id = self._ids.get(path)
+        while path_id is None:
+            missing.append(path)
+            path = posixpath.dirname(path)
+            path_id = self._ids.get(path)
+        self.flags[path_id] |= DIR
+        for path in reversed(missing):
+            path_id = self._append(path, path_id, DIR)
+        return path_id
+
+    def add_file(self, path: str, is_index: bool = False) -> int:
+        """Add a documentation file and its directories.
+
+        Args:
+            path:
+                The normalized path of the file (e.g., a `src_uri`).
+            is_index:
+                Whether the file is the index page of its directory.
+
+        Returns:
+            The ID of the file.
+        """
+        path_id = self._ids.get(path)
+        if path_id is None:
+            parent = self._add_dir(posixpath.dirname(path))
+            path_id = self._append(path, parent, FILE)
+        else:
+            parent = self.parents[path_id]
+            self.flags[path_id] |= FILE
+        if is_index:
+            self.indexes[parent] = path_id
+        return path_id
+
+    def get_id(self, path: str) -> Optional[int]:
+        """Get the ID of a path, or None if it is not in the table."""
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = self._ids.get(normalize(path))
+        return path_id
+
+    def iter_ids(self, flag: int, depth: int) -> Iterator[int]:
+        """Iterate over the IDs of the paths of a kind at a given depth."""
+        flags = self.flags
+        depths = self.depths
+        for path_id in range(len(self.paths)):
+            if flags[path_id] & flag and depths[path_id] == depth:
+                yield path_id
+
+
+class SeenPaths:
+    """A set of paths, stored as flags for the paths of a `PathTable`."""
+
+    def __init__(self, table: PathTable):
+        """Initialize a SeenPaths instance.
+
+        Args:
+            table:
+                The table of known paths. Paths added to it afterwards are
+                not supported.
+        """
+        self._table = table
+        self._seen = bytearray(len(table))
+        self._other: Set[str] = set()
+
+    def add(self, path: str) -> None:
+        """Add a path."""
+        path_id = self._table.get_id(path)
+        if path_id is None:
+            self._other.add(path)
+        else:
+            self._seen[path_id] = 1
+
+    def __contains__(self, path: object) -> bool:
+        """Check whether a path was added."""
+        if not isinstance(path, str):
+            return False
+        path_id = self._table.get_id(path)
+        if path_id is None:
+            return path in self._other
+        return bool(self._seen[path_id])
@@ -0,0 +1,157 @@
+"""Memoized rendering of the API navigation.
+
+Themes render the whole navigation for every page, although the subtrees of
+inactive sections only differ between pages by their relative links. With
+`autoapi_nav_cache` enabled, the rewritten navigation templates (see
+`mkdocs_autoapi.section_index.rewrite`) hand inactive API items to
+`NavRenderCache.render`, which renders each of them once and reuses the
+result for the following pages.
+
+While an item is rendered for the cache, the `url` filter emits markers
+holding the site-relative URL instead of the relative URL. When a cached
+fragment is used for a page, the markers are replaced by the URLs relative to
+that page, so the output is identical to rendering the item for the page.
+"""
+
+# built-in imports
+import functools
+import posixpath
+import re
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# third-party imports
+from markupsafe import Markup
+
+# local imports
+from mkdocs_autoapi.lazy_nav import is_api_item
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+NAV_CACHE_ATTRIBUTE = "autoapi_nav_cache"
+"""The attribute marking a navigation item whose rendering can be cached."""
+
+_MARKER = "\x1a"
+"""Delimiter of URL markers in cached fragments."""
+
+_MARKER_RE = re.compile(f"{_MARKER}([^{_MARKER}]*){_MARKER}")
+
+
+def mark_api_items(items: Iterable[Any], autoapi_root: str) -> int:
+    """Mark all items of the navigation sections holding only API pages.
+
+    Args:
+        items:
+            The top-level navigation items.
+        autoapi_root:
+            The directory the API pages are generated in.
+
+    Returns:
+        The number of marked items.
+    """
+    prefix = posixpath.normpath(autoapi_root) + "/"
+    marked = 0
+    todo: List[Tuple[Any, bool]] = [(item, False) for item in items]
+    while todo:
+        item, in_api = todo.pop()
+        in_api = in_api or (bool(item.children) and is_api_item(item, prefix))
+        if in_api:
+            setattr(item, NAV_CACHE_ATTRIBUTE, True)
+            marked += 1
+        todo.extend((child, in_api) for child in item.children or ())
+    return marked
+
+
+class NavRenderCache:
+    """Cache of rendered navigation items for one build."""
+
+    def __init__(self):
+        """Initialize a NavRenderCache instance."""
+        self._fragments: Dict[Tuple[Any, ...], str] = {}
+        self._recording = 0
+        self._url_filter: Callable[..., str] = None  # type: ignore[assignment]
+        self._urls: Dict[str, str] = {}
+        self._urls_for: Tuple[Any, str] = (None, "")
+        self.hits = 0
+        self.misses = 0
+
+    def install(self, env: Any) -> None:
+        """Add the cache to a Jinja environment.
+
+        Wraps the `url` filter and adds the `autoapi_cached_nav` global used
+        by the rewritten templates.
+        """
+        url_filter = env.filters["url"]
+
+        # `functools.wraps` also copies the attribute telling Jinja to pass
+        # the context.
+        @functools.wraps(url_filter)
+        def url(context, value):
+            if self._recording:
+                return f"{_MARKER}{value}{_MARKER}"
+            return url_filter(context, value)
+
+        self._url_filter = url_filter
+        env.filters["url"] = url
+        env.globals["autoapi_cached_nav"] = self.render
+
+    def render(
+        self,
+        page: Any,
+        base_url: str,
+        key: Iterable[Any],
+        macro: Callable[..., str],
+        nav_item: Any,
+        *args: Any,
+    ) -> str:
+        """Render a navigation item, reusing a cached rendering if possible.
+
+        Args:
+            page:
+                The page being rendered.
+            base_url:
+                The `base_url` of the page being rendered.
+            key:
+                The values, besides the item, that the rendering depends on
+                (e.g., its level).
+            macro:
+                The template macro rendering the item.
+            nav_item:
+                The navigation item.
+            *args:
+                The other arguments of `macro`.
+
+        Returns:
+            The rendered item.
+        """
+        cache_key = (id(nav_item), *key)
+        fragment = self._fragments.get(cache_key)
+        if fragment is None:
+            self.misses += 1
+            self._recording += 1
+            try:
+                fragment = str(macro(nav_item, *args))
+            finally:
+                self._recording -= 1
+            self._fragments[cache_key] = fragment
+        else:
+            self.hits += 1
+
+        if self._recording:
+            return Markup(fragment)
+
+        # Static templates have no page, but different base URLs.
+        if self._urls_for[0] is not page or self._urls_for[1] != base_url:
+            self._urls_for = (page, base_url)
+            self._urls = {}
+        context = {"page": page, "base_url": base_url}
+        urls = self._urls
+
+        def replace(match) -> str:
+            target = match.group(1)
+            url = urls.get(target)
+            if url is None:
+                url = urls[target] = self._url_filter(context, target)
+            return url
+
+        return Markup(_MARKER_RE.sub(replace, fragment))
@@ -1,38 +1,73 @@
-"""Plugin definition for mkdocs-autoapi."""
+"""Plugin definition for mkdocs-autoapi.
+
+Only what is needed to declare the plugin and its configuration is imported at
+module level. The machinery behind each event hook (discovery, the files
+editor, the literate nav parser, the template rewriter, ...) is imported when
+the hook first runs, so loading the plugin stays cheap for builds that do not
+generate API docs and for tools that only load the configuration.
+"""
 
 # built-in imports
 import collections
+import copy
 import os
+import posixpath
 import tempfile
 import urllib.parse
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # third-party imports
-from jinja2 import Environment
 from mkdocs.config import Config, config_options
-from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.exceptions import ConfigurationError, PluginError
-from mkdocs.plugins import BasePlugin
-from mkdocs.structure.files import Files
-from mkdocs.structure.nav import Navigation, Section
-from mkdocs.structure.pages import Page
+from mkdocs.plugins import BasePlugin, event_priority
 
 # local imports
-from mkdocs_autoapi.autoapi import add_autoapi_nav_entry, create_docs
-from mkdocs_autoapi.generate_files.editor import FilesEditor
-from mkdocs_autoapi.literate_nav import resolve
 from mkdocs_autoapi.logging import get_logger
-from mkdocs_autoapi.section_index import rewrite
-from mkdocs_autoapi.section_index.section_page import SectionPage
+from mkdocs_autoapi.search_index import SEARCH_INDEX_MODES
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure.files import Files
+    from mkdocs.structure.nav import Navigation
+    from mkdocs.structure.pages import Page
+
+    from mkdocs_autoapi.autoapi import ApiPlan
+    from mkdocs_autoapi.daemon import WarmState
 
 logger = get_logger(name="mkdocs-autoapi")
 
 
+class AutoApiDirConfig(Config):
+    """Configuration options for an entry of `autoapi_dirs`."""
+
+    path = config_options.Dir(exists=True)
+    file_patterns = config_options.Optional(
+        config_options.ListOfItems(config_options.Type(str))
+    )
+    ignore = config_options.Optional(
+        config_options.ListOfItems(config_options.Type(str))
+    )
+
+
+class AutoApiModuleOptionsConfig(Config):
+    """Configuration options for an entry of `autoapi_module_options`."""
+
+    pattern = config_options.Optional(config_options.Type(str))
+    min_lines = config_options.Optional(config_options.Type(int))
+    min_symbols = config_options.Optional(config_options.Type(int))
+    options = config_options.Type(dict, default={})
+
+
 class AutoApiPluginConfig(Config):
     """Configuration options for plugin."""
 
     autoapi_dir = config_options.Dir(exists=True, default=".")
+    autoapi_dirs = config_options.ListOfItems(
+        config_options.SubConfig(AutoApiDirConfig),
+        default=[],
+    )
     autoapi_file_patterns = config_options.ListOfItems(
         config_options.Type(str),
         default=["*.py", "*.pyi"],
@@ -40,16 +75,104 @@ class AutoApiPluginConfig(Config):
     autoapi_ignore = config_options.ListOfItems(
         config_options.Type(str), default=[]
     )
+    autoapi_discovery_workers = config_options.Type(int, default=1)
+    autoapi_discovery_backend = config_options.Choice(
+        ("walk", "git"), default="walk"
+    )
     autoapi_keep_files = config_options.Type(bool, default=False)
+    autoapi_keep_files_dir = config_options.Optional(
+        config_options.Dir(exists=False)
+    )
     autoapi_generate_api_docs = config_options.Type(bool, default=True)
     autoapi_add_nav_entry = config_options.Type((str, bool), default=True)
     autoapi_root = config_options.Type(str, default="autoapi")
+    autoapi_prebuilt = config_options.Optional(
+        config_options.FilesystemObject(exists=True)
+    )
+    autoapi_nav_depth = config_options.Type(int, default=0)
+    autoapi_aggregate_max_lines = config_options.Optional(
+        config_options.Type(int)
+    )
+    autoapi_aggregate_max_symbols = config_options.Optional(
+        config_options.Type(int)
+    )
+    autoapi_module_options = config_options.ListOfItems(
+        config_options.SubConfig(AutoApiModuleOptionsConfig),
+        default=[],
+    )
+    autoapi_lazy_nav = config_options.Type(bool, default=False)
+    autoapi_search_index = config_options.Choice(
+        SEARCH_INDEX_MODES, default="full"
+    )
+    autoapi_symbol_index = config_options.Type(bool, default=False)
+    autoapi_symbol_index_limit = config_options.Type(int, default=50000)
+    autoapi_prewarm = config_options.Type(bool, default=False)
+    autoapi_nav_cache = config_options.Type(bool, default=False)
+    autoapi_render_cache = config_options.Type(bool, default=False)
+    autoapi_render_cache_dir = config_options.Optional(config_options.Type(str))
+    autoapi_render_cache_size = config_options.Type(int, default=256)
+    autoapi_prerender = config_options.Type(bool, default=False)
+    autoapi_prerender_workers = config_options.Optional(
+        config_options.Type(int)
+    )
+    autoapi_render_time_budget = config_options.Optional(
+        config_options.Type((int, float))
+    )
+    autoapi_render_size_budget = config_options.Optional(
+        config_options.Type(int)
+    )
+    autoapi_profile = config_options.Optional(config_options.Type(str))
+    autoapi_render_report = config_options.Optional(config_options.Type(str))
 
 
 class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
     """Plugin logic definition."""
 
-    def on_config(self, config: MkDocsConfig) -> Optional[Config]:
+    warm_state: Optional["WarmState"] = None
+    """State reused across builds, set by the build daemon (see
+    `mkdocs_autoapi.daemon`)."""
+
+    def load_config(self, options, config_file_path=None):
+        """Load the plugin configuration, profiling the events if enabled.
+
+        MkDocs registers the event methods right after loading the
+        configuration, so this is where they are wrapped to be profiled (see
+        `mkdocs_autoapi.profiling`). They are left untouched otherwise.
+
+        Steps:
+            1.  Load the configuration.
+            2.  Profile the event methods if `autoapi_profile` is set, with
+                the profile directory relative to the configuration file.
+
+        Args:
+            options:
+                The plugin options from the MkDocs configuration.
+            config_file_path:
+                The path of the MkDocs configuration file.
+
+        Returns:
+            The configuration errors and warnings.
+        """
+        # Step 1
+        errors, warnings = super().load_config(
+            options=options, config_file_path=config_file_path
+        )
+
+        # Step 2
+        profile_dir = self.config.get("autoapi_profile")
+        if profile_dir and not errors:
+            from mkdocs_autoapi import profiling
+
+            config_dir = os.path.dirname(config_file_path or "")
+            profiling.install(
+                plugin=self,
+                directory=os.path.abspath(
+                    os.path.join(config_dir, profile_dir)
+                ),
+            )
+        return errors, warnings
+
+    def on_config(self, config: "MkDocsConfig") -> Optional[Config]:
         """Validate the plugin configuration.
 
         # Step 1
@@ -58,13 +181,20 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                 1.  Get the `mkdocstrings` configuration object.
                 2.  If `mkdocstrings` is not enabled, then warn the user.
                 3.  Get the `handlers` configuration.
-                4.  Identify the AutoAPI directory. If the value provided by the
-                    user is a Python package, then get the parent directory.
-                    Otherwise, use the provided value.
-                5.  Check if the AutoAPI directory is included in the paths for
-                    each `mkdocstrings` handler. If not, then warn the user.
+                4.  Identify the AutoAPI directories. If a value provided by
+                    the user is a Python package, then get the parent
+                    directory. Otherwise, use the provided value.
+                5.  Check if each AutoAPI directory is included in the paths
+                    for each `mkdocstrings` handler. If not, then warn the
+                    user.
             2b. If `mkdocstrings` is not included, then warn the user.
-            3.  Return.
+            3.  If `autoapi_lazy_nav` is enabled, then check that the theme
+                supports it and add the navigation script to the page.
+            4.  If `autoapi_nav_cache` is enabled, then check that the theme
+                supports it.
+            5.  If `autoapi_prerender` is enabled, then check that the
+                platform supports it.
+            6.  Return.
 
 
         Args:
@@ -99,9 +229,15 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                 }
 
             # Step 2a.4
-            autoapi_dir = Path(self.config.autoapi_dir).absolute()
-            if "__init__.py" in os.listdir(autoapi_dir):
-                autoapi_dir = autoapi_dir.parent.absolute()
+            from mkdocs_autoapi.autoapi import get_autoapi_roots
+
+            autoapi_dirs = []
+            for root in get_autoapi_roots(config=self.config):
+                autoapi_dir = root.path.absolute()
+                if "__init__.py" in os.listdir(autoapi_dir):
+                    autoapi_dir = autoapi_dir.parent.absolute()
+                if autoapi_dir not in autoapi_dirs:
+                    autoapi_dirs.append(autoapi_dir)
 
             # Step 2a.5
             mkdocs_yml_dir = Path(config.config_file_path).parent.absolute()
@@ -114,7 +250,9 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                         "paths"
                     ]
                 ]
-                if autoapi_dir not in paths:
+                for autoapi_dir in autoapi_dirs:
+                    if autoapi_dir in paths:
+                        continue
                     relative_autoapi_dir = os.path.relpath(
                         path=autoapi_dir,
                         start=mkdocs_yml_dir,
@@ -137,9 +275,45 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
             )
 
         # Step 3
+        if self.config.autoapi_lazy_nav:
+            if config.theme.name != "material":
+                logger.warning(
+                    msg=f"`autoapi_lazy_nav` is not supported by theme {config.theme.name!r} and will be ignored.\n    HINT: Lazily loaded navigation requires Material for MkDocs."
+                )
+                self.config.autoapi_lazy_nav = False
+            else:
+                from mkdocs_autoapi import lazy_nav
+
+                script = posixpath.join(
+                    self.config.autoapi_root, lazy_nav.SCRIPT_NAME
+                )
+                if script not in config.extra_javascript:
+                    config.extra_javascript.append(script)
+
+        # Step 4
+        if self.config.autoapi_nav_cache and config.theme.name not in (
+            "material",
+            "readthedocs",
+        ):
+            logger.warning(
+                msg=f"`autoapi_nav_cache` is not supported by theme {config.theme.name!r} and will be ignored.\n    HINT: Cached navigation rendering requires Material for MkDocs or the ReadTheDocs theme."
+            )
+            self.config.autoapi_nav_cache = False
+
+        # Step 5
+        if self.config.autoapi_prerender:
+            from mkdocs_autoapi.prerender import is_supported
+
+            if not is_supported():
+                logger.warning(
+                    msg="`autoapi_prerender` is not supported on this platform and will be ignored.\n    HINT: Pre-rendering requires worker processes started with `fork`."
+                )
+                self.config.autoapi_prerender = False
+
+        # Step 6
         return config
 
-    def on_files(self, files: Files, config: MkDocsConfig) -> Files:
+    def on_files(self, files: "Files", config: "MkDocsConfig") -> "Files":
         """Generate autoAPI documentation files.
 
         Steps:
@@ -148,7 +322,10 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                 not already ignored.
             3.  Create the autoAPI documentation files.
             4.  Store the paths of the generated files.
-            5.  Return the updated files object.
+            5.  Exclude pages left out of the navigation by
+                `autoapi_nav_depth` from the "not included in the nav"
+                report, and start pre-warming `mkdocstrings` if desired.
+            6.  Return the updated files object.
 
         Args:
             files:
@@ -160,16 +337,23 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
             The updated MkDocs files object.
         """
         # Step 1
+        from mkdocs_autoapi.autoapi import (
+            ALWAYS_IGNORED,
+            add_autoapi_nav_entry,
+            create_docs,
+        )
+        from mkdocs_autoapi.generate_files.editor import FilesEditor
+        from mkdocs_autoapi.literate_nav import resolve
+
         self._dir = tempfile.TemporaryDirectory(
             prefix="autoapi",
         )
         config.update(self.config)
 
         # Step 2
-        if "venv/**/*" not in self.config.autoapi_ignore:
-            self.config.autoapi_ignore.append("venv/**/*")
-        if ".venv/**/*" not in self.config.autoapi_ignore:
-            self.config.autoapi_ignore.append(".venv/**/*")
+        for pattern in ALWAYS_IGNORED:
+            if pattern not in self.config.autoapi_ignore:
+                self.config.autoapi_ignore.append(pattern)
 
         # Step 4
         with FilesEditor(
@@ -178,16 +362,105 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
             directory=self._dir.name,
         ) as editor:
             try:
+                plan = None
                 if self.config.autoapi_generate_api_docs:
-                    create_docs(config=config)
+                    plan = create_docs(
+                        config=config,
+                        plan=self._load_prebuilt(config)
+                        or self._load_warm_plan(config),
+                    )
+                    self._save_warm_plan(config=config, plan=plan)
                 elif self.config.autoapi_add_nav_entry:
                     add_autoapi_nav_entry(config=config)
                     logger.debug(msg="Added AutoAPI section to navigation.")
+                if self.config.autoapi_lazy_nav:
+                    from mkdocs_autoapi import lazy_nav
+
+                    script = posixpath.join(
+                        self.config.autoapi_root, lazy_nav.SCRIPT_NAME
+                    )
+                    with editor.open(script, "w") as f:
+                        f.write(lazy_nav.SCRIPT)
             except Exception as e:
                 raise PluginError(str(e))
 
         # Step 5
         self._edit_paths = dict(editor.edit_paths)
+        self._api_urls = set()
+        self._api_doc_paths = (
+            {page.doc_path for page in plan.pages}
+            if plan is not None
+            else set()
+        )
+        self._plan = plan
+        self._prewarm_thread = None
+        if getattr(self, "_prerender", None) is not None:
+            self._prerender.close()
+        self._recorder = self._render_cache = self._prerender = None
+        self._prerender_pending = False
+        self._render_report = None
+        self._prerender_seconds = {}
+        self._budget_modules = {}
+        if plan is not None:
+            self._exclude_from_nav_report(plan=plan, files=editor.files)
+            if self.config.autoapi_prewarm:
+                from mkdocs_autoapi.prewarm import start_prewarm
+
+                mkdocstrings_plugin = config.plugins["mkdocstrings"]
+                self._prewarm_thread = start_prewarm(
+                    mkdocstrings_plugin=mkdocstrings_plugin,
+                    handler_name=mkdocstrings_plugin.config.default_handler,
+                    identifiers=[
+                        module.identifier
+                        for page in plan.pages
+                        for module in (page, *page.sections)
+                        if module.source_path is not None
+                    ],
+                    options={
+                        module.identifier: module.options
+                        for page in plan.pages
+                        for module in (page, *page.sections)
+                        if module.options
+                    },
+                )
+            if (
+                self.config.autoapi_render_cache
+                or self.config.autoapi_prerender
+            ):
+                self._start_recording(config=config, plan=plan)
+            if (
+                self.config.autoapi_render_time_budget
+                or self.config.autoapi_render_size_budget
+            ):
+                # Generated index pages have no source but may have sections.
+                self._budget_modules = {
+                    page.doc_path: [
+                        (module.identifier, module.source_path)
+                        for module in (page, *page.sections)
+                    ]
+                    for page in plan.pages
+                    if any(
+                        module.source_path is not None
+                        for module in (page, *page.sections)
+                    )
+                }
+            if self.config.autoapi_render_report:
+                from mkdocs_autoapi.render_report import RenderReport
+
+                # Generated index pages have no source but may have sections.
+                self._render_report = RenderReport(
+                    modules={
+                        page.doc_path: [
+                            module.identifier
+                            for module in (page, *page.sections)
+                        ]
+                        for page in plan.pages
+                        if any(
+                            module.source_path is not None
+                            for module in (page, *page.sections)
+                        )
+                    }
+                )
 
         # Step 6
         markdown_extensions = config.markdown_extensions
@@ -198,20 +471,192 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
         }
 
         # Step 7
-        config.nav = resolve.resolve_directories_in_nav(
-            nav_data=config.nav,
-            files=editor.files,
-            nav_file_name="summary.md",
-            implicit_index=False,
-            markdown_config=markdown_config,
-        )
+        warm = self.warm_state
+        nav_key = (id(plan), repr(config.nav))
+        if (
+            warm is not None
+            and warm.nav is not None
+            and warm.nav_key == nav_key
+        ):
+            logger.debug(msg="Reusing the resolved navigation.")
+            config.nav = copy.deepcopy(warm.nav)
+        else:
+            config.nav = resolve.resolve_directories_in_nav(
+                nav_data=config.nav,
+                files=editor.files,
+                nav_file_name="summary.md",
+                implicit_index=False,
+                markdown_config=markdown_config,
+            )
+            if warm is not None:
+                with warm.lock:
+                    warm.nav = copy.deepcopy(config.nav)
+                    warm.nav_key = nav_key
         self._files = editor.files
 
         # Step 8
         return editor.files
 
-    def on_nav(self, nav: Navigation, config, files) -> Navigation:
+    def _warm_plan_key(self, config: "MkDocsConfig") -> str:
+        """Describe the options a plan depends on."""
+        return repr((config.theme.name, sorted(self.config.items())))
+
+    def _load_warm_plan(self, config: "MkDocsConfig") -> Optional["ApiPlan"]:
+        """Get the plan of the previous build, if still valid."""
+        warm = self.warm_state
+        if warm is None or warm.plan is None:
+            return None
+        if warm.plan_key != self._warm_plan_key(config):
+            return None
+        logger.debug(msg="Reusing the plan of the previous build.")
+        return warm.plan
+
+    def _save_warm_plan(self, config: "MkDocsConfig", plan: "ApiPlan"):
+        """Keep the plan for the next build."""
+        warm = self.warm_state
+        if warm is None or self.config.autoapi_prebuilt:
+            return
+        with warm.lock:
+            warm.plan = plan
+            warm.plan_key = self._warm_plan_key(config)
+
+    def _start_recording(self, config: "MkDocsConfig", plan: "ApiPlan"):
+        """Record conversions of API pages to cache or pre-render them."""
+        from mkdocs_autoapi.recording import PageRecorder
+
+        mkdocstrings_plugin = config.plugins.get("mkdocstrings")
+        if mkdocstrings_plugin is None:
+            return
+        self._recorder = PageRecorder(
+            autorefs_plugin=config.plugins["autorefs"],
+            inventory=mkdocstrings_plugin.handlers.inventory,
+        )
+        self._render_sources = {}
+        for page in plan.pages:
+            sources = [
+                module.source_path
+                for module in (page, *page.sections)
+                if module.source_path is not None
+            ]
+            if sources:
+                self._render_sources[page.doc_path] = sources
+        self._render_entries = {}
+        self._render_keys = {}
+        self._prerender_pending = self.config.autoapi_prerender
+
+        if self.config.autoapi_render_cache:
+            from mkdocs_autoapi.render_cache import (
+                RenderCache,
+                describe_templates,
+                get_cache_dir,
+                get_renderer_versions,
+            )
+
+            config_dir = Path(config.config_file_path).parent
+            custom_templates = mkdocstrings_plugin.config.get(
+                "custom_templates"
+            )
+            self._render_cache = RenderCache(
+                directory=get_cache_dir(
+                    config_dir=config_dir,
+                    cache_dir=self.config.autoapi_render_cache_dir,
+                ),
+                max_size=self.config.autoapi_render_cache_size * 1024 * 1024,
+            )
+            self._render_options = (
+                dict(mkdocstrings_plugin.config),
+                [
+                    config.markdown_extensions,
+                    config.mdx_configs,
+                    self.config.autoapi_render_time_budget,
+                    self.config.autoapi_render_size_budget,
+                ],
+                [
+                    get_renderer_versions(
+                        mkdocstrings_plugin.config.default_handler
+                    ),
+                    describe_templates(
+                        custom_templates and config_dir / custom_templates
+                    ),
+                ],
+            )
+
+    def _render_key(
+        self, markdown: str, page: "Page", config: "MkDocsConfig"
+    ) -> Optional[str]:
+        """Get the render cache key of an API page, if cached."""
+        if self._render_cache is None:
+            return None
+
+        from mkdocs_autoapi.render_cache import make_key
+
+        try:
+            source = b"\0".join(
+                Path(path).read_bytes()
+                for path in self._render_sources[page.file.src_uri]
+            )
+        except (KeyError, OSError):
+            return None
+        handler_options, markdown_options, renderer = self._render_options
+        return make_key(
+            source=source,
+            markdown=markdown,
+            handler_options=handler_options,
+            markdown_options=markdown_options,
+            theme=config.theme.name,
+            url=page.url,
+            renderer=renderer,
+        )
+
+    def _wants_conversion(self, page: "Page", config: "MkDocsConfig") -> bool:
+        """Tell whether a pre-rendered page would not be in the cache."""
+        key = self._render_key(markdown=page.markdown, page=page, config=config)
+        return key is None or key not in self._render_cache
+
+    def _exclude_from_nav_report(self, plan: "ApiPlan", files: "Files"):
+        """Mark pages left out of the navigation as intentionally so."""
+        try:
+            from mkdocs.structure.files import InclusionLevel
+        except ImportError:  # MkDocs < 1.6
+            return
+
+        for page in plan.pages:
+            if page.in_nav:
+                continue
+            file = files.get_file_from_path(page.doc_path)
+            if file is not None:
+                file.inclusion = InclusionLevel.NOT_IN_NAV
+
+    def _load_prebuilt(self, config: "MkDocsConfig") -> Optional["ApiPlan"]:
+        """Load the plan from `autoapi_prebuilt`, if set."""
+        if not self.config.autoapi_prebuilt:
+            return None
+
+        from mkdocs_autoapi import bundle
+
+        logger.debug(
+            msg=f"Using prebuilt AutoAPI bundle {self.config.autoapi_prebuilt}."
+        )
+        base_dir = Path(config.config_file_path).parent
+        return bundle.read_bundle(
+            path=Path(self.config.autoapi_prebuilt),
+            autoapi_root=self.config.autoapi_root,
+            inputs=bundle.collect_inputs(
+                config=config,
+                theme=config.theme.name,
+                handler=config.plugins["mkdocstrings"].config.default_handler,
+                base_dir=base_dir,
+            ),
+            base_dir=base_dir,
+        )
+
+    def on_nav(self, nav: "Navigation", config, files) -> "Navigation":
         """Apply plugin-specific transformations to the navigation."""
+        from mkdocs.structure.nav import Section
+        from mkdocs.structure.pages import Page
+
+        from mkdocs_autoapi.section_index.section_page import SectionPage
+
         todo = collections.deque((nav.items,))
         while todo:
             items = todo.popleft()
@@ -234,13 +679,42 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                     for child in page.children:
                         child.parent = page
                     items[i] = page
+
+        self._lazy_sections = []
+        if self.config.autoapi_lazy_nav:
+            from mkdocs_autoapi import lazy_nav
+
+            self._lazy_sections = lazy_nav.mark_api_sections(
+                items=nav.items, autoapi_root=self.config.autoapi_root
+            )
+        if self.config.autoapi_nav_cache:
+            from mkdocs_autoapi import nav_cache
+
+            marked = nav_cache.mark_api_items(
+                items=nav.items, autoapi_root=self.config.autoapi_root
+            )
+            logger.debug(msg=f"Caching the rendering of {marked} nav items.")
         self._nav = nav
         return nav
 
-    def on_env(self, env: Environment, config, files) -> Environment:
+    def on_env(self, env: "Environment", config, files) -> "Environment":
         """Apply plugin-specific transformations to the Jinja environment."""
+        from mkdocs_autoapi.section_index import rewrite
+
         assert env.loader is not None
-        env.loader = self._loader = rewrite.TemplateRewritingLoader(env.loader)
+        env.loader = self._loader = rewrite.TemplateRewritingLoader(
+            env.loader,
+            lazy_nav=bool(self._lazy_sections),
+            nav_cache=self.config.autoapi_nav_cache,
+        )
+        if self.warm_state is not None:
+            env.bytecode_cache = self.warm_state.bytecode_cache
+        self._nav_cache = None
+        if self.config.autoapi_nav_cache:
+            from mkdocs_autoapi.nav_cache import NavRenderCache
+
+            self._nav_cache = NavRenderCache()
+            self._nav_cache.install(env)
         return env
 
     def on_page_context(self, context, page, config, nav):
@@ -248,19 +722,179 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
         if nav != self._nav:
             self._nav = nav
 
+    @event_priority(100)
+    def on_pre_page(
+        self, page: "Page", config: "MkDocsConfig", files: "Files"
+    ) -> "Page":
+        """Prepare the conversion of API pages.
+
+        Steps:
+            1.  Start pre-rendering API pages when MkDocs reaches the first
+                page. All plugins have processed the files and the navigation
+                by then, so the forked workers convert pages exactly as MkDocs
+                would.
+            2.  Limit the conversion of API pages to the render budget, if
+                set (in workers too).
+        """
+        # Step 1
+        if self._prerender_pending:
+            self._prerender_pending = False
+
+            from mkdocs_autoapi.prerender import PrerenderPool
+
+            # Do not fork while the thread may hold the handler's lock.
+            if self._prewarm_thread is not None:
+                self._prewarm_thread.join()
+                self._prewarm_thread = None
+            self._prerender = PrerenderPool(
+                config=config,
+                files=files,
+                recorder=self._recorder,
+                wants_conversion=self._wants_conversion,
+                src_uris=[
+                    file.src_uri
+                    for file in files.documentation_pages()
+                    if file.src_uri in self._render_sources
+                ],
+                workers=self.config.autoapi_prerender_workers,
+            )
+
+        # Step 2
+        modules = self._budget_modules.get(page.file.src_uri)
+        if modules:
+            from mkdocs_autoapi.budget import limit_render
+
+            mkdocstrings_plugin = config.plugins["mkdocstrings"]
+            max_size = self.config.autoapi_render_size_budget
+            limit_render(
+                page=page,
+                modules=modules,
+                max_seconds=self.config.autoapi_render_time_budget,
+                max_size=max_size and max_size * 1024,
+                handler=mkdocstrings_plugin.handlers.get_handler(
+                    mkdocstrings_plugin.config.default_handler
+                ),
+                autorefs_plugin=config.plugins.get("autorefs"),
+            )
+        return page
+
+    @event_priority(-100)
+    def on_page_markdown(
+        self,
+        markdown: str,
+        page: "Page",
+        config: "MkDocsConfig",
+        files: "Files",
+    ) -> str:
+        """Prepare the conversion of API pages.
+
+        Runs after the other plugins have modified the Markdown, which is part
+        of the render cache key, so that only the conversion is measured by
+        the rendering report.
+        """
+        src_uri = page.file.src_uri
+        if self._recorder is not None and src_uri in self._render_sources:
+            markdown = self._reuse_conversion(
+                markdown=markdown, page=page, config=config
+            )
+        if self._render_report is not None:
+            self._render_report.start(
+                src_uri=src_uri,
+                reused=self._recorder is not None
+                and src_uri in self._render_entries,
+                seconds=self._prerender_seconds.pop(src_uri, None),
+            )
+        return markdown
+
+    def _reuse_conversion(
+        self, markdown: str, page: "Page", config: "MkDocsConfig"
+    ) -> str:
+        """Skip the conversion of cached or pre-rendered API pages.
+
+        Steps:
+            1.  Look the page up in the render cache.
+            2.  If not cached, get its pre-rendered conversion (and cache it,
+                unless the page was degraded by the render budget).
+            3.  If neither, record the conversion by MkDocs (to cache it).
+                Otherwise, convert empty Markdown and replay the recorded
+                conversion in `on_page_content`.
+        """
+        src_uri = page.file.src_uri
+        if self.config.autoapi_prerender:
+            from mkdocs_autoapi.prerender import in_worker
+
+            if in_worker():
+                return markdown
+
+        # Step 1
+        entry = None
+        key = self._render_key(markdown=markdown, page=page, config=config)
+        if key is not None:
+            entry = self._render_cache.get(key)
+
+        # Step 2
+        if entry is None and self._prerender is not None:
+            entry = self._prerender.get(src_uri)
+            if entry is not None:
+                # The worker's conversion time, for the rendering report.
+                self._prerender_seconds[src_uri] = entry.pop("seconds", None)
+                degraded = entry.pop("degraded", False)
+                if key is not None and not degraded:
+                    self._render_cache.put(key, entry)
+
+        # Step 3
+        if entry is None:
+            self._recorder.start(page)
+            if key is not None:
+                self._render_keys[src_uri] = key
+            return markdown
+        self._render_entries[src_uri] = entry
+        return ""
+
+    @event_priority(50)
     def on_page_content(
         self,
         html: str,
-        page: Page,
-        config: MkDocsConfig,
-        files: Files,
+        page: "Page",
+        config: "MkDocsConfig",
+        files: "Files",
     ) -> str:
-        """Apply plugin-specific transformations to a page's content."""
+        """Apply plugin-specific transformations to a page's content.
+
+        Runs before `autorefs` reads the table of contents, so pages restored
+        from the render cache or pre-rendered have theirs. Pages degraded by
+        the render budget are not cached, so later builds warn about them.
+        """
+        if self._recorder is not None:
+            src_uri = page.file.src_uri
+            entry = self._render_entries.pop(src_uri, None)
+            if entry is not None:
+                # Mark the handler as used, for its CSS and inventory.
+                mkdocstrings_plugin = config.plugins["mkdocstrings"]
+                mkdocstrings_plugin.handlers.get_handler(
+                    mkdocstrings_plugin.config.default_handler
+                )
+                html = self._recorder.restore(page=page, entry=entry)
+            else:
+                from mkdocs_autoapi.budget import DEGRADED_ATTRIBUTE
+
+                entry = self._recorder.finish(page=page, html=html)
+                key = self._render_keys.pop(src_uri, None)
+                degraded = hasattr(page, DEGRADED_ATTRIBUTE)
+                if entry is not None and key is not None and not degraded:
+                    self._render_cache.put(key, entry)
+        if self._render_report is not None:
+            self._render_report.stop(src_uri=page.file.src_uri, html=html)
+
         if self.config.autoapi_generate_api_docs:
             repo_url = config.repo_url
             edit_uri = config.edit_uri
 
             src_path = page.file.src_uri
+            # Pages of the plan without a source file (e.g., namespace index
+            # pages) have no edit path, so look them up in the plan too.
+            if src_path in self._api_doc_paths or src_path in self._edit_paths:
+                self._api_urls.add(page.url)
             if src_path in self._edit_paths:
                 path = self._edit_paths.pop(src_path)
                 if repo_url and edit_uri:
@@ -275,3 +909,80 @@ class AutoApiPlugin(BasePlugin[AutoApiPluginConfig]):
                     )
 
         return html
+
+    @event_priority(-100)
+    def on_post_build(self, config: "MkDocsConfig") -> None:
+        """Post-process the built site.
+
+        Runs after the search plugins have written the search index.
+        """
+        if self._prewarm_thread is not None:
+            self._prewarm_thread.join()
+            self._prewarm_thread = None
+
+        if self._nav_cache is not None:
+            logger.debug(
+                msg=f"Rendered {self._nav_cache.misses} nav items and reused "
+                f"{self._nav_cache.hits} cached renderings."
+            )
+
+        if self._prerender is not None:
+            self._prerender.close()
+            logger.debug(
+                msg=f"Used {self._prerender.converted} pre-rendered API pages."
+            )
+            self._prerender = None
+
+        if self._render_cache is not None:
+            removed = self._render_cache.prune()
+            logger.debug(
+                msg=f"Converted {self._render_cache.misses} API pages and "
+                f"reused {self._render_cache.hits} cached renderings; "
+                f"evicted {removed} cache entries."
+            )
+
+        if self._render_report is not None:
+            self._render_report.write(
+                path=os.path.abspath(
+                    os.path.join(
+                        os.path.dirname(config.config_file_path or ""),
+                        self.config.autoapi_render_report,
+                    )
+                )
+            )
+
+        if self.config.autoapi_search_index != "full":
+            from mkdocs_autoapi.search_index import process_search_index
+
+            process_search_index(
+                site_dir=config.site_dir,
+                api_urls=self._api_urls,
+                mode=self.config.autoapi_search_index,
+            )
+
+        if self.config.autoapi_symbol_index and self._plan is not None:
+            from mkdocs_autoapi.symbols import write_symbol_index
+
+            pages = []
+            for page in self._plan.pages:
+                file = self._files.get_file_from_path(page.doc_path)
+                if file is not None:
+                    pages.extend(
+                        (module.identifier, module.source_path, file.url)
+                        for module in (page, *page.sections)
+                    )
+            write_symbol_index(
+                pages=pages,
+                autoapi_root=self.config.autoapi_root,
+                limit=self.config.autoapi_symbol_index_limit,
+                site_dir=config.site_dir,
+            )
+
+        if self._lazy_sections:
+            from mkdocs_autoapi import lazy_nav
+
+            lazy_nav.write_nav_data(
+                sections=self._lazy_sections,
+                autoapi_root=self.config.autoapi_root,
+                site_dir=config.site_dir,
+            )
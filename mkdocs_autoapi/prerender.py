@@ -0,0 +1,232 @@
+"""Conversion of API pages in worker processes.
+
+MkDocs converts pages one at a time, and converting API pages with
+`mkdocstrings` is CPU-bound, so large API references use a single core. With
+`autoapi_prerender` enabled, a pool of worker processes converts the API pages
+while MkDocs goes through its page loop, and the plugin replays their
+conversions (see `mkdocs_autoapi.recording`) instead of converting the pages
+again.
+
+The workers are forked when the page loop starts, so they share the exact
+state of the build: the configuration, the files, the navigation and the
+plugins. Each worker processes a page the way MkDocs does (`on_pre_page` and
+`on_page_markdown` events, then conversion) and returns the recorded
+conversion, with the time the conversion took (`seconds`, for the rendering
+report), together with the log records emitted meanwhile, which are emitted
+again in the main process when the page is reached. Pages whose conversion
+fails in a worker are converted again by MkDocs, so errors are reported as
+usual. If a worker dies (e.g., it is killed for using too much memory), the
+pool is dropped and MkDocs converts the remaining pages itself.
+"""
+
+# built-in imports
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# local imports
+from mkdocs_autoapi.budget import DEGRADED_ATTRIBUTE
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+_Result = Tuple[str, Optional[Dict[str, Any]], List[logging.LogRecord]]
+
+_state: Optional[Tuple[Any, Any, Any, Callable[..., bool]]] = None
+"""The state inherited by forked workers (see `PrerenderPool`)."""
+
+_in_worker = False
+"""Whether this process is a worker."""
+
+
+def is_supported() -> bool:
+    """Check whether worker processes can be forked on this platform."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def in_worker() -> bool:
+    """Check whether the current process is a worker."""
+    return _in_worker
+
+
+def _start_worker() -> None:
+    """Initialize a worker process."""
+    global _in_worker
+
+    _in_worker = True
+
+
+class _CaptureHandler(logging.Handler):
+    """Collect log records instead of emitting them."""
+
+    def __init__(self):
+        """Initialize a _CaptureHandler instance."""
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Keep a picklable copy of a record."""
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = record.exc_text = None
+        self.records.append(record)
+
+
+def _convert(src_uri: str) -> _Result:
+    """Convert a page in a worker process.
+
+    Steps:
+        1.  Capture the records of the `mkdocs` loggers (including the ones of
+            plugins).
+        2.  Run the `on_pre_page` and `on_page_markdown` events.
+        3.  Skip the page if its conversion would not be used (e.g., it is in
+            the render cache).
+        4.  Convert the page, recording the conversion, the time it took and
+            whether the page was degraded by the render budget.
+
+    Args:
+        src_uri:
+            The page's file.
+
+    Returns:
+        The page's file, its recorded conversion (None if skipped or failed)
+        and the captured log records.
+    """
+    from mkdocs.structure.pages import Page
+
+    assert _state is not None
+    config, files, recorder, wants_conversion = _state
+
+    # Step 1
+    mkdocs_logger = logging.getLogger("mkdocs")
+    handler = _CaptureHandler()
+    handlers = mkdocs_logger.handlers
+    mkdocs_logger.handlers = [handler]
+    entry = None
+    try:
+        # Step 2
+        file = files.get_file_from_path(src_uri)
+        page = file.page or Page(None, file, config)
+        config._current_page = page
+        page = config.plugins.on_pre_page(page, config=config, files=files)
+        page.read_source(config)
+        page.markdown = config.plugins.on_page_markdown(
+            page.markdown, page=page, config=config, files=files
+        )
+
+        # Step 3
+        if wants_conversion(page, config):
+            # Step 4
+            recorder.start(page)
+            start = time.perf_counter()
+            page.render(config, files)
+            seconds = time.perf_counter() - start
+            entry = recorder.finish(page=page, html=page.content)
+            if entry is not None:
+                entry["seconds"] = seconds
+                entry["degraded"] = hasattr(page, DEGRADED_ATTRIBUTE)
+    except Exception as e:
+        logger.debug(msg=f"Could not pre-render {src_uri}: {e}")
+        entry = None
+    finally:
+        config._current_page = None
+        mkdocs_logger.handlers = handlers
+    return src_uri, entry, handler.records
+
+
+class PrerenderPool:
+    """Convert pages in a pool of forked worker processes."""
+
+    def __init__(
+        self,
+        config: Any,
+        files: Any,
+        recorder: Any,
+        wants_conversion: Callable[[Any, Any], bool],
+        src_uris: List[str],
+        workers: Optional[int] = None,
+    ):
+        """Initialize a PrerenderPool instance and start converting.
+
+        Args:
+            config:
+                The MkDocs configuration.
+            files:
+                The MkDocs files.
+            recorder:
+                The `PageRecorder` recording conversions.
+            wants_conversion:
+                Called with a page and the configuration after the
+                `on_page_markdown` events, tells whether to convert the page.
+            src_uris:
+                The files of the pages to convert, in the order MkDocs will
+                reach them.
+            workers:
+                The number of worker processes. Defaults to the number of
+                CPUs.
+        """
+        global _state
+
+        self.converted = 0
+        processes = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_start_worker,
+        )
+        # The workers are forked when the first page is submitted.
+        _state = (config, files, recorder, wants_conversion)
+        try:
+            self._futures: Dict[str, "Future[_Result]"] = {
+                src_uri: self._executor.submit(_convert, src_uri)
+                for src_uri in src_uris
+            }
+        finally:
+            _state = None
+        logger.debug(
+            msg=f"Pre-rendering {len(src_uris)} pages in {processes} processes."
+        )
+
+    def get(self, src_uri: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded conversion of a page, waiting for it if needed.
+
+        The log records emitted while converting the page are handled by the
+        loggers of the main process.
+
+        Args:
+            src_uri:
+                The page's file.
+
+        Returns:
+            The recorded conversion, or None if the page is not pre-rendered,
+            was skipped or could not be converted.
+        """
+        future = self._futures.pop(src_uri, None)
+        if future is None:
+            return None
+        try:
+            _, entry, records = future.result()
+        except BrokenProcessPool:
+            logger.warning(
+                "A pre-rendering worker process died; converting the "
+                f"remaining {len(self._futures) + 1} pages without workers."
+            )
+            self.close()
+            return None
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+        self.converted += entry is not None
+        return entry
+
+    def close(self) -> None:
+        """Stop the worker processes, dropping the pages not yet converted."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,124 @@
+"""Background pre-warming of `mkdocstrings` collection.
+
+`mkdocstrings` collects the data of an object when the page documenting it is
+converted, and its Python handler loads a whole top-level package the first
+time one of its modules is collected. With `autoapi_prewarm` enabled, the
+modules planned by `create_docs` are collected in a background thread right
+after `on_files`, while MkDocs goes on processing the rest of the site, so
+page conversions mostly find the data already loaded.
+
+Handlers are not thread-safe: collecting adds to the data that rendering and
+alias lookups (e.g., by `autorefs`) read. The handler's `collect`, `render` and
+`get_aliases` methods are therefore wrapped with the same lock: a page that
+needs the handler while the thread is collecting waits for the current
+collection to finish, then reuses its result.
+"""
+
+# built-in imports
+import functools
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+_LOCK_ATTRIBUTE = "_autoapi_collect_lock"
+"""The attribute of a handler holding the lock around its data."""
+
+_LOCKED_METHODS = ("collect", "render", "get_aliases")
+"""The handler methods reading or writing the collected data."""
+
+
+def _locked(lock: threading.RLock, method: Any) -> Any:
+    """Wrap a method with a lock, keeping its signature."""
+
+    @functools.wraps(method)
+    def locked_method(*args, **kwargs):
+        with lock:
+            return method(*args, **kwargs)
+
+    return locked_method
+
+
+def _lock_handler(handler: Any) -> None:
+    """Wrap a handler's methods using its data with a lock (once per handler).
+
+    The lock is reentrant, as rendering may collect.
+    """
+    if getattr(handler, _LOCK_ATTRIBUTE, None) is not None:
+        return
+
+    lock = threading.RLock()
+    for name in _LOCKED_METHODS:
+        method = getattr(handler, name, None)
+        if method is not None:
+            setattr(handler, name, _locked(lock, method))
+    setattr(handler, _LOCK_ATTRIBUTE, lock)
+
+
+def _prewarm(handler: Any, identifiers: List[Tuple[str, Any]]) -> None:
+    """Collect identifiers, ignoring errors (they surface when rendering)."""
+    for identifier, options in identifiers:
+        try:
+            handler.collect(identifier, options)
+        except Exception as e:
+            logger.debug(msg=f"Could not pre-warm {identifier}: {e}")
+    logger.debug(msg=f"Pre-warmed {len(identifiers)} modules.")
+
+
+def start_prewarm(
+    mkdocstrings_plugin: Any,
+    handler_name: str,
+    identifiers: Iterable[str],
+    options: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> Optional[threading.Thread]:
+    """Start collecting identifiers in a background thread.
+
+    Args:
+        mkdocstrings_plugin:
+            The `mkdocstrings` plugin instance.
+        handler_name:
+            The name of the handler to collect with.
+        identifiers:
+            The identifiers to collect, in order.
+        options:
+            The options of the `:::` blocks of the identifiers that have any,
+            keyed by identifier, so they are collected as their pages will.
+
+    Returns:
+        The started thread, or None if the installed `mkdocstrings` version
+        does not support pre-warming.
+    """
+    try:
+        handler = mkdocstrings_plugin.handlers.get_handler(handler_name)
+    except Exception as e:
+        logger.debug(msg=f"Pre-warming disabled: {e}")
+        return None
+    if not hasattr(handler, "get_options"):
+        logger.info(
+            "`autoapi_prewarm` requires mkdocstrings 0.28 or later and will "
+            "be ignored."
+        )
+        return None
+
+    # Options are resolved in the main thread, once per distinct block.
+    resolved: Dict[str, Any] = {}
+    collected = []
+    for identifier in identifiers:
+        local_options = (options or {}).get(identifier) or {}
+        key = json.dumps(local_options, sort_keys=True, default=str)
+        if key not in resolved:
+            resolved[key] = handler.get_options(dict(local_options))
+        collected.append((identifier, resolved[key]))
+    _lock_handler(handler)
+    thread = threading.Thread(
+        target=_prewarm,
+        args=(handler, collected),
+        name="autoapi-prewarm",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,157 @@
+"""Profiling of the plugin's event hooks.
+
+With `autoapi_profile` set, the event methods of the plugin instance are
+replaced by wrappers running them under `cProfile`, before MkDocs registers
+them. Nothing is wrapped otherwise, so profiling costs nothing when disabled.
+
+Each build writes one `<event>.prof` file per event to the profile directory,
+readable with `pstats` or tools such as `snakeviz`. Events run once per build
+(e.g., `on_files`) are profiled on their own; events run for every page (e.g.,
+`on_page_content`) share one profile per event, so their costs are aggregated
+across all pages. A summary of the calls and time spent in each event is
+logged after the build.
+"""
+
+# built-in imports
+import cProfile
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+PAGE_EVENTS = (
+    "on_pre_page",
+    "on_page_markdown",
+    "on_page_content",
+    "on_page_context",
+)
+"""The events run for every page, whose profiles are aggregated."""
+
+BUILD_EVENTS = ("on_config", "on_files", "on_nav", "on_env", "on_post_build")
+"""The events run once per build."""
+
+
+class HookProfiler:
+    """Profile event methods and write their profiles."""
+
+    def __init__(self, directory: str):
+        """Initialize a HookProfiler instance.
+
+        Args:
+            directory:
+                The directory the profiles are written to. It is created if
+                needed.
+        """
+        self.directory = directory
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._calls: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+
+    def _record(self, name: str, seconds: float) -> None:
+        """Count a call of an event method."""
+        self._calls[name] = self._calls.get(name, 0) + 1
+        self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    def wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap an event method to profile it.
+
+        The wrapper keeps the method's attributes, including the priority set
+        by `mkdocs.plugins.event_priority`.
+
+        Args:
+            name:
+                The name of the event method (e.g., `on_files`).
+            method:
+                The bound event method.
+
+        Returns:
+            The wrapper.
+        """
+        per_page = name in PAGE_EVENTS
+
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            if name == "on_config":
+                self.reset()
+            if per_page:
+                profile = self._profiles.setdefault(name, cProfile.Profile())
+            else:
+                profile = self._profiles[name] = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                return profile.runcall(method, *args, **kwargs)
+            finally:
+                self._record(name, time.perf_counter() - start)
+                if name == "on_post_build":
+                    self.dump()
+
+        return profiled
+
+    def reset(self) -> None:
+        """Forget the profiles of the previous build."""
+        self._profiles.clear()
+        self._calls.clear()
+        self._seconds.clear()
+
+    def dump(self) -> List[str]:
+        """Write the profiles and log a summary.
+
+        Returns:
+            The paths of the written profiles.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        lines = []
+        for name in (*BUILD_EVENTS, *PAGE_EVENTS):
+            profile = self._profiles.get(name)
+            if profile is None:
+                continue
+            path = os.path.join(self.directory, f"{name}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+            calls = self._calls[name]
+            seconds = self._seconds[name]
+            lines.append(
+                f"    {name:<18} {calls:>7} calls {seconds:>9.3f} s "
+                f"({seconds / calls * 1000:.3f} ms per call)"
+            )
+        logger.info(
+            msg=f"Profiled event hooks; profiles written to {self.directory}:\n"
+            + "\n".join(lines)
+        )
+        return paths
+
+
+def install(plugin: Any, directory: str) -> HookProfiler:
+    """Profile the event methods of a plugin instance.
+
+    Must be called before the plugin is added to MkDocs' plugin collection,
+    which registers the event methods.
+
+    Args:
+        plugin:
+            The plugin instance.
+        directory:
+            The directory the profiles are written to.
+
+    Returns:
+        The profiler.
+    """
+    uninstall(plugin)
+    profiler = HookProfiler(directory=directory)
+    for name in (*BUILD_EVENTS, *PAGE_EVENTS):
+        method = getattr(plugin, name, None)
+        if method is not None:
+            setattr(plugin, name, profiler.wrap(name, method))
+    return profiler
+
+
+def uninstall(plugin: Any) -> None:
+    """Restore the event methods of a plugin instance."""
+    for name in (*BUILD_EVENTS, *PAGE_EVENTS):
+        plugin.__dict__.pop(name, None)
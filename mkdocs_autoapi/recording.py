@@ -0,0 +1,152 @@
+"""Recording and replaying the conversion of pages.
+
+Converting a page has side effects besides its HTML: MkDocs builds the table
+of contents and takes the page title from the first heading, and
+`mkdocstrings` registers the anchors of the documented objects with `autorefs`
+(to resolve cross-references) and adds them to its inventory (`objects.inv`).
+
+`PageRecorder` records these side effects while a page is converted, as a
+JSON-serializable entry, and replays them on a page converted from empty
+Markdown. The render cache (`mkdocs_autoapi.render_cache`) stores entries
+across builds, and pre-rendering (`mkdocs_autoapi.prerender`) produces them in
+worker processes.
+"""
+
+# built-in imports
+import functools
+from typing import Any, Dict, Iterable, List, Optional
+
+_ORIGINAL_ATTRIBUTE = "_autoapi_original"
+"""The attribute of a recording wrapper holding the wrapped method."""
+
+
+def _serialize_toc(items: Iterable[Any]) -> List[Any]:
+    """Serialize anchor links as `[title, id, level, children]`."""
+    return [
+        [item.title, item.id, item.level, _serialize_toc(item.children)]
+        for item in items
+    ]
+
+
+def _deserialize_toc(items: List[Any]) -> List[Any]:
+    """Rebuild the anchor links serialized by `_serialize_toc`."""
+    from mkdocs.structure.toc import AnchorLink
+
+    links = []
+    for title, anchor, level, children in items:
+        link = AnchorLink(title, anchor, level)
+        link.children = _deserialize_toc(children)
+        links.append(link)
+    return links
+
+
+class PageRecorder:
+    """Record the conversion of pages and replay it on other builds."""
+
+    def __init__(self, autorefs_plugin: Any, inventory: Any):
+        """Initialize a PageRecorder instance.
+
+        Wraps `autorefs_plugin.register_anchor` and `inventory.register`, so
+        the calls made while a page is recorded (see `start`) are part of its
+        entry. Wrappers installed by a previous recorder are replaced.
+
+        Args:
+            autorefs_plugin:
+                The `autorefs` plugin instance.
+            inventory:
+                The `mkdocstrings` inventory.
+        """
+        self._recording: Optional[Dict[str, Any]] = None
+        self._page: Any = None
+
+        register_anchor = autorefs_plugin.register_anchor
+        register_anchor = getattr(
+            register_anchor, _ORIGINAL_ATTRIBUTE, register_anchor
+        )
+        register = inventory.register
+        register = getattr(register, _ORIGINAL_ATTRIBUTE, register)
+
+        @functools.wraps(register_anchor)
+        def recording_register_anchor(page, *args, **kwargs):
+            # The arguments are recorded as given, as they differ between
+            # `autorefs` versions (older ones take the page's URL).
+            if self._recording is not None and self._is_page(page):
+                self._recording["anchors"].append(
+                    [page if isinstance(page, str) else None, args, kwargs]
+                )
+            return register_anchor(page, *args, **kwargs)
+
+        @functools.wraps(register)
+        def recording_register(*args, **kwargs):
+            if self._recording is not None:
+                self._recording["inventory"].append([args, kwargs])
+            return register(*args, **kwargs)
+
+        setattr(recording_register_anchor, _ORIGINAL_ATTRIBUTE, register_anchor)
+        setattr(recording_register, _ORIGINAL_ATTRIBUTE, register)
+        autorefs_plugin.register_anchor = recording_register_anchor
+        inventory.register = recording_register
+        self._register_anchor = register_anchor
+        self._register = register
+
+    def _is_page(self, page: Any) -> bool:
+        """Check whether a page (or page URL) is the recorded page."""
+        if page is self._page:
+            return True
+        return isinstance(page, str) and page == getattr(self._page, "url", "")
+
+    def start(self, page: Any) -> None:
+        """Start recording the conversion of a page.
+
+        Args:
+            page:
+                The page about to be converted.
+        """
+        self._page = page
+        self._recording = {"anchors": [], "inventory": []}
+
+    def finish(self, page: Any, html: str) -> Optional[Dict[str, Any]]:
+        """Stop recording the conversion of a page.
+
+        Args:
+            page:
+                The converted page.
+            html:
+                The HTML of the page.
+
+        Returns:
+            The recorded entry, or None if `page` was not being recorded.
+        """
+        if self._recording is None or page is not self._page:
+            return None
+        entry = {
+            "html": html,
+            "toc": _serialize_toc(page.toc.items),
+            "title": getattr(page, "_title_from_render", None),
+            **self._recording,
+        }
+        self._recording = self._page = None
+        return entry
+
+    def restore(self, page: Any, entry: Dict[str, Any]) -> str:
+        """Replay a recorded conversion.
+
+        Args:
+            page:
+                The page, converted from empty Markdown.
+            entry:
+                The recorded entry of the page.
+
+        Returns:
+            The recorded HTML.
+        """
+        from mkdocs.structure.toc import TableOfContents
+
+        page.toc = TableOfContents(_deserialize_toc(entry["toc"]))
+        if entry["title"] and hasattr(page, "_title_from_render"):
+            page._title_from_render = entry["title"]
+        for url, args, kwargs in entry["anchors"]:
+            self._register_anchor(page if url is None else url, *args, **kwargs)
+        for args, kwargs in entry["inventory"]:
+            self._register(*args, **kwargs)
+        return entry["html"]
@@ -0,0 +1,298 @@
+"""Persistent cache of the rendered HTML of API pages.
+
+Converting an API page is the most expensive part of a build: `mkdocstrings`
+collects the documented module and renders its templates. With
+`autoapi_render_cache` enabled, the HTML of each API page is stored on disk,
+keyed on everything the conversion depends on:
+
+- The content of the documented source file.
+- The Markdown of the page (the `:::` stub).
+- The `mkdocstrings` handler options and the Markdown extensions.
+- The versions of `mkdocstrings`, of the default handler and of the packages
+  collecting the documented objects (see `get_renderer_versions`), and the
+  paths and modification times of the custom `mkdocstrings` templates.
+- The theme, the page URL and the plugin version.
+
+The entries are the conversions recorded by
+`mkdocs_autoapi.recording.PageRecorder`. When the key of a page is found in
+the cache, the stub is replaced by empty Markdown before conversion and the
+recorded conversion is replayed instead.
+
+The cache is pruned after each build to its size limit, removing the least
+recently used entries first. Documentation that depends on other modules
+(e.g., inherited members) is not tracked, so it can go stale until the page's
+own source file changes or the cache is cleared with
+`mkdocs-autoapi clear-cache`.
+"""
+
+# built-in imports
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# local imports
+from mkdocs_autoapi import get_version
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+CACHE_FORMAT = 2
+"""The version of the format of cache entries."""
+
+DEFAULT_CACHE_DIR = ".cache/mkdocs-autoapi"
+"""The default cache directory, relative to the MkDocs configuration file."""
+
+_ENTRY_SUFFIX = ".json"
+"""The suffix of cache entry files."""
+
+RENDERER_DISTRIBUTIONS = ("mkdocstrings", "griffe", "pytkdocs")
+"""Distributions whose version is part of the key, besides the handler's.
+
+`griffe` and `pytkdocs` collect the objects documented by the Python handlers
+(`mkdocstrings-python` and `mkdocstrings-python-legacy`).
+"""
+
+
+def get_cache_dir(config_dir: Path, cache_dir: Optional[str]) -> Path:
+    """Get the cache directory.
+
+    Args:
+        config_dir:
+            The directory of the MkDocs configuration file.
+        cache_dir:
+            The value of `autoapi_render_cache_dir`.
+
+    Returns:
+        The absolute path of the cache directory.
+    """
+    return (config_dir / (cache_dir or DEFAULT_CACHE_DIR)).absolute()
+
+
+def _json_default(value: Any) -> str:
+    """Describe values JSON cannot encode, without their memory address."""
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    return getattr(value, "__qualname__", type(value).__qualname__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_renderer_versions(handler: str) -> Dict[str, Optional[str]]:
+    """Get the versions of the distributions rendering API pages.
+
+    Args:
+        handler:
+            The name of the default `mkdocstrings` handler, whose
+            distribution is `mkdocstrings-<handler>` (or
+            `mkdocstrings-<handler>-legacy`).
+
+    Returns:
+        The version of each distribution (None if not installed).
+    """
+    from importlib import metadata
+
+    versions = {}
+    for name in (
+        *RENDERER_DISTRIBUTIONS,
+        f"mkdocstrings-{handler}",
+        f"mkdocstrings-{handler}-legacy",
+    ):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def describe_templates(directory: Optional[Path]) -> List[Tuple[str, int, int]]:
+    """Describe the files of a templates directory.
+
+    Args:
+        directory:
+            The directory (e.g., `mkdocstrings`' `custom_templates`), if any.
+
+    Returns:
+        The path (relative to the directory), modification time and size of
+        each file, sorted by path.
+    """
+    if directory is None or not directory.is_dir():
+        return []
+    templates = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            templates.append((relative, stat.st_mtime_ns, stat.st_size))
+    return sorted(templates)
+
+
+def make_key(
+    source: bytes,
+    markdown: str,
+    handler_options: Any,
+    markdown_options: Any,
+    theme: str,
+    url: str,
+    renderer: Any = None,
+) -> str:
+    """Compute the cache key of a page.
+
+    Args:
+        source:
+            The content of the documented source file.
+        markdown:
+            The Markdown of the page.
+        handler_options:
+            The `mkdocstrings` configuration (default handler and handler
+            options).
+        markdown_options:
+            The Markdown extensions and their configuration.
+        theme:
+            The name of the theme.
+        url:
+            The URL of the page.
+        renderer:
+            The versions of the distributions rendering the page and the
+            description of its custom templates.
+
+    Returns:
+        The hexadecimal key.
+    """
+    description = json.dumps(
+        [
+            CACHE_FORMAT,
+            get_version(),
+            hashlib.sha256(source).hexdigest(),
+            markdown,
+            handler_options,
+            markdown_options,
+            theme,
+            url,
+            renderer,
+        ],
+        sort_keys=True,
+        default=_json_default,
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Store and reuse the rendered HTML of pages."""
+
+    def __init__(self, directory: Path, max_size: int):
+        """Initialize a RenderCache instance.
+
+        Args:
+            directory:
+                The cache directory. It is created when the first entry is
+                stored.
+            max_size:
+                The maximum total size of the entries, in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        """Get the path of an entry."""
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get an entry, marking it as recently used.
+
+        Args:
+            key:
+                The key of the entry.
+
+        Returns:
+            The entry, or None if it is not cached or cannot be read.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether an entry is cached, without reading it."""
+        return self._path(key).is_file()
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry.
+
+        The entry is written to a temporary file first, so concurrent builds
+        never read a partial entry.
+
+        Args:
+            key:
+                The key of the entry.
+            entry:
+                The JSON-serializable entry.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temporary, self._path(key))
+        except OSError as e:
+            logger.debug(msg=f"Could not write render cache entry: {e}")
+
+    def prune(self) -> int:
+        """Remove the least recently used entries above the size limit.
+
+        Returns:
+            The number of removed entries.
+        """
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove all entries.
+
+        Returns:
+            The number of removed entries.
+        """
+        removed = 0
+        for pattern in (f"*{_ENTRY_SUFFIX}", "*.tmp"):
+            for path in self.directory.glob(pattern):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                removed += pattern != "*.tmp"
+        try:
+            self.directory.rmdir()
+        except OSError:
+            pass
+        return removed
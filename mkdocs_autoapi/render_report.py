@@ -0,0 +1,178 @@
+"""Report of the rendering cost of API pages.
+
+With `autoapi_render_report` set, the plugin measures, for each API page, the
+time between the end of the `on_page_markdown` events and its own
+`on_page_content` event (i.e., the conversion of the page by `mkdocstrings`
+and the Markdown extensions) and the size of the resulting HTML. After the
+build, the pages are written to a text report sorted by time and by size,
+identified by the module they document, to tell which modules are worth
+splitting, hiding or rendering with lighter options.
+
+Pages reused from the render cache are marked as such: their time is the
+time taken to reuse them, not to convert them. Pages pre-rendered by worker
+processes are marked too, with the time their worker took to convert them.
+"""
+
+# built-in imports
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+
+class PageCost(NamedTuple):
+    """The rendering cost of an API page."""
+
+    identifier: str
+    """The identifier of the module documented by the page."""
+    sections: int
+    """The number of modules documented as sections of the page."""
+    seconds: float
+    """The time taken to render the page."""
+    size: int
+    """The size of the page's HTML content, in bytes."""
+    reused: bool
+    """Whether the page was reused instead of converted."""
+    prerendered: bool = False
+    """Whether the page was converted by a worker process."""
+
+
+class RenderReport:
+    """Measure the rendering cost of API pages."""
+
+    def __init__(self, modules: Dict[str, List[str]]):
+        """Initialize a RenderReport instance.
+
+        Args:
+            modules:
+                The identifiers of the modules documented by each API page,
+                keyed by the page's file (the page's own module first).
+        """
+        self._modules = modules
+        self._started: Dict[str, float] = {}
+        self._reused: Dict[str, bool] = {}
+        self._prerendered: Dict[str, float] = {}
+        self.costs: List[PageCost] = []
+
+    def start(
+        self, src_uri: str, reused: bool, seconds: Optional[float] = None
+    ) -> None:
+        """Start measuring the rendering of a page.
+
+        Args:
+            src_uri:
+                The page's file. Pages that are not API pages are ignored.
+            reused:
+                Whether the page's conversion is reused.
+            seconds:
+                The time a worker process took to convert the page, if it was
+                pre-rendered, reported instead of the time taken to reuse it.
+        """
+        if src_uri in self._modules:
+            self._reused[src_uri] = reused
+            if seconds is not None:
+                self._prerendered[src_uri] = seconds
+            self._started[src_uri] = time.perf_counter()
+
+    def stop(self, src_uri: str, html: str) -> None:
+        """Stop measuring the rendering of a page.
+
+        Args:
+            src_uri:
+                The page's file.
+            html:
+                The page's HTML content.
+        """
+        started = self._started.pop(src_uri, None)
+        if started is None:
+            return
+        identifiers = self._modules[src_uri]
+        reused = self._reused.pop(src_uri)
+        seconds = self._prerendered.pop(src_uri, None)
+        self.costs.append(
+            PageCost(
+                identifier=identifiers[0],
+                sections=len(identifiers) - 1,
+                seconds=(
+                    time.perf_counter() - started
+                    if seconds is None
+                    else seconds
+                ),
+                size=len(html.encode("utf-8")),
+                reused=reused and seconds is None,
+                prerendered=seconds is not None,
+            )
+        )
+
+    def write(self, path: str) -> None:
+        """Write the report.
+
+        Args:
+            path:
+                The path of the report file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(format_report(self.costs))
+        if self.costs:
+            slowest = max(self.costs, key=lambda cost: cost.seconds)
+            logger.info(
+                msg=f"Wrote the rendering report of {len(self.costs)} API "
+                f"pages to {path}; slowest module: {slowest.identifier} "
+                f"({slowest.seconds:.3f} s)."
+            )
+
+
+def _format_cost(cost: PageCost, total_seconds: float) -> str:
+    """Format a row of the report."""
+    share = cost.seconds / total_seconds * 100 if total_seconds else 0.0
+    module = cost.identifier
+    if cost.sections:
+        plural = "s" if cost.sections > 1 else ""
+        module += f" (+{cost.sections} section{plural})"
+    if cost.reused:
+        module += " [reused]"
+    elif cost.prerendered:
+        module += " [pre-rendered]"
+    return (
+        f"{cost.seconds:>9.3f} {share:>6.1f}% {cost.size / 1024:>11.1f}  "
+        f"{module}"
+    )
+
+
+def format_report(costs: List[PageCost]) -> str:
+    """Format the rendering report.
+
+    Args:
+        costs:
+            The rendering costs of the pages.
+
+    Returns:
+        The report, with the pages sorted by time, then by size.
+    """
+    total_seconds = sum(cost.seconds for cost in costs)
+    total_size = sum(cost.size for cost in costs)
+    header = f"{'seconds':>9} {'share':>7} {'size (KiB)':>11}  module"
+    lines = [
+        f"Rendered {len(costs)} API pages in {total_seconds:.3f} s "
+        f"({total_size / 1024:.1f} KiB).",
+        "",
+        "Slowest modules:",
+        header,
+    ]
+    lines.extend(
+        _format_cost(cost=cost, total_seconds=total_seconds)
+        for cost in sorted(costs, key=lambda cost: -cost.seconds)
+    )
+    lines.extend(["", "Largest modules:", header])
+    lines.extend(
+        _format_cost(cost=cost, total_seconds=total_seconds)
+        for cost in sorted(costs, key=lambda cost: -cost.size)
+    )
+    return "\n".join(lines) + "\n"
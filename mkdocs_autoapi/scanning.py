@@ -0,0 +1,69 @@
+"""Static scanning of Python modules.
+
+Modules are parsed with `ast`, never imported, so scanning is safe for any
+project and does not depend on its dependencies being installed.
+"""
+
+# built-in imports
+import ast
+import dataclasses
+from pathlib import Path
+from typing import List, Optional
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+
+@dataclasses.dataclass
+class ModuleScan:
+    """Define what a static scan found in a module."""
+
+    names: List[str]
+    """The public names defined at the top level, in definition order."""
+
+
+def _target_names(target: ast.expr) -> List[str]:
+    """Get the names bound by an assignment target."""
+    if isinstance(target, ast.Name):
+        return [target.id]
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [name for elt in target.elts for name in _target_names(elt)]
+    return []
+
+
+def scan_module(path: Path) -> Optional[ModuleScan]:
+    """Scan a Python module.
+
+    Args:
+        path:
+            The module's source file.
+
+    Returns:
+        The scan, or None if the file cannot be read or parsed.
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.debug(msg=f"Could not scan {path}: {e}")
+        return None
+
+    names = []
+    for node in tree.body:
+        if isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            found = [node.name]
+        elif isinstance(node, ast.Assign):
+            found = [n for t in node.targets for n in _target_names(t)]
+        elif isinstance(node, ast.AnnAssign):
+            found = _target_names(node.target)
+        else:
+            continue
+        names.extend(
+            name
+            for name in found
+            if not name.startswith("_") and name not in names
+        )
+    return ModuleScan(names=names)
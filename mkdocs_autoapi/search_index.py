@@ -0,0 +1,94 @@
+"""Control how generated API pages appear in the search index.
+
+The search plugins of MkDocs and Material for MkDocs write all pages to
+`search/search_index.json`, a JSON object whose `docs` list holds one entry
+(`location`, `title`, `text`, ...) per page and per heading. The entries of
+generated API pages are post-processed according to `autoapi_search_index`:
+
+- `full`: Keep the entries unchanged.
+- `headings`: Keep the entries, but drop their text. With `mkdocstrings`'
+  default options, the headings include the signatures of functions.
+- `exclude`: Remove the entries.
+"""
+
+# built-in imports
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+
+logger = get_logger(name="mkdocs-autoapi")
+
+SEARCH_INDEX_MODES = ("full", "headings", "exclude")
+"""The supported values of `autoapi_search_index`."""
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Write compact JSON to a file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, sort_keys=True, separators=(",", ":"))
+
+
+def process_search_index(
+    site_dir: str,
+    api_urls: Iterable[str],
+    mode: str,
+) -> None:
+    """Apply `autoapi_search_index` to the search index of a site.
+
+    Steps:
+        1.  Read the search index. If there is none, return.
+        2.  Split the entries into API entries and other entries.
+        3.  Apply the mode to the API entries.
+        4.  Write the search index. A search index prebuilt by the search
+            plugin no longer matches the entries, so it is dropped.
+
+    Args:
+        site_dir:
+            The site directory.
+        api_urls:
+            The URLs of the generated API pages.
+        mode:
+            One of `SEARCH_INDEX_MODES`.
+    """
+    # Step 1
+    if mode == "full":
+        return
+    index_path = os.path.join(site_dir, "search", "search_index.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            search_index = json.load(f)
+    except FileNotFoundError:
+        logger.debug(msg="No search index found, skipping search controls.")
+        return
+
+    # Step 2
+    api_urls = set(api_urls)
+    docs: List[Dict[str, Any]] = []
+    api_docs: List[Dict[str, Any]] = []
+    for doc in search_index.get("docs", []):
+        if doc.get("location", "").split("#", 1)[0] in api_urls:
+            api_docs.append(doc)
+        else:
+            docs.append(doc)
+
+    # Step 3
+    if mode == "headings":
+        for doc in api_docs:
+            doc["text"] = ""
+        docs.extend(api_docs)
+
+    # Step 4
+    search_index["docs"] = docs
+    if search_index.pop("index", None) is not None:
+        logger.info(
+            "Dropped the prebuilt search index, since it does not match the "
+            "entries kept by `autoapi_search_index`."
+        )
+    _write_json(index_path, search_index)
+    logger.debug(
+        msg=f"Applied `autoapi_search_index: {mode}` to {len(api_docs)} "
+        "search entries."
+    )
@@ -2,6 +2,7 @@
 
 # built-in imports
 import pathlib
+import re
 import textwrap
 from typing import Callable, Optional, Tuple, Union
 
@@ -13,9 +14,27 @@ __all__ = ["TemplateRewritingLoader"]
 class TemplateRewritingLoader(BaseLoader):
     """A Jinja2 template loader that rewrites certain templates."""
 
-    def __init__(self, loader: BaseLoader):
-        """Initialize a TemplateRewritingLoader instance."""
+    def __init__(
+        self,
+        loader: BaseLoader,
+        lazy_nav: bool = False,
+        nav_cache: bool = False,
+    ):
+        """Initialize a TemplateRewritingLoader instance.
+
+        Args:
+            loader:
+                The loader to wrap.
+            lazy_nav:
+                Whether to render placeholders for navigation sections marked
+                for client-side loading (see `mkdocs_autoapi.lazy_nav`).
+            nav_cache:
+                Whether to reuse the rendering of navigation items marked for
+                caching (see `mkdocs_autoapi.nav_cache`).
+        """
         self.loader = loader
+        self.lazy_nav = lazy_nav
+        self.nav_cache = nav_cache
         self.found_supported_theme = False
 
     def get_source(
@@ -40,6 +59,10 @@ class TemplateRewritingLoader(BaseLoader):
                 ),
             ):
                 src = _transform_material_nav_item_template(src)
+                if self.nav_cache:
+                    src = _add_material_nav_cache(src)
+                if self.lazy_nav:
+                    src = _add_material_lazy_nav_placeholder(src)
             elif path.endswith(
                 (
                     "/material/partials/tabs-item.html",
@@ -49,6 +72,10 @@ class TemplateRewritingLoader(BaseLoader):
                 src = _transform_material_tabs_item_template(src)
             elif path.endswith("/themes/readthedocs/base.html"):
                 src = _transform_readthedocs_base_template(src)
+            elif path.endswith("/themes/readthedocs/nav.html"):
+                if not self.nav_cache:
+                    return src, filename, uptodate
+                src = _add_readthedocs_nav_cache(src)
             elif path.endswith("/nature/base.html"):
                 src = None  # Just works!
             else:
@@ -103,6 +130,94 @@ def _transform_material_nav_item_template(src: str) -> str:
     return "\n".join(lines)
 
 
+_MATERIAL_LAZY_NAV_MACRO = """
+{% macro render([args]) %}
+  {% if nav_item.autoapi_lazy_nav %}
+    <li class="md-nav__item md-nav__item--nested" data-autoapi-nav="{{ nav_item.autoapi_lazy_nav[0] | url }}" data-autoapi-section="{{ nav_item.autoapi_lazy_nav[1] }}" data-autoapi-path="{{ path }}" data-autoapi-level="{{ level }}"{% if nav_item.active %} data-autoapi-active{% endif %}>
+      <input class="md-nav__toggle md-toggle" type="checkbox" id="{{ path }}">
+      <label class="md-nav__link" for="{{ path }}" id="{{ path }}_label" tabindex="0">
+        <span class="md-ellipsis">{{ nav_item.title }}</span>
+        <span class="md-nav__icon md-icon"></span>
+      </label>
+    </li>
+  {% else %}
+    {{ autoapi_render([args]) }}
+  {% endif %}
+{% endmacro %}
+"""  # noqa: E501
+
+
+def _wrap_material_render_macro(src: str, inner: str, wrapper: str) -> str:
+    """Wrap the `render` macro of the Material for MkDocs nav-item template.
+
+    The `render` macro is renamed to `inner` and a new `render` macro, defined
+    by `wrapper`, is appended. Recursive calls to `render` go through the
+    wrapper, so it applies to navigation items at any depth.
+
+    Args:
+        src:
+            The template source.
+        inner:
+            The new name of the wrapped macro.
+        wrapper:
+            The source of the new macro, where `[args]` stands for the
+            arguments of the wrapped macro.
+
+    Returns:
+        The transformed source, or `src` if the template does not render
+        navigation items with a suitable macro.
+    """
+    match = re.search(r"{% macro render\(([^)]*)\) %}", src)
+    if match is None:
+        # Versions < 9 do not render navigation items with a macro.
+        return src
+    args = match.group(1)
+    if "path" not in args or "level" not in args:
+        return src
+    return (
+        src[: match.start()]
+        + match.group(0).replace("render(", f"{inner}(", 1)
+        + src[match.end() :]
+        + wrapper.replace("[args]", args)
+    )
+
+
+def _add_material_lazy_nav_placeholder(src: str) -> str:
+    """Render a placeholder for lazily loaded navigation sections."""
+    return _wrap_material_render_macro(
+        src, inner="autoapi_render", wrapper=_MATERIAL_LAZY_NAV_MACRO
+    )
+
+
+_MATERIAL_NAV_CACHE_MACRO = """
+{% macro render([args]) %}
+  {%- if nav_item.autoapi_nav_cache and not nav_item.active -%}
+    {{- autoapi_cached_nav(page, base_url, [path, level, [parent]], autoapi_memo_render, [args]) -}}
+  {%- else -%}
+    {{- autoapi_memo_render([args]) -}}
+  {%- endif -%}
+{% endmacro %}
+"""  # noqa: E501
+
+
+def _add_material_nav_cache(src: str) -> str:
+    """Reuse the rendering of navigation items marked for caching.
+
+    Besides the item and its position, the rendering of an item depends on
+    whether its parent is active (for `navigation.sections`), so the parent's
+    state is part of the cache key.
+    """
+    match = re.search(r"{% macro render\(([^)]*)\) %}", src)
+    parent = "false"
+    if match is not None and "parent" in match.group(1):
+        parent = "parent.active if parent else false"
+    return _wrap_material_render_macro(
+        src,
+        inner="autoapi_memo_render",
+        wrapper=_MATERIAL_NAV_CACHE_MACRO.replace("[parent]", parent),
+    )
+
+
 def _transform_material_tabs_item_template(src: str) -> str:
     """Transform the Material for MkDocs tabs-item template."""
     src = src.replace(
@@ -146,6 +261,37 @@ def _transform_readthedocs_base_template(src: str) -> Union[str, None]:
     return "\n".join(lines)
 
 
+_READTHEDOCS_NAV_CACHE_MACRO = """\
+{%- macro autoapi_nav_item(nav_item, navlevel) %}
+  {%- if nav_item.autoapi_nav_cache and not nav_item.active -%}
+    {{- autoapi_cached_nav(page, base_url, [navlevel], autoapi_nav_item_base, nav_item, navlevel) -}}
+  {%- else -%}
+    {{- autoapi_nav_item_base(nav_item, navlevel) -}}
+  {%- endif -%}
+{%- endmacro %}
+{{- autoapi_nav_item(nav_item, navlevel) }}"""  # noqa: E501
+
+
+def _add_readthedocs_nav_cache(src: str) -> Union[str, None]:
+    """Reuse the rendering of navigation items marked for caching.
+
+    The ReadTheDocs nav template renders an item and includes itself for each
+    child. Its body is turned into a macro, wrapped in a macro which renders
+    marked items through the cache, and the recursive include is replaced with
+    a call to the wrapper.
+    """
+    include = "{%- include 'nav.html' %}"
+    if include not in src:
+        return None
+    body = src.replace(include, "{{- autoapi_nav_item(nav_item, navlevel) }}")
+    return (
+        "{%- macro autoapi_nav_item_base(nav_item, navlevel) %}"
+        + body.rstrip("\n")
+        + "\n{%- endmacro %}\n"
+        + _READTHEDOCS_NAV_CACHE_MACRO
+    )
+
+
 def _replace_line(
     line: str,
     wrapper: str,
@@ -0,0 +1,127 @@
+"""Compact index of API symbols for "jump to symbol" lookups.
+
+The index is written to `<autoapi_root>/symbols.json` as:
+
+    {
+      "root": "../",
+      "pages": ["autoapi/pkg/", "autoapi/pkg/a/", ...],
+      "symbols": [["pkg", 0], ["pkg.a", 1], ["pkg.a.func", 1], ...]
+    }
+
+`root` is the path from the index to the site root, `pages` holds page URLs
+relative to the site root, and `symbols` is sorted by dotted name, so all
+names with a given prefix form a contiguous range that can be found with a
+binary search. A symbol's URL is its page's URL followed by `#<name>`, which
+is the anchor `mkdocstrings` gives to the heading of an object.
+"""
+
+# built-in imports
+import json
+import os
+import posixpath
+from typing import Any, Dict, Iterable, List, Tuple
+
+# local imports
+from mkdocs_autoapi.logging import get_logger
+from mkdocs_autoapi.scanning import scan_module
+
+logger = get_logger(name="mkdocs-autoapi")
+
+SYMBOL_INDEX_NAME = "symbols.json"
+"""The name of the symbol index, relative to `autoapi_root`."""
+
+PYTHON_SUFFIXES = (".py", ".pyi")
+"""The suffixes of files scanned for top-level names."""
+
+
+def build_symbol_index(
+    pages: Iterable[Tuple[str, Any, str]],
+    autoapi_root: str,
+    limit: int,
+) -> Dict[str, Any]:
+    """Build the symbol index.
+
+    Steps:
+        1.  Collect the module identifiers and the public top-level names of
+            each Python module.
+        2.  If there are more symbols than `limit`, keep the least nested
+            ones.
+        3.  Sort the symbols by name.
+
+    Args:
+        pages:
+            The identifier, source path (or None) and URL of each documented
+            module. Modules documented on the same page share its URL.
+        autoapi_root:
+            The directory the API pages are generated in.
+        limit:
+            The maximum number of symbols.
+
+    Returns:
+        The symbol index.
+    """
+    # Step 1
+    urls: List[str] = []
+    symbols: Dict[str, int] = {}
+    url_indexes: Dict[str, int] = {}
+    for identifier, source_path, url in pages:
+        page_index = url_indexes.setdefault(url, len(urls))
+        if page_index == len(urls):
+            urls.append(url)
+        symbols.setdefault(identifier, page_index)
+        if source_path is None or source_path.suffix not in PYTHON_SUFFIXES:
+            continue
+        scan = scan_module(source_path)
+        for name in scan.names if scan else ():
+            symbols.setdefault(f"{identifier}.{name}", page_index)
+
+    # Step 2
+    names = list(symbols)
+    if len(names) > limit:
+        logger.warning(
+            f"The symbol index has {len(names)} symbols; keeping the "
+            f"{limit} least nested ones.\n    HINT: Raise "
+            "`autoapi_symbol_index_limit` to include all symbols."
+        )
+        names.sort(key=lambda name: (name.count("."), name))
+        names = names[:limit]
+
+    # Step 3
+    names.sort()
+    root = posixpath.relpath(".", posixpath.normpath(autoapi_root))
+    return {
+        "root": f"{root}/",
+        "pages": urls,
+        "symbols": [[name, symbols[name]] for name in names],
+    }
+
+
+def write_symbol_index(
+    pages: Iterable[Tuple[str, Any, str]],
+    autoapi_root: str,
+    limit: int,
+    site_dir: str,
+) -> None:
+    """Write the symbol index to the site directory.
+
+    Args:
+        pages:
+            The identifier, source path (or None) and URL of each documented
+            module. Modules documented on the same page share its URL.
+        autoapi_root:
+            The directory the API pages are generated in.
+        limit:
+            The maximum number of symbols.
+        site_dir:
+            The site directory.
+    """
+    index = build_symbol_index(
+        pages=pages, autoapi_root=autoapi_root, limit=limit
+    )
+    path = os.path.join(site_dir, autoapi_root, SYMBOL_INDEX_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    logger.debug(
+        msg=f"Wrote {len(index['symbols'])} symbols to the symbol index."
+    )
@@ -0,0 +1,167 @@
+"""Check that builds running concurrently generate their files separately.
+
+The editor of the current build is tracked with a context variable (see
+`mkdocs_autoapi.generate_files.editor`), so `create_docs` runs in separate
+threads or asyncio tasks must each write to their own editor.
+"""
+
+# built-in imports
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# third-party imports
+import pytest
+from mkdocs.config import load_config
+from mkdocs.structure.files import Files
+
+# local imports
+from mkdocs_autoapi.autoapi import create_docs
+from mkdocs_autoapi.generate_files.editor import FilesEditor
+
+BUILDS = 4
+"""The number of builds run concurrently."""
+
+MODULES = 20
+"""The number of modules of each project."""
+
+CONFIG = """\
+site_name: Project {index}
+plugins:
+  - mkdocs-autoapi:
+      autoapi_dir: src
+  - mkdocstrings
+"""
+
+
+def _make_project(directory: Path, index: int) -> Path:
+    """Create a project documenting the package `pkg<index>`."""
+    package = directory / "src" / f"pkg{index}"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""Package."""\n')
+    for module in range(MODULES):
+        (package / f"mod{module}.py").write_text(f"VALUE = {module}\n")
+    (directory / "docs").mkdir()
+    (directory / "docs" / "index.md").write_text("# Home\n")
+    config_file = directory / "mkdocs.yml"
+    config_file.write_text(CONFIG.format(index=index))
+    return config_file
+
+
+def _load_config(config_file: Path):
+    """Load the configuration of a project as the plugin's `on_files` sees it.
+
+    MkDocs' configuration loading is not thread-safe, so the configurations
+    are loaded before the builds start.
+    """
+    config = load_config(config_file=str(config_file))
+    config.update(config.plugins["mkdocs-autoapi"].config)
+    return config
+
+
+def _build(config, output: Path, barrier: threading.Barrier):
+    """Generate the API files of a project as the plugin does.
+
+    Returns:
+        Whether the build's editor stayed current, the generated files, their
+        edit paths, and the files written to the output directory.
+    """
+    with FilesEditor(
+        files=Files([]), config=config, directory=str(output)
+    ) as editor:
+        barrier.wait()
+        create_docs(config=config)
+        current = FilesEditor.current() is editor
+    written = sorted(
+        path.relative_to(output).as_posix() for path in output.rglob("*.md")
+    )
+    return current, editor.files, dict(editor.edit_paths), written
+
+
+def _projects(tmp_path: Path):
+    """Create the projects, their configurations and output directories."""
+    projects = []
+    for index in range(BUILDS):
+        config_file = _make_project(
+            directory=tmp_path / f"project{index}", index=index
+        )
+        projects.append(
+            (
+                config_file,
+                _load_config(config_file),
+                tmp_path / f"output{index}",
+            )
+        )
+    return projects
+
+
+def _check_isolated(results, projects):
+    """Check that each build only generated its own project's files."""
+    assert len(results) == BUILDS
+    for index, (result, (config_file, _, output)) in enumerate(
+        zip(results, projects)
+    ):
+        current, files, edit_paths, written = result
+        assert current
+
+        expected = sorted(
+            [f"autoapi/pkg{index}/index.md", "autoapi/summary.md"]
+            + [
+                f"autoapi/pkg{index}/mod{module}.md"
+                for module in range(MODULES)
+            ]
+        )
+        assert sorted(file.src_uri for file in files) == expected
+        assert written == expected
+        assert all(file.abs_src_path.startswith(str(output)) for file in files)
+        assert sorted(edit_paths) == expected
+
+        source_dir = config_file.parent / "src"
+        for edit_path in edit_paths.values():
+            if edit_path is not None:
+                assert source_dir.resolve() in Path(edit_path).resolve().parents
+    # No build fell back to the editor used outside of builds.
+    assert FilesEditor._default is None
+
+
+def test_concurrent_builds_in_threads(tmp_path):
+    """Builds run in threads keep their own editor and files."""
+    projects = _projects(tmp_path)
+    barrier = threading.Barrier(BUILDS)
+    results = [None] * BUILDS
+
+    def run(index):
+        _, config, output = projects[index]
+        results[index] = _build(config, output, barrier)
+
+    threads = [
+        threading.Thread(target=run, args=(index,)) for index in range(BUILDS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    _check_isolated(results, projects)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9), reason="asyncio.to_thread requires Python 3.9"
+)
+def test_concurrent_builds_in_asyncio_tasks(tmp_path):
+    """Builds run with asyncio.to_thread keep their own editor and files."""
+    projects = _projects(tmp_path)
+    barrier = threading.Barrier(BUILDS)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(_build, config, output, barrier)
+                for _, config, output in projects
+            )
+        )
+
+    results = asyncio.run(run())
+
+    _check_isolated(results, projects)
@@ -0,0 +1,209 @@
+"""Check the output reported by successive builds of the build daemon."""
+
+# built-in imports
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# third-party imports
+import pytest
+
+# local imports
+from mkdocs_autoapi import daemon
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(daemon.socket, "AF_UNIX"),
+    reason="The build daemon requires Unix domain sockets.",
+)
+
+CONFIG = """\
+site_name: Daemon
+plugins:
+  - mkdocs-autoapi:
+      autoapi_dir: src
+  - mkdocstrings:
+      handlers:
+        python:
+          paths: [src, lib]
+"""
+
+AGGREGATE_CONFIG = CONFIG.replace(
+    "autoapi_dir: src\n",
+    "autoapi_dir: src\n      autoapi_aggregate_max_lines: 5\n",
+)
+
+MODULE_OPTIONS_CONFIG = CONFIG.replace(
+    "autoapi_dir: src\n",
+    "autoapi_dir: src\n"
+    "      autoapi_module_options:\n"
+    "        - min_lines: 5\n"
+    "          options:\n"
+    "            show_source: false\n",
+)
+
+STARTUP_TIMEOUT = 60
+"""The time to wait for the daemon to listen, in seconds."""
+
+INVALIDATION_TIMEOUT = 10
+"""The time to wait for the daemon to see a file change, in seconds."""
+
+
+@pytest.fixture
+def project(tmp_path: Path, request) -> Path:
+    """Create a project documenting the package `pkg`.
+
+    The configuration can be given with indirect parametrization.
+    """
+    package = tmp_path / "src" / "pkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""The package."""\n')
+    (package / "a.py").write_text(
+        'def first():\n    """Return the first value."""\n'
+    )
+    (package / "b.py").write_text(
+        'def second():\n    """Return the second value."""\n'
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.md").write_text("# Home\n")
+    (tmp_path / "mkdocs.yml").write_text(getattr(request, "param", CONFIG))
+    return tmp_path
+
+
+@pytest.fixture
+def socket_path(project: Path):
+    """Start a daemon building the project and get its socket."""
+    # Unix socket paths are limited to about 100 characters.
+    path = os.path.join(
+        os.environ.get("TMPDIR", "/tmp"), f"autoapi-test-{os.getpid()}.sock"
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "mkdocs_autoapi.cli",
+            "daemon",
+            "--config-file",
+            str(project / "mkdocs.yml"),
+            "--socket",
+            path,
+        ],
+        # Fix the build date, so unchanged pages are built identically.
+        env={**os.environ, "SOURCE_DATE_EPOCH": "0"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not os.path.exists(path):
+            assert process.poll() is None, "The daemon exited."
+            assert time.monotonic() < deadline, "The daemon did not start."
+            time.sleep(0.1)
+        yield path
+    finally:
+        if process.poll() is None:
+            try:
+                daemon.request(socket_path=path, command="shutdown", timeout=10)
+            except OSError:
+                process.kill()
+        process.wait(timeout=30)
+
+
+def _wait_until_cold(socket_path: str) -> None:
+    """Wait for the daemon to forget its plan."""
+    deadline = time.monotonic() + INVALIDATION_TIMEOUT
+    while daemon.request(socket_path=socket_path, command="status")["warm"]:
+        assert time.monotonic() < deadline, "The plan was not invalidated."
+        time.sleep(0.1)
+
+
+def _build(socket_path: str):
+    """Request a build and check that it succeeded."""
+    response = daemon.request(socket_path=socket_path, command="build")
+    assert response["ok"], response
+    return response
+
+
+def test_builds_report_changed_files(project, socket_path):
+    """Only the pages of edited modules are reported as changed."""
+    first = _build(socket_path)
+    assert not first["warm"]
+    assert "index.html" in first["changed"]
+    assert "autoapi/pkg/a/index.html" in first["changed"]
+    assert "autoapi/pkg/b/index.html" in first["changed"]
+
+    second = _build(socket_path)
+    assert second["warm"]
+    assert second["changed"] == []
+    assert second["removed"] == []
+
+    (project / "src" / "pkg" / "a.py").write_text(
+        'def first():\n    """Return the very first value."""\n'
+    )
+    third = _build(socket_path)
+    assert third["warm"]
+    changed_pages = [
+        path for path in third["changed"] if path.endswith(".html")
+    ]
+    assert changed_pages == ["autoapi/pkg/a/index.html"]
+    assert third["removed"] == []
+
+
+@pytest.mark.parametrize("project", [AGGREGATE_CONFIG], indirect=True)
+def test_growing_module_is_planned_again(project, socket_path):
+    """A small module edited past the aggregation limit gets its own page."""
+    first = _build(socket_path)
+    assert "autoapi/pkg/a/index.html" not in first["changed"]
+
+    (project / "src" / "pkg" / "a.py").write_text(
+        "".join(
+            f'def function_{index}():\n    """Return a value."""\n'
+            for index in range(5)
+        )
+    )
+    _wait_until_cold(socket_path)
+    second = _build(socket_path)
+    assert not second["warm"]
+    assert "autoapi/pkg/a/index.html" in second["changed"]
+
+
+@pytest.mark.parametrize("project", [MODULE_OPTIONS_CONFIG], indirect=True)
+def test_growing_module_gets_its_size_options(project, socket_path):
+    """A module edited past a `min_lines` rule is planned with its options."""
+    _build(socket_path)
+
+    (project / "src" / "pkg" / "a.py").write_text(
+        "".join(
+            f'def function_{index}():\n    """Return a value."""\n'
+            for index in range(5)
+        )
+    )
+    _wait_until_cold(socket_path)
+    second = _build(socket_path)
+    assert not second["warm"]
+    assert "autoapi/pkg/a/index.html" in second["changed"]
+
+
+def test_config_change_watches_new_directories(project, socket_path):
+    """Changing the AutoAPI directory watches the new one."""
+    _build(socket_path)
+
+    package = project / "lib" / "other"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""The other package."""\n')
+    config_file = project / "mkdocs.yml"
+    config_file.write_text(
+        config_file.read_text().replace("autoapi_dir: src", "autoapi_dir: lib")
+    )
+    _wait_until_cold(socket_path)
+    second = _build(socket_path)
+    assert "autoapi/other/index.html" in second["changed"]
+
+    (package / "c.py").write_text(
+        'def third():\n    """Return the third value."""\n'
+    )
+    _wait_until_cold(socket_path)
+    third = _build(socket_path)
+    assert not third["warm"]
+    assert "autoapi/other/c/index.html" in third["changed"]
@@ -0,0 +1,100 @@
+"""Check that importing the plugin module stays cheap.
+
+`mkdocs_autoapi.plugin` is imported whenever MkDocs loads its configuration,
+so it must not import the machinery of its event hooks (see "Keep Plugin
+Imports Lazy" in `CONTRIBUTING.md`). Each check runs in a new interpreter,
+after MkDocs' own configuration modules are imported, as when MkDocs loads the
+plugin.
+"""
+
+# built-in imports
+import json
+import subprocess
+import sys
+
+IMPORT_BUDGET_US = 50_000
+"""The budget of the cumulative import time of the plugin module, in µs."""
+
+HEAVY_MODULES = ("jinja2", "markdown")
+"""Third-party modules that the plugin module must not import."""
+
+LAZY_MODULES = (
+    "mkdocs_autoapi.autoapi",
+    "mkdocs_autoapi.generate_files",
+    "mkdocs_autoapi.literate_nav",
+    "mkdocs_autoapi.section_index",
+)
+"""Modules of the plugin that must only be imported by its event hooks."""
+
+_IMPORT_SCRIPT = """
+import json
+import sys
+
+import mkdocs.config.defaults
+
+# MkDocs imports these itself: forget them to see if the plugin imports them.
+heavy = {heavy!r}
+for name in list(sys.modules):
+    if name.split(".")[0] in heavy:
+        del sys.modules[name]
+
+import mkdocs_autoapi.plugin
+
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _is_loaded(name, modules):
+    """Check whether a module or one of its submodules is in a list."""
+    return any(
+        module == name or module.startswith(f"{name}.") for module in modules
+    )
+
+
+def test_plugin_import_is_lazy():
+    """Importing the plugin module imports none of the heavy modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT.format(heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    modules = json.loads(result.stdout)
+
+    loaded = [
+        name
+        for name in (*HEAVY_MODULES, *LAZY_MODULES)
+        if _is_loaded(name, modules)
+    ]
+    assert loaded == []
+
+
+def test_plugin_import_time_budget():
+    """Importing the plugin module takes less than the budget."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import mkdocs.config.defaults; import mkdocs_autoapi.plugin",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    # Each line is "import time: <self> | <cumulative> | <name>", the
+    # top-level imports having no indentation before their name.
+    lines = result.stderr.splitlines()
+    start = next(
+        index
+        for index, line in enumerate(lines)
+        if line.endswith("| mkdocs.config.defaults")
+    )
+    cumulative = 0
+    for line in lines[start + 1 :]:
+        _, _, name = line.split("|")
+        if not name[1:].startswith(" "):
+            cumulative += int(line.split("|")[1])
+    assert 0 < cumulative < IMPORT_BUDGET_US
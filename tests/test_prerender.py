@@ -0,0 +1,73 @@
+"""Check that pre-rendering survives the death of a worker process."""
+
+# built-in imports
+import os
+
+# third-party imports
+import pytest
+
+# local imports
+from mkdocs_autoapi import prerender
+
+pytestmark = pytest.mark.skipif(
+    not prerender.is_supported(),
+    reason="Pre-rendering requires forking worker processes.",
+)
+
+PAGES = [f"page{index}.md" for index in range(8)]
+
+CRASHING_PAGE = "page3.md"
+"""The page whose conversion kills its worker."""
+
+
+def _convert(src_uri):
+    """Convert a page."""
+    return src_uri, {"html": src_uri}, []
+
+
+def _convert_crashing(src_uri):
+    """Convert a page, killing the worker on `CRASHING_PAGE`."""
+    if src_uri == CRASHING_PAGE:
+        os._exit(1)
+    return _convert(src_uri)
+
+
+def _make_pool():
+    """Start pre-rendering the pages."""
+    return prerender.PrerenderPool(
+        config=None,
+        files=None,
+        recorder=None,
+        wants_conversion=lambda page, config: True,
+        src_uris=PAGES,
+        workers=2,
+    )
+
+
+def test_pages_are_prerendered(monkeypatch):
+    """Every page is converted by the workers."""
+    monkeypatch.setattr(prerender, "_convert", _convert)
+    pool = _make_pool()
+    try:
+        entries = [pool.get(src_uri) for src_uri in PAGES]
+    finally:
+        pool.close()
+    assert entries == [{"html": src_uri} for src_uri in PAGES]
+    assert pool.converted == len(PAGES)
+    assert pool.get(PAGES[0]) is None
+
+
+def test_dead_worker_drops_the_pool(monkeypatch):
+    """The pages after a dead worker's are left to MkDocs, without hanging."""
+    monkeypatch.setattr(prerender, "_convert", _convert_crashing)
+    pool = _make_pool()
+    try:
+        entries = [pool.get(src_uri) for src_uri in PAGES]
+    finally:
+        pool.close()
+    crash = PAGES.index(CRASHING_PAGE)
+    assert entries[crash:] == [None] * (len(PAGES) - crash)
+    assert all(
+        entry in (None, {"html": src_uri})
+        for entry, src_uri in zip(entries, PAGES)
+    )